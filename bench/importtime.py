@@ -0,0 +1,64 @@
+import sys
+import subprocess
+from pathlib import Path
+
+# ──────────────────────────────
+# 진입점 import 시간 예산 검사
+# ──────────────────────────────
+# python -m bench.importtime
+# 각 모듈을 새 인터프리터에서 `python -X importtime -c "import 모듈"` 로 불러와
+# 누적 import 시간이 예산(초)을 넘으면 실패(exit 1)한다.
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BUDGETS = {
+    'telegram': 0.25,
+    'bunjang': 0.15,
+    'ticketbay': 0.25,
+    'metrics': 0.05,
+}
+HEAVY_MODULES = ('pandas', 'numpy', 'openai', 'gspread', 'oauth2client', 'supabase', 'schedule', 'tqdm')
+
+
+def measure(module):
+    """(누적 import 시간(초), 상위 import 목록, 함께 로딩된 무거운 모듈)"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        rows.append((int(parts[1]), parts[2]))
+    # 모듈 자신의 줄과, 그 바로 위로 이어지는 하위 import 줄만 사용
+    end = max(i for i, (_, name) in enumerate(rows) if name.strip() == module)
+    start = end
+    while start > 0 and rows[start - 1][1].startswith('  '):
+        start -= 1
+    total = rows[end][0]
+    # 한 단계 아래(직접 import 한) 모듈 중 오래 걸린 것
+    children = [(us, name.strip()) for us, name in rows[start:end] if not name.startswith('     ')]
+    top = sorted(children, reverse=True)[:5]
+    heavy = [m for m in proc.stdout.strip().split(',') if m]
+    return total / 1e6, top, heavy
+
+
+def main():
+    failed = []
+    for module, budget in BUDGETS.items():
+        seconds, top, heavy = measure(module)
+        mark = '🟢' if seconds <= budget else '🔴'
+        print(f"{mark} {module:<12} {seconds * 1000:7.1f}ms / 예산 {budget * 1000:.0f}ms"
+              + (f"  (무거운 모듈: {', '.join(heavy)})" if heavy else ''))
+        for us, name in top:
+            print(f"      {us / 1000:7.1f}ms  {name}")
+        if seconds > budget:
+            failed.append(module)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
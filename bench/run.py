@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import time
+import shutil
+import runpy
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+from pathlib import Path
+from contextlib import contextmanager
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# 실제 서비스로 나가는 일이 없도록 토큰/엔드포인트를 먼저 덮어쓴다
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench-token')
+os.environ.setdefault('ADMIN_CHAT_ID', '-1')
+os.environ['OPENAI_API_KEY'] = 'bench'
+
+from bench.standins import (StandInState, StandInServer, MemoryGspread,
+                            interpark_notices, ticketbay_listings)
+
+# ──────────────────────────────
+# 오프라인 벤치마크
+# ──────────────────────────────
+# python -m bench.run --scales 1 5 20
+# python -m bench.run --save-baseline   # 현재 결과를 bench/baseline.json 으로 저장
+
+BASELINE_PATH = ROOT / 'bench' / 'baseline.json'
+REGRESSION_RATIO = 1.25
+WORKDIR_FILES = ['artist_cache.json', 'hashtag_cache.json', 'tweet_cache.json', 'tweet_templates.json']
+
+
+class StageTimer:
+    """단계별 누적 시간/호출 수"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def wrap(self, name, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                stage['seconds'] += time.perf_counter() - start
+                stage['calls'] += 1
+        return timed
+
+    def patch(self, owner, names):
+        return [mock.patch.object(owner, n, self.wrap(n, getattr(owner, n))) for n in names]
+
+
+@contextmanager
+def workdir():
+    """캐시/템플릿만 복사한 임시 작업 디렉터리"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        for name in WORKDIR_FILES:
+            if (ROOT / name).exists():
+                shutil.copy(ROOT / name, tmp)
+        (Path(tmp) / 'ticketbay_log').mkdir()
+        os.chdir(tmp)
+        try:
+            yield Path(tmp)
+        finally:
+            os.chdir(cwd)
+
+
+def scenario_interpark(server, timer):
+    """InterparkTicketCrawler.run (수집 → 필터 → 보강 → 시트)"""
+    bunjang = timer.wrap('import', importlib.import_module)('bunjang')
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+    sheets = MemoryGspread()
+    patches = [
+        mock.patch.object(ServiceAccountCredentials, 'from_json_keyfile_name', lambda *a, **k: None),
+        mock.patch.object(gspread, 'authorize', lambda creds: sheets),
+    ] + timer.patch(bunjang.InterparkTicketCrawler, ['fetch_data', 'filter_hot', 'add_columns', 'render_columns', 'update_sheet'])
+    for p in patches:
+        p.start()
+    try:
+        df = bunjang.InterparkTicketCrawler().run()
+    finally:
+        for p in reversed(patches):
+            p.stop()
+    return {'rows': len(df), 'sheet_calls': sheets.sheet_calls()}
+
+
+def scenario_telegram(server, timer):
+    """telegram.create_ticket_message + send_message"""
+    telegram = timer.wrap('import', importlib.import_module)('telegram')
+    patches = timer.patch(telegram, ['fetch_all_notices', 'send_message'])
+    for p in patches:
+        p.start()
+    try:
+        message = timer.wrap('create_ticket_message', telegram.create_ticket_message)()
+        result = telegram.send_message(os.environ['ADMIN_CHAT_ID'], message)
+    finally:
+        for p in reversed(patches):
+            p.stop()
+    return {'message_chars': len(message), 'ok': bool(result.get('ok'))}
+
+
+def scenario_ticketbay(server, timer):
+    """ticketbay.py 전체 (카테고리 → 상품 병렬 수집 → CSV → Supabase)"""
+    import supabase
+    real_create = supabase.create_client
+    with mock.patch.object(supabase, 'create_client', lambda url, key, *a: real_create(server.base_url, key, *a)):
+        timer.wrap('ticketbay', runpy.run_path)(str(ROOT / 'ticketbay.py'), run_name='__main__')
+    return {'rows': server.state.postgrest_rows}
+
+
+SCENARIOS = {
+    'interpark_run': scenario_interpark,
+    'telegram_digest': scenario_telegram,
+    'ticketbay': scenario_ticketbay,
+}
+
+
+def run_scenario(name, scale, llm_latency):
+    import sharded_fetch
+    state = StandInState(interpark_notices(scale), ticketbay_listings(scale), llm_latency)
+    timer = StageTimer()
+    with StandInServer(state) as server, workdir():
+        os.environ['OPENAI_BASE_URL'] = f"{server.base_url}/v1"
+        with mock.patch.object(sharded_fetch, 'MIN_INTERVAL', 0):
+            tracemalloc.start()
+            start = time.perf_counter()
+            extra = SCENARIOS[name](server, timer)
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        calls, bytes_out = state.snapshot()
+    return {
+        'wall': round(wall, 4),
+        'peak_mb': round(peak / 1e6, 2),
+        'stages': {k: {'seconds': round(v['seconds'], 4), 'calls': v['calls']} for k, v in timer.stages.items()},
+        'calls': calls,
+        'bytes': bytes_out,
+        **extra,
+    }
+
+
+def compare(results, baseline):
+    """기준선 대비 벽시계 시간 비교, 회귀 목록 반환"""
+    regressions = []
+    for name, scales in results.items():
+        for scale, result in scales.items():
+            base = baseline.get(name, {}).get(scale)
+            if not base:
+                continue
+            ratio = result['wall'] / base['wall'] if base['wall'] else 1.0
+            mark = '🔴' if ratio > REGRESSION_RATIO else '🟢'
+            print(f"{mark} {name} x{scale}: {base['wall']:.3f}s → {result['wall']:.3f}s ({ratio:.2f}배)")
+            if ratio > REGRESSION_RATIO:
+                regressions.append((name, scale, ratio))
+    return regressions
+
+
+def print_result(name, scale, result):
+    print(f"\n📊 {name} x{scale}: {result['wall']:.3f}s, 최대 메모리 {result['peak_mb']}MB")
+    for stage, stat in result['stages'].items():
+        print(f"   ⏱ {stage:<24} {stat['seconds']:.3f}s ({stat['calls']}회)")
+    for route, count in sorted(result['calls'].items()):
+        print(f"   📡 {route:<24} {count}회")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='오프라인 파이프라인 벤치마크')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 5])
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='OpenAI 대역 응답 지연(초)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--out', type=Path, help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.scenarios:
+        for scale in args.scales:
+            result = run_scenario(name, scale, args.llm_latency)
+            results.setdefault(name, {})[str(scale)] = result
+            print_result(name, scale, result)
+
+    if args.out:
+        args.out.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n💾 기준선 저장: {args.baseline}")
+        return 0
+    if args.baseline.exists():
+        print("\n=== 기준선 비교 ===")
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        return 1 if compare(results, baseline) else 0
+    print("\nℹ️ 기준선 없음 (--save-baseline 으로 저장)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pandas as pd
+import requests
+
+# ──────────────────────────────
+# 벤치마크용 로컬 대역 (인터파크 / 티켓베이 / OpenAI / 텔레그램 / PostgREST / 구글시트)
+# ──────────────────────────────
+# 하나의 로컬 HTTP 서버가 경로별로 각 서비스를 흉내내고,
+# requests 호출은 호스트 기준으로 이 서버로 돌려보낸다 (그 외 호스트는 차단).
+
+ROOT = Path(__file__).resolve().parent.parent
+
+REWRITE_HOSTS = {'tickets.interpark.com', 'ticketimage.interpark.com', 'api-ticketfront.interpark.com',
+                 'api.telegram.org', 'www.ticketbay.co.kr'}
+
+
+def _records(df):
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def interpark_notices(scale=1):
+    """all_list.csv 를 오늘 기준 날짜로 옮기고 scale 배로 복제한 공지 목록"""
+    src = pd.read_csv(ROOT / 'all_list.csv', dtype={'예매코드': str}).fillna('')
+    opens = pd.to_datetime(src['오픈시간'], errors='coerce')
+    shift = pd.Timestamp.now().normalize() - opens.min().normalize()
+    opens = (opens + shift).dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+    notices = []
+    for k in range(scale):
+        for i, row in enumerate(src.to_dict('records')):
+            notices.append({
+                'openDateStr': opens.iat[i],
+                'viewCount': int(row['조회수']) + k,
+                'openTypeStr': row['예매타입'],
+                'title': row['제목'] if k == 0 else f"{row['제목']} #{k}",
+                'goodsCode': f"{row['예매코드']}{k:02d}" if row['예매코드'] else '',
+                'goodsGenreStr': row['장르'],
+                'posterImageUrl': row['Image'],
+            })
+    return notices
+
+
+def ticketbay_listings(scale=1):
+    """ticketbay_log/*.csv + concert_list.csv 를 scale 배로 복제한 매물 목록"""
+    frames = [pd.read_csv(p) for p in sorted((ROOT / 'ticketbay_log').glob('*.csv'))]
+    frames.append(pd.read_csv(ROOT / 'concert_list.csv'))
+    df = pd.concat(frames, ignore_index=True).drop(columns=['category_name', 'collected_datetime'], errors='ignore')
+    df = df.drop_duplicates('id')
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        copy['id'] = copy['id'] + k * 10_000_000
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+class StandInState:
+    """서버 쪽 데이터와 호출 통계"""
+
+    def __init__(self, notices, listings, llm_latency=0.0):
+        self.notices = notices
+        self.listings = listings
+        self.listings_by_category = {str(c): _records(g) for c, g in listings.groupby('category_id')}
+        categories = listings.drop_duplicates('category_id')
+        self.categories = [{'id': int(c), 'name': n} for c, n in zip(categories['category_id'], categories['depth2_name'])]
+        self.llm_latency = llm_latency
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.bytes_out = 0
+        self.telegram_messages = []
+        self.postgrest_rows = 0
+        self.failing_goods = set()   # 상세 조회가 500 을 돌려줄 goodsCode
+
+    def count(self, route, size):
+        with self.lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            self.bytes_out += size
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.calls), self.bytes_out
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get('content-length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _send(self, route, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.state.count(route, len(body))
+        self.send_response(status)
+        self.send_header('content-type', 'application/json; charset=utf-8')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/contents/api/open-notice/notice-list':
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            # 실제 장르/지역 코드는 모르므로 ALL 만 흉내낸다 (그 외 코드는 실서버처럼 빈 목록)
+            if q.get('goodsGenre', 'ALL') != 'ALL' or q.get('goodsRegion', 'ALL') != 'ALL':
+                return self._send('interpark.notice', [])
+            rows = sorted(self.state.notices, key=lambda d: d['openDateStr'] or '9999')
+            offset, size = int(q.get('offset', 0)), int(q.get('pageSize', 50))
+            page = rows[offset:offset + size]
+            return self._send('interpark.notice', page)
+        if url.path == '/ticketbayApi/content/v1/public/categories':
+            return self._send('ticketbay.categories', {'data': [{'children': self.state.categories}]})
+        if url.path.startswith(('/TicketImage/', '/Play/')):
+            return self._poster(url.path)
+        if url.path.startswith('/v1/goods/'):
+            return self._goods(url.path)
+        return self._send('unknown', {'error': url.path}, 404)
+
+    def _goods(self, path):
+        """상품 상세 (goodsCode 로 정해지는 고정 값)"""
+        parts = path.strip('/').split('/')
+        code = parts[2]
+        if code in self.state.failing_goods:
+            return self._send('interpark.goods_error', {'error': code}, 500)
+        seed = int(hashlib.md5(code.encode()).hexdigest(), 16)
+        if parts[-1] == 'summary':
+            start = pd.Timestamp.now().normalize() + pd.Timedelta(days=14 + seed % 60)
+            end = start + pd.Timedelta(days=seed % 3)
+            return self._send('interpark.goods_summary', {'data': {
+                'goodsCode': code, 'placeName': f"벤치 공연장 {seed % 7 + 1}관",
+                'playStartDate': start.strftime('%Y%m%d'), 'playEndDate': end.strftime('%Y%m%d'),
+            }})
+        if parts[-2:] == ['prices', 'group']:
+            base = 55000 + (seed % 10) * 11000
+            return self._send('interpark.goods_prices', {'data': {'기본가': {
+                'VIP석': [{'salesPrice': base + 44000}], 'R석': [{'salesPrice': base + 22000}], 'S석': [{'salesPrice': base}],
+            }}})
+        return self._send('unknown', {'error': path}, 404)
+
+    def _poster(self, path):
+        """포스터 이미지 (Image/ 에 같은 파일명이 있으면 그 파일, 없으면 이름으로 하나 골라 대신)"""
+        samples = sorted((ROOT / 'Image').iterdir())
+        name = path.rsplit('/', 1)[-1]
+        source = ROOT / 'Image' / name
+        if not source.exists():
+            source = samples[int(hashlib.md5(name.encode()).hexdigest(), 16) % len(samples)]
+        body = source.read_bytes()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.state.count('interpark.poster_304', 0)
+            self.send_response(304)
+            self.send_header('etag', etag)
+            self.end_headers()
+            return
+        self.state.count('interpark.poster', len(body))
+        self.send_response(200)
+        self.send_header('content-type', 'image/gif' if source.suffix == '.gif' else 'image/jpeg')
+        self.send_header('content-length', str(len(body)))
+        self.send_header('etag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._body()
+        if url.path.startswith('/bot') and url.path.endswith('/sendMessage'):
+            form = {k: v[0] for k, v in parse_qs(body.decode('utf-8')).items()}
+            self.state.telegram_messages.append(form)
+            return self._send('telegram.sendMessage', {'ok': True, 'result': {'message_id': len(self.state.telegram_messages)}})
+        if url.path == '/ticketbayApi/product/v1/public/products':
+            payload = json.loads(body or b'{}')
+            items = self.state.listings_by_category.get(str(payload.get('category_id')), [])
+            return self._send('ticketbay.products', {'data': {'content': items}})
+        if url.path == '/v1/chat/completions':
+            return self._chat(json.loads(body or b'{}'))
+        if url.path.startswith('/rest/v1/'):
+            rows = json.loads(body or b'[]')
+            rows = rows if isinstance(rows, list) else [rows]
+            self.state.postgrest_rows += len(rows)
+            return self._send('postgrest.insert', rows, 201)
+        return self._send('unknown', {'error': url.path}, 404)
+
+    def _chat(self, payload):
+        """OpenAI chat.completions 흉내 (설정된 지연 후 고정 규칙으로 응답)"""
+        if self.state.llm_latency:
+            time.sleep(self.state.llm_latency)
+        prompt = payload['messages'][-1]['content']
+        if '해시태그' in prompt:
+            content = '#벤치마크 #대리티켓팅 #콘서트'
+        else:
+            # "제목: ..." 으로 시작하는 첫 줄 (telegram_fixed 프롬프트는 뒤에 "뮤지컬 제목:" 이 더 있음)
+            title = next((line.split(':', 1)[1].strip() for line in prompt.splitlines() if line.startswith('제목:')), '')
+            content = title[:15]
+        prompt_tokens, completion_tokens = len(prompt) // 2, len(content) // 2
+        self._send('openai.chat', {
+            'id': 'chatcmpl-bench', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': payload.get('model', 'gpt-4o'),
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        })
+
+
+class StandInServer:
+    """로컬 대역 서버 + requests 호스트 재작성"""
+
+    def __init__(self, state):
+        handler = type('Handler', (StandInHandler,), {'state': state})
+        self.state = state
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._original_request = None
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self._original_request = requests.Session.request
+        base, original = self.base_url, self._original_request
+
+        def request(session, method, url, *args, **kwargs):
+            parts = urlsplit(url)
+            if parts.hostname in REWRITE_HOSTS:
+                url = base + parts.path + (f"?{parts.query}" if parts.query else '')
+            elif parts.hostname != '127.0.0.1':
+                raise requests.ConnectionError(f"오프라인 벤치마크: 외부 호출 차단 ({parts.hostname})")
+            kwargs.pop('verify', None)
+            return original(session, method, url, *args, **kwargs)
+
+        requests.Session.request = request
+        return self
+
+    def __exit__(self, *exc):
+        requests.Session.request = self._original_request
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class MemoryWorksheet:
+    """gspread Worksheet 의 인메모리 대역"""
+
+    def __init__(self, title):
+        self.title = title
+        self.rows = []
+        self.calls = 0
+
+    def clear(self):
+        self.calls += 1
+        self.rows = []
+
+    def append_row(self, row, **kwargs):
+        self.calls += 1
+        self.rows.append(list(row))
+
+    def append_rows(self, rows, **kwargs):
+        self.calls += 1
+        self.rows.extend(list(r) for r in rows)
+
+    def get_all_values(self):
+        self.calls += 1
+        return [list(r) for r in self.rows]
+
+
+class MemorySpreadsheet:
+    def __init__(self):
+        self.sheets = {}
+
+    def worksheet(self, title):
+        return self.sheets.setdefault(title, MemoryWorksheet(title))
+
+
+class MemoryGspread:
+    """gspread.authorize(...) 가 돌려주는 클라이언트 대역"""
+
+    def __init__(self):
+        self.spreadsheets = {}
+
+    def open(self, name):
+        return self.spreadsheets.setdefault(name, MemorySpreadsheet())
+
+    def sheet_calls(self):
+        return sum(ws.calls for ss in self.spreadsheets.values() for ws in ss.sheets.values())
@@ -274,20 +274,13 @@ class PostBunjang:
             "lon": 127.022219,
             "dongId": 648
         }
-        os.makedirs("image", exist_ok=True)
 
     def _download_image(self, url):
-        path = f"image/{url.split('/')[-1]}"
-        if os.path.exists(path):
-            print(f"📁 이미지 이미 존재: {path}")
-            return path
-        r = requests.get(url, stream=True)
-        if r.status_code == 200:
-            with open(path, "wb") as f:
-                for chunk in r.iter_content(1024):
-                    f.write(chunk)
-            print(f"✅ 이미지 다운로드 완료: {path}")
-            return path
+        # bunjang.py 와 같은 포스터 캐시(poster_cache/)를 쓴다 (같은 포스터는 한 번만 받고, 용량 정리도 함께)
+        from poster_cache import PosterCache
+        path = PosterCache().prefetch([url]).get(url)
+        if path:
+            return str(path)
         print(f"❌ 이미지 다운로드 실패: {url}")
         return None
 
@@ -1,29 +1,46 @@
 import os
 import json
-import requests
-import pandas as pd
 from pathlib import Path
-from openai import OpenAI
 from datetime import datetime
-from tqdm import tqdm
 import random
 from time import sleep
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import dotenv
-import schedule
 import time
+from metrics import span, incr, record_http, start_run, finish_run
+from cassette import is_replaying
+from quota import acquire, try_acquire, attach_report
+
+# pandas / openai / gspread / requests 등 무거운 모듈과 서비스 클라이언트는
+# 실제로 쓰는 시점에 불러온다 (--now 실행, 스케줄러 대기, 테스트 시작 시간 단축)
 
 # 환경변수 로드
 dotenv.load_dotenv()
 
 class InterparkTicketCrawler:
-    def __init__(self, creds='google.json', sheet_name='감사한 티켓팅 신청서'):
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(creds, scope)
-        self.sheet = gspread.authorize(creds).open(sheet_name).worksheet('Hot')
-
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # 가수명/해시태그 프롬프트 ({title}, {artist}, {genre})
+    ARTIST_PROMPT = "제목: {title}\n\n위 공연 제목에서 핵심 아티스트명이나 작품명만 간단히 추출해주세요. 15자 이내로 답변해주세요. 설명은 하지 말고 이름만 답변하세요."
+    HASHTAG_PROMPT = "콘서트 제목: {title}\n가수 또는 뮤지컬 제목: {artist}\n장르: {genre}\n해시태그 10개를 한국어로 작성. '#' 포함, 한 줄로, 콤마 없이, 9자 이내 키워드:"
+    ARTIST_MAX_LENGTH = 15
+    # 미리 변환해 둘 포스터 업로드 프로필 (poster_normalize.PROFILES)
+    POSTER_PROFILES = ('bunjang',)
+    # 단계 결과 저장 위치 (pipeline_cache/{PIPELINE}/)
+    PIPELINE = 'notice'
+    FETCH_TTL = 600
+    # threshold 모드에서 THRESHOLDS 에 없는 장르를 임계값 없이 통과시킬지 (False 면 DEFAULT_THRESHOLD)
+    PASS_UNLISTED_GENRES = False
+    # 오픈시간이 없는 공지 제외 여부
+    REQUIRE_OPEN_TIME = True
+
+    def __init__(self, creds='google.json', sheet_name='감사한 티켓팅 신청서', hot_mode=None, telegram_chat=None):
+        # 'score': 조회수 증가 속도 기반, 'threshold': 기존 장르별 고정 임계값
+        self.hot_mode = hot_mode or os.getenv('HOT_MODE', 'score')
+        # 핫 리스트를 보낼 텔레그램 채팅 (없으면 전송 단계 없음)
+        self.telegram_chat = telegram_chat
+        self.creds_path = creds
+        self.sheet_name = sheet_name
+        self._sheet = None
+        self._client = None
+        self._llm = None
 
         self.cache_paths = {
             "artist": Path('artist_cache.json'),
@@ -32,6 +49,33 @@ class InterparkTicketCrawler:
         }
         self.cache = {k: self._load_cache(p) for k, p in self.cache_paths.items()}
 
+    @property
+    def sheet(self):
+        # 시트 인증/열기는 업로드 직전에 한 번만
+        if self._sheet is None:
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+            scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+            creds = ServiceAccountCredentials.from_json_keyfile_name(self.creds_path, scope)
+            self._sheet = gspread.authorize(creds).open(self.sheet_name).worksheet('Hot')
+        return self._sheet
+
+    @property
+    def client(self):
+        # 캐시에 없는 제목이 있을 때만 OpenAI 클라이언트 생성
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    @property
+    def llm(self):
+        # 단순한 제목은 작은 모델, 검증 실패 시 큰 모델 (실행 1회 토큰 예산 공유)
+        if self._llm is None:
+            from llm_router import LLMRouter
+            self._llm = LLMRouter(lambda: self.client)
+        return self._llm
+
     def _load_cache(self, path):
         if path.exists():
             try:
@@ -46,39 +90,90 @@ class InterparkTicketCrawler:
             json.dump(self.cache[name], f, ensure_ascii=False, indent=2)
 
     def fetch_data(self):
-        url = "https://tickets.interpark.com/contents/api/open-notice/notice-list"
-        params = {"goodsGenre": "ALL", "goodsRegion": "ALL", "offset": 0, "pageSize": 400, "sorting": "OPEN_ASC"}
-        headers = {"user-agent": "Mozilla/5.0", "referer": "https://tickets.interpark.com/contents/notice"}
-        r = requests.get(url, params=params, headers=headers)
-        r.raise_for_status()
-        return r.json()
+        from sharded_fetch import fetch_all_notices
+        # 전체 공지를 offset 으로 페이지 끝까지 수집 (400건 제한 회피)
+        data, self.coverage = fetch_all_notices()
+        return data
 
     def filter_hot(self, data):
-        limits = {'콘서트': 600, '뮤지컬': 500, '연극': 500, '클래식/오페라': 400}
-        return [{
-            '오픈시간': d.get('openDateStr', ''),
-            '조회수': d.get('viewCount', 0),
-            '예매타입': d.get('openTypeStr', ''),
-            '제목': d.get('title', ''),
-            '예매코드': d.get('goodsCode', ''),
-            '장르': d.get('goodsGenreStr', ''),
-            'Image': d.get('posterImageUrl', '')
-        } for d in data if d.get('viewCount', 0) > limits.get(d.get('goodsGenreStr', ''), 10000)]
+        from hotness import ViewHistory, hot_mask_by_score, hot_mask_by_threshold, DEFAULT_THRESHOLD
+        scores = None
+        if self.hot_mode == 'score':
+            history = ViewHistory()
+            mask, scores = hot_mask_by_score(data, history)
+            # 재생한 조회수가 실제 증가 이력에 섞이지 않도록 dry-run 에서는 저장 안 함
+            if not is_replaying():
+                history.save()
+        else:
+            mask = hot_mask_by_threshold(data, None if self.PASS_UNLISTED_GENRES else DEFAULT_THRESHOLD)
+
+        hot = []
+        for i, d in enumerate(data):
+            if not mask[i]:
+                continue
+            row = {
+                '오픈시간': d.get('openDateStr', ''),
+                '조회수': d.get('viewCount', 0),
+                '예매타입': d.get('openTypeStr', ''),
+                '제목': d.get('title', ''),
+                '예매코드': d.get('goodsCode', ''),
+                '장르': d.get('goodsGenreStr', ''),
+                'Image': d.get('posterImageUrl', '')
+            }
+            if scores is not None:
+                row['핫점수'] = scores[i]
+            hot.append(row)
+        return hot
+
+    def hot_frame(self, notices):
+        """핫 공지 DataFrame (오픈시간 없는 공지 제외, 핫점수 → 오픈시간 순)"""
+        import pandas as pd
+        df = pd.DataFrame(self.filter_hot(notices))
+        if not df.empty and self.REQUIRE_OPEN_TIME:
+            df = df[df['오픈시간'].notna() & (df['오픈시간'] != '')]
+        incr('notices', len(notices), kind='fetched')
+        incr('notices', len(df), kind='hot')
+        if df.empty:
+            return df
+        if '핫점수' in df.columns:
+            return df.sort_values(by=['핫점수', '오픈시간'], ascending=[False, True])
+        return df.sort_values(by='오픈시간')
+
+    def add_details(self, df):
+        from goods_detail import add_detail_columns
+        # 핫 공지만 상세 조회 (공연장 / 공연기간 / 가격)
+        return add_detail_columns(df)
+
+    def prefetch_posters(self, df):
+        from poster_cache import PosterCache
+        from poster_normalize import normalize_posters
+        # 핫 리스트 포스터를 한 번에 받아 업로드용으로 변환해 두기 (번장 게시 시 재작업 없음)
+        # → {URL: [원본 경로, 프로필별 변환본 경로 ...]} (메모 재사용 전에 파일이 남아 있는지 확인용)
+        posters = {url: path for url, path in PosterCache().prefetch(df['Image']).items() if path}
+        files = {url: [str(path)] for url, path in posters.items()}
+        for profile in self.POSTER_PROFILES:
+            variants = normalize_posters(list(posters.values()), profile)
+            for url, path in posters.items():
+                if str(path) in variants:
+                    files[url].append(str(variants[str(path)]))
+        return files
+
+    @staticmethod
+    def posters_on_disk(files):
+        """메모된 posters 결과의 원본/변환본이 아직 디스크에 있는지"""
+        return all(Path(p).exists() for paths in files.values() for p in paths)
 
     def extract_artist(self, title):
         if title in self.cache["artist"]:
             return self.cache["artist"][title]
-        prompt = f"제목: {title}\n\n위 공연 제목에서 핵심 아티스트명이나 작품명만 간단히 추출해주세요. 15자 이내로 답변해주세요. 설명은 하지 말고 이름만 답변하세요."
+        from llm_router import valid_artist
+        prompt = self.ARTIST_PROMPT.format(title=title)
         try:
-            res = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2
-            )
-            artist = res.choices[0].message.content.strip().strip('"')
-            # 15자 제한
-            if len(artist) > 15:
-                artist = artist[:15]
+            artist = self.llm.complete('artist', prompt, title, temperature=0.2,
+                                       validate=lambda text: valid_artist(text, self.ARTIST_MAX_LENGTH)).strip('"')
+            # 길이 제한
+            if len(artist) > self.ARTIST_MAX_LENGTH:
+                artist = artist[:self.ARTIST_MAX_LENGTH]
             self.cache["artist"][title] = artist
             return artist
         except Exception as e:
@@ -88,77 +183,126 @@ class InterparkTicketCrawler:
     def generate_hashtags(self, title, artist, genre):
         if title in self.cache["hashtag"]:
             return self.cache["hashtag"][title]
-        prompt = f"콘서트 제목: {title}\n가수 또는 뮤지컬 제목: {artist}\n장르: {genre}\n해시태그 10개를 한국어로 작성. '#' 포함, 한 줄로, 콤마 없이, 9자 이내 키워드:"
+        prompt = self.HASHTAG_PROMPT.format(title=title, artist=artist, genre=genre)
         try:
-            res = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-            )
-            hashtags = res.choices[0].message.content.strip()
+            hashtags = self.llm.complete('hashtag', prompt, title, temperature=0.5)
             self.cache["hashtag"][title] = hashtags
             return hashtags
         except Exception as e:
             print(f"❌ OpenAI 오류 (해시태그): {e}")
             return "#대리티켓팅"
 
-    def format_time(self, raw_time):
-        try:
-            dt = datetime.strptime(raw_time, '%Y-%m-%d %H:%M:%S') if isinstance(raw_time, str) else raw_time
-            return dt.strftime('%m월 %d일 %p %I시').replace('AM', '오전').replace('PM', '오후').replace('0', '')
-        except:
-            return ""
-
     def add_columns(self, df):
+        from enrich import enrich_frame
+        from pipeline import Degraded
         print("🤖 데이터 생성 중...")
-        artists, hashtags, tweets, bunjangs = [], [], [], []
-        for _, row in tqdm(df.iterrows(), total=len(df)):
-            title, genre, raw_time = row['제목'], row['장르'], row['오픈시간']
-            artist = self.extract_artist(title)
-            hashtag = self.generate_hashtags(title, artist, genre)
-            open_time = self.format_time(raw_time)
-
-            tweet = f"{title}\n\n🚨 {artist} 대리티켓팅(댈티)\n\n수고비 제일 저렴\n경력 매우 많음\n\n상담 링크: https://open.kakao.com/o/sAJ8m2Ah\n\n{hashtag}"
-            bunjang = f"{title}\n\n🚨 {artist} 대리티켓팅(댈티)\n\n수고비 제일 저렴\n경력 매우 많음\n\n가격: 번개톡 상담\n\n{hashtag}"
-
-            artists.append(artist)
-            hashtags.append(hashtag)
-            tweets.append(tweet)
-            bunjangs.append(bunjang)
-
-        df['가수명'] = artists
-        df['해시태그'] = hashtags
-        df['트위터'] = tweets
-        df['번장'] = bunjangs
+        df = enrich_frame(df, self.extract_artist, self.generate_hashtags, self.cache["artist"], self.cache["hashtag"])
         self._save_cache("artist")
         self._save_cache("hashtag")
+        # 실패한 제목은 캐시에 없으므로 ("불명" / "#대리티켓팅"), 이번 결과는 메모하지 않고 다음 실행에서 다시 묻는다
+        fallback = ~df['제목'].isin(self.cache["artist"]) | ~df['제목'].isin(self.cache["hashtag"])
+        if fallback.any():
+            raise Degraded(df, f"LLM 실패로 기본값 {int(fallback.sum())}행")
+        return df
+
+    def render_columns(self, df):
+        """트위터/번장 문구 ('템플릿' 컬럼이 있으면 행별로 id/카테고리 선택)"""
+        from enrich import format_open_time
+        from templates import TemplateEngine
+        engine = TemplateEngine.load()
+        values = df.assign(오픈시간표시=format_open_time(df['오픈시간']).values)
+        for column, default in (('트위터', 'twitter_default'), ('번장', 'bunjang_default')):
+            if '템플릿' in df.columns:
+                df[column] = engine.render_by(values, df['템플릿'], default).values
+            else:
+                df[column] = engine.render(values, default).values
         return df
 
+    def add_resale(self, df):
+        from resale_join import add_resale_columns
+        return add_resale_columns(df)
+
     def update_sheet(self, df):
+        if is_replaying():
+            print(f"🧪 dry-run: 시트 업로드 생략 ({len(df)}개)")
+            return 0
+        # 한도를 끝내 못 받으면 단계를 실패로 돌려 (메모하지 않음) 다음 실행에서 다시 올린다
+        if not acquire('sheets'):
+            raise RuntimeError("시트 한도 대기 시간 초과: 시트 초기화 생략")
         self.sheet.clear()
         if df.empty:
             print("📭 HOT 티켓 없음")
-            return
+            return 0
+        if not acquire('sheets'):
+            raise RuntimeError("시트 한도 대기 시간 초과: 헤더 업로드 생략")
         self.sheet.append_row(list(df.columns))
+        # 행 단위 추가는 한도가 있을 때만 바로 하고, 모자라면 남은 행을 모아 한 번에 올린다
+        deferred = []
         for row in df.values.tolist():
-            self.sheet.append_row(row)
+            if not deferred and try_acquire('sheets'):
+                self.sheet.append_row(row)
+            else:
+                deferred.append(row)
+        calls = len(df) - len(deferred) + 2
+        if deferred:
+            print(f"⏳ 시트 한도 부족: 남은 {len(deferred)}행은 한 번에 추가")
+            if not acquire('sheets'):
+                raise RuntimeError(f"시트 한도 대기 시간 초과: {len(deferred)}행 업로드 못 함")
+            self.sheet.append_rows(deferred)
+            calls += 1
+        incr('api_calls', calls, provider='sheets')
         print(f"✅ {len(df)}개 티켓 업로드 완료")
+        return len(df)
+
+    def deliver_telegram(self, df):
+        from telegram import send_message, format_hot_message
+        result = send_message(self.telegram_chat, format_hot_message(df))
+        if not result.get('ok'):
+            # 실패한 전송은 메모하지 않고 다음 실행에서 다시 보낸다
+            raise RuntimeError(f"텔레그램 전송 실패: {result.get('description', result)}")
+        print(f"📨 텔레그램 전송 완료 ({len(df)}개)")
+        return len(df)
+
+    def stages(self):
+        """수집 → 필터 → 상세/포스터/보강 → 렌더 → 리셀 → 시트 (+ 텔레그램)"""
+        import pandas as pd
+        from pipeline import Stage
+        from templates import TEMPLATES_PATH
+        DataFrame = pd.DataFrame
+        passthrough = lambda df: df
+        templates_mtime = TEMPLATES_PATH.stat().st_mtime if TEMPLATES_PATH.exists() else None
+        stages = [
+            Stage('fetch', self.fetch_data, outputs={'notices': list}, ttl=self.FETCH_TTL),
+            Stage('filter', self.hot_frame, inputs={'notices': list}, outputs={'hot': DataFrame},
+                  params={'hot_mode': self.hot_mode}, stop_if=lambda hot: hot.empty),
+            Stage('goods_detail', self.add_details, inputs={'hot': DataFrame}, outputs={'detailed': DataFrame},
+                  fallback=passthrough),
+            Stage('posters', self.prefetch_posters, inputs={'detailed': DataFrame}, outputs={'posters': dict},
+                  params={'profiles': self.POSTER_PROFILES}, fallback=lambda df: {}, check=self.posters_on_disk),
+            Stage('enrich', self.add_columns, inputs={'detailed': DataFrame}, outputs={'enriched': DataFrame},
+                  params={'artist': self.ARTIST_PROMPT, 'hashtag': self.HASHTAG_PROMPT}),
+            Stage('render', self.render_columns, inputs={'enriched': DataFrame}, outputs={'rendered': DataFrame},
+                  params={'templates': templates_mtime}),
+            Stage('resale_join', self.add_resale, inputs={'rendered': DataFrame}, outputs={'final': DataFrame},
+                  fallback=passthrough),
+            Stage('sheet_sync', self.update_sheet, inputs={'final': DataFrame}, outputs={'synced': int},
+                  params={'sheet': self.sheet_name}),
+        ]
+        if self.telegram_chat:
+            # 핫 리스트만 있으면 되므로 보강/렌더/시트와 병렬로 전송
+            stages.append(Stage('telegram', self.deliver_telegram, inputs={'hot': DataFrame},
+                                outputs={'delivered': int}, params={'chat': self.telegram_chat}))
+        return stages
 
     def run(self):
-        data = self.fetch_data()
-        hot_list = self.filter_hot(data)
-        df = pd.DataFrame(hot_list)
-        df = df[df['오픈시간'].notna() & (df['오픈시간'] != '')]
-        if df.empty:
-            return df
-        df = df.sort_values(by='오픈시간')
-        df = self.add_columns(df)
-        self.update_sheet(df)
-        return df
+        from pipeline import Pipeline
+        # 녹화본 재생(dry-run)은 이전 결과를 재사용하지 않고 매번 끝까지 돌린다
+        values = Pipeline(self.PIPELINE, self.stages()).run(use_memo=not is_replaying())
+        return values.get('final', values['hot'])
 
 
 class PostBunjang:
-    def __init__(self, auth_token="53a119a23abe4baa83d75e604dbc2a2d"):
+    def __init__(self, auth_token="53a119a23abe4baa83d75e604dbc2a2d", posters=None):
         self.auth_token = auth_token
         self.location = {
             "address": "서울특별시 서초구 서초4동",
@@ -166,30 +310,29 @@ class PostBunjang:
             "lon": 127.022219,
             "dongId": 648
         }
-        os.makedirs("image", exist_ok=True)
+        self._posters = posters
+
+    @property
+    def posters(self):
+        if self._posters is None:
+            from poster_cache import PosterCache
+            self._posters = PosterCache()
+        return self._posters
 
     def _download_image(self, url):
-        path = f"image/{url.split('/')[-1]}"
-        if os.path.exists(path):
-            print(f"📁 이미지 이미 존재: {path}")
-            return path
-        try:
-            # SSL 인증서 검증 우회
-            r = requests.get(url, stream=True, verify=False)
-            if r.status_code == 200:
-                with open(path, "wb") as f:
-                    for chunk in r.iter_content(1024):
-                        f.write(chunk)
-                print(f"✅ 이미지 다운로드 완료: {path}")
-                return path
-            print(f"❌ 이미지 다운로드 실패: {url} (상태코드: {r.status_code})")
-            return None
-        except Exception as e:
-            print(f"❌ 이미지 다운로드 오류: {url} - {e}")
+        from poster_normalize import normalize_posters
+        # 크롤러 run 에서 미리 받아 둔 포스터를 쓰고, 없을 때만 받는다
+        path = self.posters.get(url) or self.posters.prefetch([url]).get(url)
+        if not path:
             return None
-
-    def register_bunjang_product(self, image_path, name, description, keywords, price):
-        print(f"🚀 번장 상품 등록 시작: {name}")
+        # 업로드용 변환본 (run 에서 이미 변환했으면 캐시에서 바로 나온다)
+        return str(normalize_posters([path], 'bunjang').get(str(path), path))
+
+    def register_bunjang_product(self, image_path, name, description, keywords, price, pid=None):
+        """상품 등록 → pid (pid 를 주면 기존 상품을 수정, 그 상품이 없어졌으면 새로 등록해 새 pid)"""
+        import requests
+        from poster_normalize import mime_type
+        print(f"🚀 번장 상품 {'수정' if pid else '등록'} 시작: {name}" + (f" (pid {pid})" if pid else ""))
         print(f"📁 이미지 경로: {image_path}")
         print(f"💰 가격: {price}")
         
@@ -202,8 +345,9 @@ class PostBunjang:
 
         try:
             with open(image_path, 'rb') as img_file:
-                files = {'file': ('upload.jpg', img_file, 'image/jpeg')}
+                files = {'file': (f"upload{Path(image_path).suffix}", img_file, mime_type(image_path))}
                 upload_res = requests.post(upload_url, headers={'referer': 'https://m.bunjang.co.kr/'}, files=files)
+            record_http('bunjang', upload_res)
 
             if upload_res.status_code != 200:
                 print(f"❌ 이미지 업로드 실패: 상태코드 {upload_res.status_code}")
@@ -236,56 +380,100 @@ class PostBunjang:
                 "naverShoppingData": {"isEnabled": False}
             }
 
-            res = requests.post(product_url, headers={'x-bun-auth-token': self.auth_token}, json=data)
+            headers = {'x-bun-auth-token': self.auth_token}
+            if pid:
+                # 주의: 수정 엔드포인트(PUT {product_url}/{pid})는 등록 API 경로에서 유추한 것으로,
+                # 공개 문서나 실서버로 확인하지 못했다. 상품이 지워져 404/410 이면 새로 등록한다.
+                res = requests.put(f"{product_url}/{pid}", headers=headers, json=data)
+                record_http('bunjang', res)
+                if res.status_code in (404, 410):
+                    print(f"ℹ️ 기존 상품 {pid} 없음 (상태코드 {res.status_code}) → 새로 등록")
+                    pid = None
+            if not pid:
+                res = requests.post(product_url, headers=headers, json=data)
+                record_http('bunjang', res)
             if res.status_code != 200:
-                print(f"❌ 제품 등록 실패: 상태코드 {res.status_code}")
+                print(f"❌ 제품 {'수정' if pid else '등록'} 실패: 상태코드 {res.status_code}")
                 print(f"❌ 응답 내용: {res.text}")
                 print(f"❌ 요청 데이터: {json.dumps(data, ensure_ascii=False, indent=2)}")
                 return None
 
-            return res.json().get("data", {}).get("pid")
+            return pid or res.json().get("data", {}).get("pid")
         except Exception as e:
             print(f"❌ 예외 발생: {e}")
             return None
 
-    def post(self, image_url, title, text, hash_tag, price):
+    def post(self, image_url, title, text, hash_tag, price, pid=None):
         path = self._download_image(image_url)
         if not path:
             return
-        pid = self.register_bunjang_product(path, title, text, hash_tag, price)
+        pid = self.register_bunjang_product(path, title, text, hash_tag, price, pid)
         if pid:
             print(f"🔗 번장 링크: https://m.bunjang.co.kr/products/{pid}")
+        return pid
 
 
 def run_ticket_crawling():
     """티켓 크롤링 및 번장 게시 실행"""
     print(f"🚀 티켓 크롤링 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
+    start_run('bunjang')
+    try:
+        _run_ticket_crawling()
+    finally:
+        attach_report()
+        finish_run()
+
+
+def _run_ticket_crawling():
+    from tqdm import tqdm
+    from publish_ledger import PublishLedger, content_hash, notice_id
     df = InterparkTicketCrawler().run()
-    if df is not None and not df.empty:
-        for _, row in tqdm(df.iterrows(), total=len(df)):
-            title = f"{row['가수명']} 대리티켓팅(댈티)"
-            # 번장 상품명은 40자 제한
-            if len(title) > 40:
-                title = title[:37] + "..."
-            PostBunjang().post(
-                image_url=row['Image'],
-                title=title,
-                text=row['번장'],
-                hash_tag=row['해시태그'],
-                price=9999
-            )
-            wait = random.randint(60, 90)
-            for sec in range(wait, 0, -1):
-                print(f"\r⏰ 다음 게시까지 {sec}초 남음...", end="", flush=True)
-                sleep(1)
-            print(f"\n⏳ {wait}초 대기 완료")
-        print(f"✅ 티켓 크롤링 완료: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    else:
+    if df is None or df.empty:
         print("❌ 처리할 티켓이 없습니다.")
+        return
+
+    # 이전 실행에서 이미 올린 공지(내용 동일)는 건너뛴다
+    ledger = PublishLedger()
+    todo = []
+    for row in df.to_dict('records'):
+        title = f"{row['가수명']} 대리티켓팅(댈티)"
+        # 번장 상품명은 40자 제한
+        if len(title) > 40:
+            title = title[:37] + "..."
+        post = dict(image_url=row['Image'], title=title, text=row['번장'], hash_tag=row['해시태그'], price=9999)
+        digest = content_hash(*post.values())
+        if ledger.needs_publish(notice_id(row), 'bunjang', digest):
+            todo.append((notice_id(row), digest, post))
+        elif ledger.gave_up(notice_id(row), 'bunjang', digest):
+            print(f"⛔ 게시 {ledger.MAX_ATTEMPTS}회 실패로 포기: {notice_id(row)} ({title})")
+    skipped = len(df) - len(todo)
+    incr('publish', skipped, channel='bunjang', kind='skipped')
+    print(f"📒 게시 대상 {len(todo)}개 (이미 게시됨 {skipped}개 건너뜀)")
+
+    poster = PostBunjang()
+    for i, (notice, digest, post) in enumerate(tqdm(todo, total=len(todo))):
+        # 이미 올라간 상품이 있으면 (내용만 바뀐 경우) 새로 올리지 않고 그 상품을 수정한다
+        previous = ledger.remote_id(notice, 'bunjang')
+        with span('bunjang_post'):
+            pid = poster.post(**post, pid=previous)
+        incr('publish', channel='bunjang', kind='posted' if pid else 'failed')
+        # dry-run 은 재생한 응답이므로 장부에 남기지 않는다
+        if not is_replaying():
+            ledger.record(notice, 'bunjang', digest, 'posted' if pid else 'failed', pid)
+            ledger.save()
+        # 다음 게시가 남아 있을 때만 간격을 둔다
+        if is_replaying() or i == len(todo) - 1:
+            continue
+        wait = random.randint(60, 90)
+        for sec in range(wait, 0, -1):
+            print(f"\r⏰ 다음 게시까지 {sec}초 남음...", end="", flush=True)
+            sleep(1)
+        print(f"\n⏳ {wait}초 대기 완료")
+    print(f"✅ 티켓 크롤링 완료: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 def main():
     """메인 실행 함수 - 스케줄러 설정"""
+    import schedule
     print("🕐 티켓 크롤링 스케줄러 시작")
     print("📅 실행 시간: 오전 9시, 12시 / 오후 6시, 9시")
     
@@ -305,7 +493,12 @@ def main():
 if __name__ == "__main__":
     # 즉시 실행 옵션 (테스트용)
     import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--now":
+    from profiling import enable_from_argv
+    import cassette
+    enable_from_argv('bunjang')
+    # --record: 실제 호출 녹화, --dry-run: 녹화본만으로 즉시 1회 실행
+    cassette.enable_from_argv('bunjang')
+    if "--now" in sys.argv[1:] or cassette.is_replaying():
         print("🚀 즉시 실행 모드")
         run_ticket_crawling()
     else:
@@ -0,0 +1,272 @@
+import os
+import re
+import sys
+import gzip
+import json
+import atexit
+import base64
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import metrics
+
+# ──────────────────────────────
+# HTTP 녹화 / 재생 (cassette)
+# ──────────────────────────────
+# python bunjang.py --now --record     실제 API 호출 결과를 cassettes/bunjang.json.gz 에 저장
+# python bunjang.py --now --dry-run    저장된 응답만 사용 (네트워크 접근 없음)
+# (CASSETTE_MODE=record|replay 환경변수도 동일)
+#
+# requests(인터파크/티켓베이/텔레그램/번장/구글) 와 httpx(OpenAI/Supabase) 의
+# 전송 단계를 가로채므로 호출하는 쪽 코드는 그대로 둔다.
+# 요청 키는 메서드 + 호스트/경로 + 정렬된 쿼리 + 정규화한 본문의 해시.
+# 같은 키가 여러 번 녹화되면 녹화 순서대로 돌려주고, 마지막 응답을 반복한다.
+
+CASSETTE_DIR = Path(os.getenv('CASSETTE_DIR', 'cassettes'))
+
+# 게시/업로드처럼 본문이 매번 달라도 응답 형식이 같은 곳은 본문을 키에서 뺀다
+# (문구만 바뀐 파이프라인도 dry-run 이 끝까지 돌도록)
+BODYLESS_HOSTS = ('api.telegram.org', 'api.bunjang.co.kr', 'media-center.bunjang.co.kr',
+                  'supabase.co', 'sheets.googleapis.com')
+
+# 응답 본문은 풀어서 저장하므로 전송 관련 헤더는 버린다
+DROP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'set-cookie'}
+
+# URL 경로에 들어가는 텔레그램 봇 토큰은 키/파일에 남기지 않는다
+BOT_TOKEN = re.compile(r'/bot[^/]+/')
+
+
+class CassetteMiss(Exception):
+    """재생 모드에서 녹화되지 않은 요청"""
+
+
+def _host_matches(host, suffixes):
+    return any(host == s or host.endswith('.' + s) for s in suffixes)
+
+
+def _normalize_body(body, content_type=''):
+    if not body:
+        return ''
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    elif not isinstance(body, bytes):
+        # 스트리밍 본문(파일 등)은 내용 대신 종류만
+        return type(body).__name__
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False)
+    except ValueError:
+        pass
+    if 'x-www-form-urlencoded' in (content_type or ''):
+        return urlencode(sorted(parse_qsl(body.decode('utf-8', 'replace'), keep_blank_values=True)))
+    return hashlib.sha256(body).hexdigest()
+
+
+def normalize_request(method, url, body=None, content_type=''):
+    """요청 → (키, 사람이 읽을 요약)"""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    netloc = f"{host}:{parts.port}" if parts.port else host
+    path = BOT_TOKEN.sub('/bot<token>/', parts.path)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    summary = f"{method.upper()} {parts.scheme}://{netloc}{path}" + (f"?{query}" if query else '')
+    body_key = '' if _host_matches(host, BODYLESS_HOSTS) else _normalize_body(body, content_type)
+    key = hashlib.sha1(f"{summary}\n{body_key}".encode('utf-8')).hexdigest()
+    return key, summary
+
+
+class Cassette:
+    """요청 키 → 응답 목록 (gzip JSON 파일 1개)"""
+
+    def __init__(self, name, mode, directory=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"알 수 없는 cassette 모드: {mode}")
+        self.name = name
+        self.mode = mode
+        self.path = Path(directory or CASSETTE_DIR) / f"{name}.json.gz"
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.cursor = {}
+        self.stats = {'hit': 0, 'miss': 0, 'recorded': 0}
+        if mode == 'replay':
+            if not self.path.exists():
+                raise FileNotFoundError(f"녹화 파일 없음: {self.path} (먼저 --record 로 실행)")
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def play(self, key, summary):
+        with self.lock:
+            responses = self.entries.get(key)
+            if not responses:
+                self.stats['miss'] += 1
+                metrics.incr('cassette', kind='miss')
+                raise CassetteMiss(f"녹화되지 않은 요청: {summary}")
+            i = self.cursor.get(key, 0)
+            self.cursor[key] = i + 1
+            self.stats['hit'] += 1
+        metrics.incr('cassette', kind='hit')
+        return responses[min(i, len(responses) - 1)]
+
+    def record(self, key, summary, status, headers, content, encoding=None):
+        entry = {
+            'request': summary,
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS},
+            'encoding': encoding,
+            'body': base64.b64encode(content or b'').decode('ascii'),
+        }
+        with self.lock:
+            # 이번 녹화에서 처음 본 키는 이전 녹화분을 덮어쓴다
+            if key not in self.cursor:
+                self.entries[key] = []
+                self.cursor[key] = 0
+            self.entries[key].append(entry)
+            self.stats['recorded'] += 1
+        metrics.incr('cassette', kind='recorded')
+
+    def save(self):
+        if self.mode != 'record':
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with self.lock, gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        print(f"📼 녹화 저장: {self.path} ({self.stats['recorded']}건, 요청 {len(self.entries)}종)")
+        return self.path
+
+    def report(self):
+        s = self.stats
+        if self.mode == 'replay':
+            print(f"📼 재생: 적중 {s['hit']}건, 미녹화 {s['miss']}건 ({self.path})")
+
+
+_active = None
+
+
+def active():
+    return _active
+
+
+def is_replaying():
+    return _active is not None and _active.mode == 'replay'
+
+
+# ──────────────────────────────
+# requests 연결
+# ──────────────────────────────
+def _requests_response(entry, request):
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    r = requests.Response()
+    r.status_code = entry['status']
+    r.headers = CaseInsensitiveDict(entry['headers'])
+    r._content = base64.b64decode(entry['body'])
+    r._content_consumed = True
+    r.encoding = entry.get('encoding')
+    r.url = request.url
+    r.request = request
+    r.reason = 'REPLAY'
+    return r
+
+
+def _patch_requests(cassette):
+    import requests
+    original = requests.Session.send
+
+    def send(self, request, **kwargs):
+        key, summary = normalize_request(request.method, request.url, request.body,
+                                         request.headers.get('Content-Type', ''))
+        if cassette.mode == 'replay':
+            return _requests_response(cassette.play(key, summary), request)
+        response = original(self, request, **kwargs)
+        # stream=True 여도 여기서 읽어 두면 호출 측 iter_content 는 메모리에서 나온다
+        cassette.record(key, summary, response.status_code, response.headers, response.content, response.encoding)
+        return response
+
+    requests.Session.send = send
+    return lambda: setattr(requests.Session, 'send', original)
+
+
+# ──────────────────────────────
+# httpx 연결 (OpenAI / Supabase)
+# ──────────────────────────────
+def _httpx_client_classes():
+    classes = []
+    try:
+        import httpx
+        classes.append(httpx.Client)
+    except ImportError:
+        pass
+    try:
+        # OpenAI SDK 버전에 따라 httpx 호환 패키지를 따로 쓰는 경우가 있다
+        import openai
+        classes += [c for c in openai.DefaultHttpxClient.__mro__
+                    if c.__name__ == 'Client' and c.__module__.startswith('httpx') and c not in classes]
+    except (ImportError, AttributeError):
+        pass
+    return classes
+
+
+def _patch_httpx_client(cls, cassette):
+    module = sys.modules[cls.__module__.split('.')[0]]
+    original = cls.send
+
+    def send(self, request, **kwargs):
+        body = request.read()
+        key, summary = normalize_request(request.method, str(request.url), body,
+                                         request.headers.get('content-type', ''))
+        if cassette.mode == 'replay':
+            entry = cassette.play(key, summary)
+            return module.Response(entry['status'], headers=entry['headers'],
+                                   content=base64.b64decode(entry['body']), request=request)
+        response = original(self, request, **kwargs)
+        content = response.read()
+        cassette.record(key, summary, response.status_code, dict(response.headers), content, response.encoding)
+        return response
+
+    cls.send = send
+    return lambda: setattr(cls, 'send', original)
+
+
+def enable(name, mode, directory=None):
+    """녹화/재생 시작 (녹화는 종료 시 저장)"""
+    global _active
+    cassette = Cassette(name, mode, directory)
+    undo = [_patch_requests(cassette)] + [_patch_httpx_client(c, cassette) for c in _httpx_client_classes()]
+    if mode == 'replay':
+        # 재생에는 실제 키가 필요 없다 (클라이언트 생성만 통과)
+        os.environ.setdefault('OPENAI_API_KEY', 'dry-run')
+        on_exit = cassette.report
+        print(f"🧪 dry-run: {cassette.path} 재생 (네트워크 사용 안 함)")
+    else:
+        on_exit = cassette.save
+        print(f"📼 녹화 모드: {cassette.path}")
+    atexit.register(on_exit)
+    _active = cassette
+
+    def disable():
+        """원래 전송 함수로 되돌리기 (녹화분은 저장)"""
+        global _active
+        for u in undo:
+            u()
+        atexit.unregister(on_exit)
+        on_exit()
+        _active = None
+    cassette.disable = disable
+    return cassette
+
+
+def enable_from_argv(name, argv=None):
+    """--record / --dry-run 인자 또는 CASSETTE_MODE 로 켜기"""
+    argv = sys.argv if argv is None else argv
+    if '--dry-run' in argv:
+        mode = 'replay'
+    elif '--record' in argv:
+        mode = 'record'
+    else:
+        mode = os.getenv('CASSETTE_MODE')
+    if mode in (None, '', 'off'):
+        return None
+    return enable(name, mode)
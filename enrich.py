@@ -0,0 +1,131 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics import incr
+
+# ──────────────────────────────
+# 컬럼 단위 데이터 보강 (가수명 / 해시태그 / 오픈시간 표시)
+# ──────────────────────────────
+# - 오픈시간은 한 번에 datetime 으로 변환한 뒤 "7월 21일 오전 9시" 형식으로 만든다.
+# - 캐시 조회는 고유 제목 기준 map(조인)으로 처리하고, 캐시에 없는 제목만 LLM 으로 보낸다.
+
+
+def format_open_time(values, default='미정'):
+    """오픈시간 컬럼 → '10월 1일 오후 12시 30분' 형식 (0 을 지우지 않고 숫자로 변환)"""
+    dt = pd.to_datetime(pd.Series(values), errors='coerce')
+    hour12 = (dt.dt.hour % 12).replace(0, 12)
+    minute = dt.dt.minute
+    text = (dt.dt.month.astype('Int64').astype(str) + '월 '
+            + dt.dt.day.astype('Int64').astype(str) + '일 '
+            + pd.Series(np.where(dt.dt.hour < 12, '오전', '오후'), index=dt.index) + ' '
+            + hour12.astype('Int64').astype(str) + '시'
+            + pd.Series(np.where(minute > 0, ' ' + minute.astype('Int64').astype(str) + '분', ''), index=dt.index))
+    return text.where(dt.notna(), default)
+
+
+def resolve_cached(keys, cache, compute, label=''):
+    """keys 를 캐시에 조인하고, 없는 고유 key 만 compute(key) 로 채워서 Series 반환
+
+    캐시 저장은 compute 쪽 책임 (실패 시 기본값을 캐시에 남기지 않기 위함)
+    """
+    keys = pd.Series(keys)
+    unique = pd.unique(keys)
+    misses = [k for k in unique if k not in cache]
+    computed = {}
+    incr('cache_hits', len(unique) - len(misses), cache=label)
+    incr('cache_misses', len(misses), cache=label)
+    if misses:
+        print(f"🤖 {label} 캐시 미스 {len(misses)}건 / 고유 {len(unique)}건")
+        for k in misses:
+            computed[k] = compute(k)
+    else:
+        print(f"⚡ {label} 전부 캐시 적중 ({len(unique)}건)")
+    return keys.map({**cache, **computed})
+
+
+def enrich_frame(df, extract_artist, generate_hashtags, artist_cache, hashtag_cache):
+    """가수명/해시태그 컬럼 추가 (행 단위 루프 없음)"""
+    first = df.drop_duplicates('제목').set_index('제목')
+    df['가수명'] = resolve_cached(df['제목'], artist_cache, extract_artist, '가수명').values
+    artists = dict(zip(df['제목'], df['가수명']))
+    df['해시태그'] = resolve_cached(
+        df['제목'], hashtag_cache,
+        lambda title: generate_hashtags(title, artists[title], first.at[title, '장르']),
+        '해시태그'
+    ).values
+    return df
+
+
+def _legacy_enrich(df, extract_artist, generate_hashtags):
+    """기존 iterrows + strptime 방식 (벤치마크 비교용)"""
+    from datetime import datetime
+    artists, hashtags, times = [], [], []
+    for _, row in df.iterrows():
+        artist = extract_artist(row['제목'])
+        hashtags.append(generate_hashtags(row['제목'], artist, row['장르']))
+        artists.append(artist)
+        try:
+            dt = datetime.strptime(row['오픈시간'], '%Y-%m-%d %H:%M:%S')
+            times.append(dt.strftime('%m월 %d일 %p %I시').replace('AM', '오전').replace('PM', '오후').replace('0', ''))
+        except Exception:
+            times.append('')
+    df['가수명'], df['해시태그'], df['오픈시간표시'] = artists, hashtags, times
+    return df
+
+
+def synthetic_notices(n=10000, unique_titles=2000, seed=0):
+    """벤치마크용 가짜 핫 공지 DataFrame"""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp('2025-07-21 09:00:00')
+    titles = np.array([f"2025 아티스트{i} 콘서트" for i in range(unique_titles)])
+    opens = base + pd.to_timedelta(rng.integers(0, 90 * 24, size=n), unit='h')
+    return pd.DataFrame({
+        '오픈시간': opens.strftime('%Y-%m-%d %H:%M:%S'),
+        '조회수': rng.integers(0, 20000, size=n),
+        '제목': titles[rng.integers(0, unique_titles, size=n)],
+        '장르': rng.choice(['콘서트', '뮤지컬', '연극', '클래식/오페라'], size=n),
+    })
+
+
+def benchmark(n=10000, hit_ratio=0.8):
+    """합성 데이터로 기존 방식과 컬럼 방식 비교 (LLM 은 캐시 맵으로 대체)"""
+    df = synthetic_notices(n)
+    titles = pd.unique(df['제목'])
+    warm = set(titles[:int(len(titles) * hit_ratio)])
+    calls = {'llm': 0}
+
+    def fake_llm(value):
+        calls['llm'] += 1
+        return f"{value}"[:15]
+
+    def legacy_artist(title, cache={}):
+        if title not in cache:
+            cache[title] = fake_llm(title) if title not in warm else title[:15]
+        return cache[title]
+
+    def legacy_hashtags(title, artist, genre, cache={}):
+        if title not in cache:
+            cache[title] = fake_llm(f"#{artist}") if title not in warm else f"#{artist}"
+        return cache[title]
+
+    start = time.perf_counter()
+    _legacy_enrich(df.copy(), legacy_artist, legacy_hashtags)
+    legacy = time.perf_counter() - start
+    legacy_calls, calls['llm'] = calls['llm'], 0
+
+    artist_cache = {t: t[:15] for t in warm}
+    hashtag_cache = {t: f"#{t[:15]}" for t in warm}
+    start = time.perf_counter()
+    out = enrich_frame(df.copy(), fake_llm, lambda t, a, g: fake_llm(f"#{a}"), artist_cache, hashtag_cache)
+    out['오픈시간표시'] = format_open_time(out['오픈시간']).values
+    columnar = time.perf_counter() - start
+
+    print(f"\n📊 {n}건 (고유 제목 {len(titles)}, 캐시 적중률 {hit_ratio:.0%})")
+    print(f"   기존 iterrows : {legacy:.3f}s (LLM {legacy_calls}회)")
+    print(f"   컬럼 방식     : {columnar:.3f}s (LLM {calls['llm']}회) → {legacy / columnar:.1f}배")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,315 @@
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from metrics import span, incr
+
+# ──────────────────────────────
+# 티켓베이 매물 적정가 추정
+# ──────────────────────────────
+# 매물마다 비교 기준이 list_price(정가) 하나뿐이라, 쌓인 스냅샷 이력으로 공연(depth3_id)별
+# 모델을 만들고 "이 좌석이면 보통 얼마에 올라오는지"를 추정한다.
+#   log(1매 가격) ~ 등급 + 층 + 열 + 수량 + 연석 여부 + 공연까지 남은 일수  (ridge 최소제곱)
+#   + 구역(area)별 잔차 평균 (건수가 적을수록 0 쪽으로 줄임)
+# 이력이 MIN_ROWS 건 미만인 공연은 등급별 중앙값(분위 구간)으로 대신한다.
+#
+# 학습용 이력은 fair_price_history.csv.gz 에 (매물 ID, 가격) 중복 없이 쌓고,
+# 모델은 fair_price_models.json 에 공연별 계수 + 데이터 지문으로 저장한다.
+# 새 스냅샷이 들어오면 지문이 바뀐 공연만 다시 학습하고, 채점은 계수를 조회 테이블로 펼쳐
+# 스냅샷 전체를 한 번에 계산한다.
+# 지문에는 관측 시각이 없어서, 같은 매물을 나중에 다시 보면 남은 일수만 줄어든다.
+# 그래서 이력의 남은 일수 범위가 학습 범위(bounds)와 DAYS_DRIFT 일 넘게 어긋난 공연도 다시 학습하고,
+# 채점할 때는 수치 컬럼을 학습 범위로 잘라 선형항이 범위 밖으로 뻗어 나가지 않게 한다.
+#
+# 추가 컬럼: fair_price(추정 1매 가격), price_deviation(가격/추정 - 1), price_z(로그 잔차 / 척도)
+
+LOG_DIR = Path('ticketbay_log')
+MODEL_PATH = Path(os.getenv('FAIR_PRICE_MODELS', 'fair_price_models.json'))
+HISTORY_PATH = Path(os.getenv('FAIR_PRICE_HISTORY', 'fair_price_history.csv.gz'))
+
+MIN_ROWS = 30            # 이보다 적으면 분위 구간(등급별 중앙값) 모델
+RIDGE = 1.0              # 절편 외 계수에 거는 L2 벌점
+AREA_SHRINK = 5          # 구역 잔차 평균을 (건수 + AREA_SHRINK) 로 나눠 0 쪽으로
+MIN_SCALE = 0.05         # 로그 잔차 척도 하한 (가격이 거의 같은 공연에서 z 폭주 방지)
+MAX_LOG_GAP = np.log(20) # 공연 중앙값의 1/20 ~ 20배 밖 가격은 학습에서 제외
+MAX_ROW = 100
+Z_THRESHOLD = 2.5
+DAYS_DRIFT = 3           # 이력의 남은 일수 범위가 학습 범위와 이만큼 어긋나면 재학습
+
+NUMERIC = ['row', 'quantity', 'together', 'days']
+HISTORY_COLUMNS = ['id', 'depth3_id', 'grade', 'floor', 'area', 'row', 'quantity', 'together', 'days', 'price']
+SNAPSHOT_NAME = re.compile(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.csv$')
+
+
+def _level(series):
+    return series.fillna('').astype(str).str.strip()
+
+
+def snapshot_time(path):
+    """ticketbay_log 파일명(…_2025-07-25_20-07-39.csv)의 수집 시각, 없으면 수정 시각"""
+    m = SNAPSHOT_NAME.search(Path(path).name)
+    if m:
+        return pd.Timestamp(datetime.strptime(m.group(1), '%Y-%m-%d_%H-%M-%S'))
+    return pd.Timestamp(datetime.fromtimestamp(Path(path).stat().st_mtime))
+
+
+def build_features(df, observed_at=None):
+    """스냅샷 → 학습/채점용 컬럼 (행 루프 없이 컬럼 단위로 계산)"""
+    if 'collected_datetime' in df.columns:
+        observed = pd.to_datetime(df['collected_datetime'], errors='coerce')
+    else:
+        observed = pd.Series(pd.Timestamp(observed_at or datetime.now()), index=df.index)
+    perform = pd.to_datetime(df['perform_date'], errors='coerce')
+    if 'start_perform_date' in df.columns:
+        perform = perform.fillna(pd.to_datetime(df['start_perform_date'], errors='coerce'))
+
+    row = pd.to_numeric(df['seat_number'].astype(str).str.extract(r'(\d+)')[0], errors='coerce')
+    return pd.DataFrame({
+        'id': df['id'].to_numpy(),
+        'depth3_id': df['depth3_id'].astype(str).to_numpy(),
+        'grade': _level(df['grade']).to_numpy(),
+        'floor': _level(df['floor']).to_numpy(),
+        'area': _level(df['area']).to_numpy(),
+        'row': row.where(row <= MAX_ROW).to_numpy(),
+        'quantity': pd.to_numeric(df['sale_quantity'], errors='coerce').to_numpy(),
+        'together': (df['is_together'] == 'YES').astype(float).to_numpy(),
+        'days': ((perform - observed).dt.total_seconds() / 86400).clip(lower=0).to_numpy(),
+        'price': pd.to_numeric(df['price'], errors='coerce').to_numpy(),
+    })
+
+
+def fingerprint(history):
+    """공연별 학습 데이터 지문 (매물 ID + 가격 집합)"""
+    keyed = history[['depth3_id', 'id', 'price']].sort_values(['depth3_id', 'id', 'price'])
+    hashed = pd.util.hash_pandas_object(keyed[['id', 'price']].astype(str), index=False)
+    return {event: hashlib.sha1(h.to_numpy().tobytes()).hexdigest()[:16]
+            for event, h in hashed.groupby(keyed['depth3_id'].to_numpy())}
+
+
+def _baseline(levels):
+    """기준 범주 = 가장 흔한 값 (나머지는 더미 컬럼)"""
+    counts = pd.Series(levels).value_counts()
+    return counts.index[0], [v for v in counts.index[1:]]
+
+
+def fit_bins(rows):
+    """분위 구간 모델: 공연 중앙값 + 등급별 중앙값 차이"""
+    y = np.log(rows['price'].to_numpy())
+    intercept = float(np.median(y))
+    grade = (pd.Series(y, index=rows['grade'].to_numpy()).groupby(level=0).median() - intercept).to_dict()
+    resid = y - intercept - rows['grade'].map(grade).to_numpy()
+    return {
+        'kind': 'bins', 'n': len(rows), 'intercept': intercept,
+        'grade': grade, 'floor': {}, 'area': {},
+        'coef': {k: 0.0 for k in NUMERIC}, 'center': {k: 0.0 for k in NUMERIC}, 'bounds': {},
+        'scale': max(float(1.4826 * np.median(np.abs(resid - np.median(resid)))), MIN_SCALE),
+    }
+
+
+def fit_event(rows):
+    """공연 1개 ridge 최소제곱 (등급/층 더미 + 수치 4개) + 구역 잔차 보정"""
+    if len(rows) < MIN_ROWS:
+        return fit_bins(rows)
+    y = np.log(rows['price'].to_numpy())
+
+    center = {k: float(np.nanmean(rows[k])) if rows[k].notna().any() else 0.0 for k in NUMERIC}
+    bounds = {k: [float(np.nanmin(rows[k])), float(np.nanmax(rows[k]))] for k in NUMERIC if rows[k].notna().any()}
+    numeric = np.column_stack([np.nan_to_num(rows[k].to_numpy(dtype=float) - center[k]) for k in NUMERIC])
+
+    dummies, names = [], []
+    for col in ('grade', 'floor'):
+        _, others = _baseline(rows[col])
+        values = rows[col].to_numpy()
+        for level in others:
+            dummies.append((values == level).astype(float))
+            names.append((col, level))
+    X = np.column_stack([np.ones(len(rows)), numeric] + dummies)
+
+    # ridge: [X; sqrt(λ)·I] β = [y; 0]  (절편은 벌점 없음)
+    penalty = np.sqrt(RIDGE) * np.eye(X.shape[1])[1:]
+    beta, *_ = np.linalg.lstsq(np.vstack([X, penalty]), np.concatenate([y, np.zeros(len(penalty))]), rcond=None)
+
+    resid = y - X @ beta
+    areas = pd.Series(resid, index=rows['area'].to_numpy()).groupby(level=0).agg(['sum', 'count'])
+    area = (areas['sum'] / (areas['count'] + AREA_SHRINK)).to_dict()
+    resid = resid - rows['area'].map(area).to_numpy()
+
+    model = {
+        'kind': 'lstsq', 'n': len(rows), 'intercept': float(beta[0]),
+        'grade': {}, 'floor': {}, 'area': area,
+        'coef': dict(zip(NUMERIC, map(float, beta[1:1 + len(NUMERIC)]))), 'center': center, 'bounds': bounds,
+        'scale': max(float(1.4826 * np.median(np.abs(resid - np.median(resid)))), MIN_SCALE),
+    }
+    for (col, level), b in zip(names, beta[1 + len(NUMERIC):]):
+        model[col][level] = float(b)
+    return model
+
+
+def _training_rows(history):
+    """가격이 없거나 공연 중앙값에서 터무니없이 먼 매물 제외"""
+    rows = history[history['price'] > 0]
+    log_price = np.log(rows['price'])
+    gap = (log_price - log_price.groupby(rows['depth3_id']).transform('median')).abs()
+    return rows[gap <= MAX_LOG_GAP]
+
+
+class FairPriceModel:
+    """공연별 적정가 모델 묶음 + 학습 이력"""
+
+    def __init__(self, model_path=None, history_path=None):
+        self.model_path = Path(model_path or MODEL_PATH)
+        self.history_path = Path(history_path or HISTORY_PATH)
+        self.models, self.fingerprints, self.files = {}, {}, []
+        if self.model_path.exists():
+            try:
+                data = json.loads(self.model_path.read_text(encoding='utf-8'))
+                self.models = data.get('models', {})
+                self.fingerprints = data.get('fingerprints', {})
+                self.files = data.get('files', [])
+            except ValueError:
+                pass
+        self.history = pd.DataFrame(columns=HISTORY_COLUMNS)
+        if self.history_path.exists():
+            self.history = pd.read_csv(self.history_path, dtype={'depth3_id': str, 'grade': str, 'floor': str, 'area': str},
+                                       keep_default_na=False, na_values={k: [''] for k in NUMERIC + ['price']})
+
+    def ingest(self, df, observed_at=None):
+        """스냅샷을 이력에 추가 (같은 매물·같은 가격은 최신 관측 1건만 유지)"""
+        features = build_features(df, observed_at)
+        before = len(self.history)
+        merged = pd.concat([self.history, features], ignore_index=True) if before else features
+        self.history = merged.drop_duplicates(['id', 'price'], keep='last').reset_index(drop=True)
+        return len(self.history) - before
+
+    def sync_logs(self, log_dir=LOG_DIR):
+        """ticketbay_log 에서 아직 반영하지 않은 스냅샷 파일만 읽어 이력에 추가"""
+        seen = set(self.files)
+        added = 0
+        for path in sorted(Path(log_dir).glob('*.csv')):
+            # _dups.csv / _fair.csv 같은 파생 파일은 스냅샷이 아님
+            if path.name in seen or not SNAPSHOT_NAME.search(path.name):
+                continue
+            try:
+                added += self.ingest(pd.read_csv(path, low_memory=False), snapshot_time(path))
+            except Exception as e:
+                print(f"⚠️ 스냅샷 읽기 실패: {path.name} - {e}")
+                continue
+            self.files.append(path.name)
+        return added
+
+    def refit(self):
+        """데이터 지문이 바뀐 공연만 다시 학습 → 학습한 공연 수"""
+        rows = _training_rows(self.history)
+        prints = fingerprint(rows)
+        days = rows.groupby('depth3_id')['days'].agg(['min', 'max'])
+
+        def drifted(event):
+            # 분위 구간 모델이나 일수가 없던 공연은 일수 항이 없으므로 지문(새 매물)으로만 판단
+            if 'days' not in self.models[event]['bounds']:
+                return False
+            lo, hi = self.models[event]['bounds']['days']
+            return abs(days.at[event, 'min'] - lo) > DAYS_DRIFT or abs(days.at[event, 'max'] - hi) > DAYS_DRIFT
+
+        # bounds 가 없는 예전 형식 모델도 다시 학습
+        stale = [event for event, digest in prints.items()
+                 if self.fingerprints.get(event) != digest or 'bounds' not in self.models.get(event, {})
+                 or drifted(event)]
+        with span('fair_price_fit'):
+            for event, group in rows[rows['depth3_id'].isin(stale)].groupby('depth3_id'):
+                self.models[event] = fit_event(group)
+                self.fingerprints[event] = prints[event]
+        incr('fair_price_models', len(stale), kind='refit')
+        incr('fair_price_models', len(prints) - len(stale), kind='reused')
+        return len(stale)
+
+    def predict(self, features):
+        """로그 추정가, 척도 (모든 공연을 조회 테이블 lookup 으로 한 번에)"""
+        event = features['depth3_id']
+        table = pd.DataFrame.from_dict(
+            {e: {'intercept': m['intercept'], 'scale': m['scale'],
+                 **{f"coef_{k}": m['coef'][k] for k in NUMERIC},
+                 **{f"center_{k}": m['center'][k] for k in NUMERIC},
+                 **{f"{side}_{k}": m.get('bounds', {}).get(k, (-np.inf, np.inf))[i]
+                    for k in NUMERIC for i, side in enumerate(('lo', 'hi'))}}
+             for e, m in self.models.items()}, orient='index')
+        if table.empty:
+            nan = np.full(len(features), np.nan)
+            return nan, nan
+        per_row = table.reindex(event.to_numpy())
+
+        log_price = per_row['intercept'].to_numpy()
+        for k in NUMERIC:
+            x = np.clip(features[k].to_numpy(dtype=float), per_row[f"lo_{k}"].to_numpy(), per_row[f"hi_{k}"].to_numpy())
+            x = x - per_row[f"center_{k}"].to_numpy()
+            log_price = log_price + per_row[f"coef_{k}"].to_numpy() * np.nan_to_num(x)
+        for col in ('grade', 'floor', 'area'):
+            effects = {(e, level): b for e, m in self.models.items() for level, b in m[col].items()}
+            if effects:
+                keys = pd.MultiIndex.from_arrays([event.to_numpy(), features[col].to_numpy()])
+                log_price = log_price + pd.Series(effects).reindex(keys).fillna(0.0).to_numpy()
+        return log_price, per_row['scale'].to_numpy()
+
+    def score(self, df, observed_at=None):
+        """스냅샷에 fair_price / price_deviation / price_z 컬럼 추가"""
+        features = build_features(df, observed_at)
+        log_fair, scale = self.predict(features)
+        price = features['price'].to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (np.log(price) - log_fair) / scale
+        fair = np.exp(log_fair)
+        df['fair_price'] = np.round(fair, -2)
+        df['price_deviation'] = np.round(price / fair - 1, 4)
+        df['price_z'] = np.round(np.where(price > 0, z, np.nan), 2)
+        return df
+
+    def save(self):
+        self.history.to_csv(self.history_path, index=False, compression='gzip')
+        tmp = self.model_path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps({
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'files': self.files, 'fingerprints': self.fingerprints, 'models': self.models,
+        }, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.model_path)
+
+
+def outliers(df, threshold=Z_THRESHOLD):
+    """적정가에서 크게 벗어난 매물 (싼 순 → 비싼 순)"""
+    flagged = df[df['price_z'].abs() >= threshold]
+    return flagged.sort_values('price_z')
+
+
+def score_snapshot(df, log_dir=LOG_DIR, observed_at=None, save=True):
+    """이력 동기화 → 바뀐 공연만 재학습 → 스냅샷 일괄 채점"""
+    model = FairPriceModel()
+    with span('fair_price'):
+        synced = model.sync_logs(log_dir)
+        added = model.ingest(df, observed_at)
+        refit = model.refit()
+        model.score(df, observed_at)
+    if save:
+        model.save()
+    flagged = outliers(df)
+    print(f"📐 적정가: 이력 +{synced + added}건, 재학습 {refit}/{len(model.models)}개 공연, "
+          f"이탈 매물 {len(flagged)}건 (|z| ≥ {Z_THRESHOLD})")
+    incr('fair_price_outliers', len(flagged))
+    return df
+
+
+if __name__ == "__main__":
+    import sys
+    from price_alert import latest_snapshot
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else latest_snapshot()
+    if path is None:
+        print("❌ 티켓베이 스냅샷이 없습니다.")
+    else:
+        df = score_snapshot(pd.read_csv(path, low_memory=False), observed_at=snapshot_time(path))
+        out = path.with_name(f"{path.stem}_fair.csv")
+        outliers(df)[['id', 'depth3_name', 'grade', 'floor', 'name', 'sale_quantity', 'price', 'fair_price',
+                      'price_deviation', 'price_z']].to_csv(out, index=False, encoding='utf-8-sig')
+        print(f"💾 이탈 매물 저장: {out}")
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from metrics import span, incr, record_http
+from cassette import is_replaying
+from sharded_fetch import Throttle
+
+# ──────────────────────────────
+# 핫 공지 상세 정보 (공연장 / 공연 기간 / 좌석 등급별 가격)
+# ──────────────────────────────
+# 공지 목록에는 제목/오픈시간/조회수/goodsCode 뿐이라, filter_hot 으로 추린 공지만
+# goodsCode 로 상품 상세를 조회한다. 동시 요청 수와 요청 간격을 제한하고,
+# 결과는 goods_detail_cache.json 에 TTL 동안 보관해 다음 실행에서는 다시 묻지 않는다.
+
+SUMMARY_URL = "https://api-ticketfront.interpark.com/v1/goods/{code}/summary"
+PRICE_URL = "https://api-ticketfront.interpark.com/v1/goods/{code}/prices/group"
+HEADERS = {"user-agent": "Mozilla/5.0", "referer": "https://tickets.interpark.com/"}
+
+CACHE_PATH = Path(os.getenv('GOODS_DETAIL_CACHE', 'goods_detail_cache.json'))
+TTL_SECONDS = 12 * 3600
+MAX_WORKERS = 4
+MIN_INTERVAL = 0.2
+TIMEOUT = 10
+
+COLUMNS = ['공연장', '공연기간', '가격']
+
+
+def _date(value):
+    """'20250801' → '2025.08.01'"""
+    value = str(value or '')
+    return f"{value[:4]}.{value[4:6]}.{value[6:8]}" if len(value) >= 8 and value[:8].isdigit() else value
+
+
+def parse_summary(payload):
+    data = (payload or {}).get('data') or {}
+    start, end = _date(data.get('playStartDate')), _date(data.get('playEndDate'))
+    return {
+        'venue': data.get('placeName') or '',
+        'period': start if not end or start == end else f"{start} ~ {end}",
+    }
+
+
+def parse_prices(payload):
+    """등급별 최고가 목록 [(등급, 가격)] (가격 높은 순)"""
+    grades = {}
+    for group in ((payload or {}).get('data') or {}).values():
+        if not isinstance(group, dict):
+            continue
+        for grade, options in group.items():
+            for option in options or []:
+                price = option.get('salesPrice') or option.get('price')
+                if price:
+                    grades[grade] = max(grades.get(grade, 0), int(price))
+    return sorted(grades.items(), key=lambda kv: -kv[1])
+
+
+def format_prices(prices):
+    return ' / '.join(f"{grade} {price:,}원" for grade, price in prices)
+
+
+def fetch_detail(code, session=requests, throttle=None):
+    """goodsCode 1개 상세 조회 → {'venue', 'period', 'prices'}"""
+    result = {}
+    for url, parse in ((SUMMARY_URL, parse_summary), (PRICE_URL, parse_prices)):
+        if throttle:
+            throttle.wait()
+        r = session.get(url.format(code=code), headers=HEADERS, timeout=TIMEOUT)
+        record_http('interpark', r)
+        r.raise_for_status()
+        parsed = parse(r.json())
+        result.update(parsed if isinstance(parsed, dict) else {'prices': parsed})
+    return result
+
+
+class DetailCache:
+    def __init__(self, path=None, ttl=TTL_SECONDS):
+        self.path = Path(path or CACHE_PATH)
+        self.ttl = ttl
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+
+    def get(self, code):
+        entry = self.entries.get(code)
+        if entry and time.time() - entry.get('fetched_at', 0) < self.ttl:
+            return entry
+        return None
+
+    def put(self, code, detail):
+        self.entries[code] = {**detail, 'fetched_at': time.time()}
+
+    def save(self):
+        # 오래된 항목은 TTL 의 몇 배가 지나면 정리
+        now = time.time()
+        self.entries = {k: v for k, v in self.entries.items() if now - v.get('fetched_at', 0) < self.ttl * 4}
+        tmp = self.path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+def add_detail_columns(df, cache=None, max_workers=MAX_WORKERS, min_interval=MIN_INTERVAL):
+    """핫 공지 DataFrame 에 공연장/공연기간/가격 컬럼 추가 (캐시에 없는 goodsCode 만 조회)"""
+    from pipeline import Degraded
+    cache = cache or DetailCache()
+    # 예매코드가 없는 공지(None/NaN/'')는 조회하지 않는다 (astype(str) 하면 'None' 으로 매번 요청됨)
+    codes = list(dict.fromkeys(df['예매코드'].dropna().astype(str).str.strip()))
+    codes = [c for c in codes if c]
+    missing = [c for c in codes if cache.get(c) is None]
+    incr('goods_detail', len(codes) - len(missing), kind='cache_hit')
+
+    if missing:
+        throttle = Throttle(min_interval)
+
+        def load(code):
+            try:
+                return code, fetch_detail(code, throttle=throttle)
+            except Exception as e:
+                print(f"⚠️ 상세 조회 실패: {code} - {e}")
+                return code, None
+
+        with span('goods_detail'), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(load, missing))
+        fetched = 0
+        for code, detail in results:
+            if detail is not None:
+                cache.put(code, detail)
+                fetched += 1
+        incr('goods_detail', fetched, kind='fetched')
+        incr('goods_detail', len(missing) - fetched, kind='failed')
+        # dry-run 은 재생한 응답이므로 캐시 파일에 남기지 않는다
+        if not is_replaying():
+            cache.save()
+        print(f"🏟️ 상세 정보: 캐시 {len(codes) - len(missing)}건, 조회 {fetched}/{len(missing)}건")
+    else:
+        print(f"⚡ 상세 정보 전부 캐시 적중 ({len(codes)}건)")
+
+    details = {c: cache.get(c) or {} for c in codes}
+    keys = df['예매코드'].where(df['예매코드'].notna(), '').astype(str).str.strip()
+    df['공연장'] = keys.map(lambda c: details.get(c, {}).get('venue', '')).values
+    df['공연기간'] = keys.map(lambda c: details.get(c, {}).get('period', '')).values
+    df['가격'] = keys.map(lambda c: format_prices(details.get(c, {}).get('prices', []))).values
+    # 일부 조회가 실패했으면 빈 칸이 메모되지 않도록 (다음 실행에서 다시 조회)
+    failed = [c for c in codes if not details[c]]
+    if failed:
+        raise Degraded(df, f"상세 조회 실패 {len(failed)}건")
+    return df
@@ -0,0 +1,130 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ──────────────────────────────
+# 조회수 증가 속도 기반 핫 점수
+# ──────────────────────────────
+# 매 조회 때마다 공지별 viewCount 를 view_history.npz 에 쌓아두고,
+# 최근 LOOKBACK_HOURS 동안의 시간당 증가량과 현재 조회수를
+# 장르 안에서 백분위로 환산해 가중합한 값을 핫 점수로 사용한다.
+# 누적 조회수가 아직 낮아도 증가 속도가 장르 상위 RATE_CUTOFF 이상이면 핫으로 본다
+# (가중합만 쓰면 조회수 백분위가 낮은 급상승 공지는 점수가 컷을 넘을 수 없다).
+#
+# 백분위는 상대값이라 그대로 쓰면 장르마다 상위 10~15% 가 늘 핫이 되고, 공지가 많을수록
+# 핫 목록(= LLM 호출 + 번장 게시)이 같이 늘어난다. 그래서
+#   - 조회수 MIN_VIEWS, 급상승은 시간당 MIN_RATE 이상이어야 하고
+#   - 공지가 MIN_GENRE_SIZE 개 미만인 장르는 백분위 대신 기존 고정 임계값을 쓰며
+#   - 점수 순으로 장르당 MAX_HOT_PER_GENRE 개, 전체 MAX_HOT 개까지만 남긴다.
+
+HISTORY_PATH = Path('view_history.npz')
+
+LOOKBACK_HOURS = 24
+RETENTION_DAYS = 14
+RATE_WEIGHT = 0.6        # 증가 속도 백분위 가중치 (나머지는 누적 조회수 백분위)
+SCORE_CUTOFF = 0.85
+RATE_CUTOFF = 0.9        # 증가 속도 백분위만으로 핫 판정
+MIN_VIEWS = 300          # 핫 판정 최소 누적 조회수
+MIN_RATE = 100           # 급상승 판정 최소 시간당 증가량
+MIN_GENRE_SIZE = 5       # 이보다 공지가 적은 장르는 고정 임계값
+MAX_HOT_PER_GENRE = 10
+MAX_HOT = 40
+
+# 기존 고정 임계값 (fallback 모드)
+THRESHOLDS = {'콘서트': 600, '뮤지컬': 500, '연극': 500, '클래식/오페라': 400}
+DEFAULT_THRESHOLD = 10000
+
+
+def notice_key(d):
+    """공지 식별자 (예매코드가 없는 공지는 제목 사용)"""
+    return d.get('goodsCode') or d.get('title', '')
+
+
+class ViewHistory:
+    """공지별 조회수 시계열 (key, 수집시각, 조회수) 저장소"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = Path(path)
+        self.keys = np.empty(0, dtype=str)
+        self.ts = np.empty(0, dtype=np.int64)
+        self.views = np.empty(0, dtype=np.int64)
+        if self.path.exists():
+            try:
+                data = np.load(self.path)
+                self.keys, self.ts, self.views = data['keys'], data['ts'], data['views']
+            except Exception as e:
+                print(f"⚠️ 조회수 기록 로드 실패, 새로 시작합니다: {e}")
+
+    def append(self, keys, views, ts=None):
+        ts = int(ts if ts is not None else time.time())
+        self.keys = np.concatenate([self.keys, np.asarray(keys, dtype=str)])
+        self.ts = np.concatenate([self.ts, np.full(len(keys), ts, dtype=np.int64)])
+        self.views = np.concatenate([self.views, np.asarray(views, dtype=np.int64)])
+
+    def prune(self, now=None):
+        now = now if now is not None else time.time()
+        keep = self.ts >= now - RETENTION_DAYS * 86400
+        self.keys, self.ts, self.views = self.keys[keep], self.ts[keep], self.views[keep]
+
+    def save(self):
+        self.prune()
+        np.savez_compressed(self.path, keys=self.keys, ts=self.ts, views=self.views)
+
+    def frame(self):
+        return pd.DataFrame({'key': self.keys, 'ts': self.ts, 'views': self.views})
+
+
+def growth_rates(history, now):
+    """공지별 최근 LOOKBACK_HOURS 동안의 시간당 조회수 증가량 (기록이 1개뿐이면 NaN)"""
+    df = history.frame()
+    df = df[df['ts'] >= now - LOOKBACK_HOURS * 3600]
+    if df.empty:
+        return pd.Series(dtype=float)
+    g = df.sort_values('ts').groupby('key')
+    first, last = g.first(), g.last()
+    hours = (last['ts'] - first['ts']) / 3600
+    return ((last['views'] - first['views']) / hours.where(hours > 0)).rename('rate')
+
+
+def score_notices(data, history=None, now=None):
+    """공지 목록 → key, 장르, 조회수, 증가속도, 핫점수 DataFrame"""
+    now = int(now if now is not None else time.time())
+    history = history if history is not None else ViewHistory()
+    df = pd.DataFrame({
+        'key': [notice_key(d) for d in data],
+        'genre': [d.get('goodsGenreStr', '') for d in data],
+        'views': [d.get('viewCount', 0) for d in data],
+    })
+    history.append(df['key'], df['views'], now)
+
+    df['rate'] = df['key'].map(growth_rates(history, now))
+    by_genre = df.groupby('genre')
+    level_pct = by_genre['views'].rank(pct=True)
+    rate_pct = by_genre['rate'].rank(pct=True)
+    df['rate_pct'] = rate_pct
+    # 증가 속도를 아직 모르는 공지(첫 수집)는 누적 조회수 백분위만 사용
+    df['score'] = np.where(rate_pct.notna(), RATE_WEIGHT * rate_pct + (1 - RATE_WEIGHT) * level_pct, level_pct)
+    return df
+
+
+def hot_mask_by_score(data, history=None, now=None):
+    """핫 점수 기준 (mask, score) 반환"""
+    scored = score_notices(data, history, now)
+    rising = (scored['rate_pct'] >= RATE_CUTOFF) & (scored['rate'] >= MIN_RATE)
+    ranked = (scored['score'] >= SCORE_CUTOFF) | rising
+    # 공지가 몇 개 없는 장르는 백분위가 의미 없으므로 (1개면 늘 100%) 기존 고정 임계값
+    small = scored.groupby('genre')['key'].transform('size') < MIN_GENRE_SIZE
+    fixed = scored['views'] > scored['genre'].map(THRESHOLDS).fillna(DEFAULT_THRESHOLD)
+    mask = ranked.where(~small, fixed) & (scored['views'] >= MIN_VIEWS)
+    # 점수 순으로 장르당 / 전체 상한
+    top = scored[mask].sort_values('score', ascending=False, kind='stable')
+    top = top.groupby('genre', sort=False).head(MAX_HOT_PER_GENRE).head(MAX_HOT)
+    return scored.index.isin(top.index), scored['score'].round(3).to_numpy()
+
+
+def hot_mask_by_threshold(data, default=DEFAULT_THRESHOLD):
+    """기존 장르별 고정 조회수 임계값 기준 (default=None 이면 THRESHOLDS 에 없는 장르는 모두 통과)"""
+    limits = [THRESHOLDS.get(d.get('goodsGenreStr', ''), default) for d in data]
+    return np.array([limit is None or d.get('viewCount', 0) > limit for d, limit in zip(data, limits)], dtype=bool)
@@ -0,0 +1,197 @@
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ──────────────────────────────
+# 티켓베이 중복 매물 탐지 (MinHash + LSH)
+# ──────────────────────────────
+# 같은 좌석을 문구만 살짝 바꿔 여러 번 올린 매물을 묶어서 클러스터 ID를 붙인다.
+# 공연/등급/구역/열이 같은 매물끼리만 LSH 버킷을 공유하고(blocking),
+# 버킷 안에서는 설명 문구 유사도와 가격 차이로 최종 판정한다.
+# 서명(signature)은 ticketbay_minhash.npz 에 저장되고, 다음 스냅샷에서는
+# 새로 올라왔거나 내용이 바뀐 매물만 다시 계산한다.
+
+INDEX_PATH = Path('ticketbay_minhash.npz')
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.6          # 서명 일치율이 이 이상이면 중복으로 판정
+PRICE_TOLERANCE = 0.2    # 1매 가격 차이 허용 비율
+SHINGLE_SIZE = 3
+MERSENNE = np.uint64((1 << 31) - 1)
+
+_rng = np.random.RandomState(20250725)
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+
+
+def normalize_text(text):
+    """설명 문구 정규화 (공백/기호 제거, 소문자)"""
+    if not isinstance(text, str):
+        return ''
+    return re.sub(r'[\W_]+', '', text.lower())
+
+
+def listing_features(row):
+    """매물 1건의 shingle 집합 (설명 3-gram + 좌석/가격 토큰)"""
+    text = normalize_text(row.get('name')) + normalize_text(row.get('description'))
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+    price = row.get('price')
+    shingles.update({
+        f"grade:{row.get('grade')}",
+        f"floor:{row.get('floor')}",
+        f"area:{row.get('area')}",
+        f"seat:{row.get('seat_number')}",
+        f"qty:{row.get('sale_quantity')}",
+        f"price:{int(round(price, -4)) if pd.notna(price) else ''}",
+    })
+    return shingles
+
+
+def minhash(shingles):
+    """shingle 집합 → 길이 NUM_PERM 서명"""
+    x = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64) % MERSENNE
+    hashed = (np.outer(_PERM_A, x) + _PERM_B[:, None]) % MERSENNE
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def block_keys(df):
+    """같은 좌석일 수 있는 매물끼리만 비교하기 위한 블록 키"""
+    cols = ['depth3_id', 'grade', 'area', 'seat_number']
+    block = df.reindex(columns=cols).astype(str).apply(lambda s: s.map(normalize_text))
+    return pd.util.hash_pandas_object(block, index=False).to_numpy(dtype=np.uint64)
+
+
+def feature_hash(df):
+    cols = [c for c in ['name', 'description', 'grade', 'floor', 'area', 'seat_number', 'sale_quantity', 'price'] if c in df.columns]
+    return pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy(dtype=np.uint64)
+
+
+class MinHashIndex:
+    """매물 ID별 MinHash 서명 저장소"""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.blocks = np.empty(0, dtype=np.uint64)
+        self.prices = np.empty(0, dtype=float)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.signatures = np.empty((0, NUM_PERM), dtype=np.uint32)
+        if self.path.exists():
+            try:
+                data = np.load(self.path)
+                self.ids, self.blocks = data['ids'], data['blocks']
+                self.prices, self.hashes = data['prices'], data['hashes']
+                self.signatures = data['signatures']
+            except Exception as e:
+                print(f"⚠️ MinHash 인덱스 로드 실패, 새로 생성합니다: {e}")
+
+    def save(self):
+        np.savez_compressed(self.path, ids=self.ids, blocks=self.blocks, prices=self.prices,
+                            hashes=self.hashes, signatures=self.signatures)
+
+    def update(self, df):
+        """스냅샷 기준으로 인덱스 갱신 (신규/변경 매물만 서명 재계산, 내려간 매물은 제거)"""
+        # 같은 매물 ID 가 여러 카테고리에서 중복 수집될 수 있으므로 마지막 것만 남긴다
+        df = df.drop_duplicates('id', keep='last')
+        ids = df['id'].to_numpy(dtype=np.int64)
+        blocks = block_keys(df)
+        prices = df['price'].to_numpy(dtype=float)
+        hashes = feature_hash(df)
+
+        # 이전 버전이 저장한 인덱스에 중복 ID 가 남아 있어도 reindex 가 실패하지 않도록
+        known = pd.Series(np.arange(len(self.ids)), index=self.ids)
+        known = known[~known.index.duplicated(keep='last')]
+        pos = known.reindex(ids).to_numpy()
+        reuse = ~np.isnan(pos)
+        reuse[reuse] = self.hashes[pos[reuse].astype(int)] == hashes[reuse]
+
+        signatures = np.empty((len(df), NUM_PERM), dtype=np.uint32)
+        if reuse.any():
+            signatures[reuse] = self.signatures[pos[reuse].astype(int)]
+        todo = np.flatnonzero(~reuse)
+        records = df.iloc[todo].to_dict('records')
+        for i, row in zip(todo, records):
+            signatures[i] = minhash(listing_features(row))
+
+        self.ids, self.blocks, self.prices = ids, blocks, prices
+        self.hashes, self.signatures = hashes, signatures
+        print(f"🧮 MinHash 서명: 재사용 {int(reuse.sum())}건 / 신규 계산 {len(todo)}건")
+        return len(todo)
+
+    def candidate_pairs(self):
+        """LSH 밴딩: 같은 블록 + 같은 밴드 해시를 가진 매물 쌍"""
+        pairs = set()
+        for b in range(BANDS):
+            band = self.signatures[:, b * ROWS:(b + 1) * ROWS]
+            keys = pd.util.hash_pandas_object(pd.DataFrame(band), index=False).to_numpy()
+            buckets = pd.DataFrame({'block': self.blocks, 'key': keys, 'idx': np.arange(len(keys))})
+            for _, members in buckets.groupby(['block', 'key'])['idx']:
+                members = members.to_numpy()
+                if len(members) < 2:
+                    continue
+                for i in range(len(members)):
+                    for j in range(i + 1, len(members)):
+                        pairs.add((members[i], members[j]))
+        return pairs
+
+    def clusters(self, threshold=THRESHOLD):
+        """후보 쌍을 서명 일치율/가격 차이로 검증한 뒤 union-find 로 클러스터링"""
+        parent = np.arange(len(self.ids))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        pairs = self.candidate_pairs()
+        if pairs:
+            left, right = np.array(sorted(pairs)).T
+            similarity = (self.signatures[left] == self.signatures[right]).mean(axis=1)
+            low = np.fmin(self.prices[left], self.prices[right])
+            gap = np.abs(self.prices[left] - self.prices[right]) / np.where(low > 0, low, np.nan)
+            keep = (similarity >= threshold) & (np.nan_to_num(gap, nan=0.0) <= PRICE_TOLERANCE)
+            for i, j in zip(left[keep], right[keep]):
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+        roots = np.array([find(i) for i in range(len(parent))], dtype=np.int64)
+        result = pd.DataFrame({'id': self.ids, 'dup_cluster': self.ids[roots] if len(roots) else roots})
+        result['dup_cluster_size'] = result.groupby('dup_cluster')['id'].transform('size')
+        return result
+
+
+def find_duplicates(df, index_path=INDEX_PATH, threshold=THRESHOLD):
+    """스냅샷에 dup_cluster / dup_cluster_size 컬럼을 붙여서 반환"""
+    index = MinHashIndex(index_path)
+    index.update(df)
+    index.save()
+    clusters = index.clusters(threshold)
+    dup_count = int((clusters['dup_cluster_size'] > 1).sum())
+    print(f"🧹 중복 의심 매물 {dup_count}건 / 클러스터 {clusters.loc[clusters['dup_cluster_size'] > 1, 'dup_cluster'].nunique()}개")
+    return df.merge(clusters, on='id', how='left')
+
+
+def drop_duplicates(df):
+    """클러스터별 최저가 매물 1건만 남김 (공급량 분석용)"""
+    return df.sort_values('price').drop_duplicates('dup_cluster').sort_index()
+
+
+if __name__ == "__main__":
+    import sys
+    from price_alert import latest_snapshot
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else latest_snapshot()
+    if path is None:
+        print("❌ 티켓베이 스냅샷이 없습니다.")
+    else:
+        df = find_duplicates(pd.read_csv(path))
+        out = path.with_name(f"{path.stem}_dups.csv")
+        df.loc[df['dup_cluster_size'] > 1, ['id', 'dup_cluster', 'dup_cluster_size', 'depth3_name', 'name', 'price']] \
+            .sort_values(['dup_cluster', 'price']).to_csv(out, index=False, encoding='utf-8-sig')
+        print(f"💾 중복 클러스터 저장: {out}")
@@ -0,0 +1,133 @@
+import os
+import re
+import time
+import threading
+
+from metrics import span, incr, current_run
+from quota import acquire, consume, estimate_tokens
+
+# ──────────────────────────────
+# LLM 모델 라우팅 + 토큰 기록
+# ──────────────────────────────
+# "뮤지컬 〈쉐도우〉" 처럼 짧거나 형태가 단순한 제목은 작은 모델로 먼저 보내고,
+# 응답이 검증(길이, 해시태그 형식)을 통과하지 못할 때만 큰 모델로 다시 묻는다.
+# 호출마다 모델 / 토큰 / 지연을 실행 리포트(runs/*.json 의 llm_calls)에 남기고,
+# 실행 1회의 토큰 합계가 LLM_TOKEN_BUDGET 을 넘으면 더 부르지 않는다.
+
+SMALL_MODEL = os.getenv('LLM_SMALL_MODEL', 'gpt-4o-mini')
+LARGE_MODEL = os.getenv('LLM_LARGE_MODEL', 'gpt-4o')
+RUN_TOKEN_BUDGET = int(os.getenv('LLM_TOKEN_BUDGET', '200000'))
+
+SIMPLE_MAX_LENGTH = 20
+# 〈쉐도우〉, 《레베카》 같은 괄호 안 작품명 ([단독], [앵콜] 같은 대괄호는 말머리라 제외)
+BRACKETED = re.compile(r'[〈<《「『]([^〉>》」』]{1,15})[〉>》」』]')
+# 앞쪽 대괄호 말머리 (단순도 판단에서 제외)
+LABEL = re.compile(r'^(\s*[\[［][^\]］]*[\]］])+\s*')
+# 앞쪽 연도, 뒤쪽 지역/회차/부제 (단순도 판단에서 제외)
+NOISE = re.compile(r'^\d{4}\s+|\s*[-–~|(（].*$')
+
+HASHTAG = re.compile(r'#[^\s#,]{1,12}')
+MAX_ARTIST_LENGTH = 15
+
+
+class LLMBudgetExceeded(Exception):
+    """이번 실행의 토큰 예산 소진"""
+
+
+class LLMRateLimited(Exception):
+    """공용 OpenAI 한도(quota.py)를 대기 시간 안에 받지 못함"""
+
+
+def is_simple(title):
+    """작은 모델로 충분한 제목인지 (짧거나 괄호 안 작품명이 뚜렷한 경우)"""
+    core = NOISE.sub('', LABEL.sub('', title or '')).strip()
+    if BRACKETED.search(title or ''):
+        return True
+    return 0 < len(core) <= SIMPLE_MAX_LENGTH and core.count(' ') <= 3
+
+
+def valid_artist(text, max_length=MAX_ARTIST_LENGTH):
+    text = text.strip().strip('"')
+    return 0 < len(text) <= max_length and '\n' not in text and ':' not in text
+
+
+def valid_hashtags(text):
+    text = text.strip()
+    tags = HASHTAG.findall(text)
+    return len(tags) >= 3 and '\n' not in text and ',' not in text and ''.join(tags) == text.replace(' ', '')
+
+
+VALIDATORS = {'artist': valid_artist, 'hashtag': valid_hashtags}
+
+
+class LLMRouter:
+    def __init__(self, client_factory, budget=None, small=None, large=None):
+        self._client_factory = client_factory
+        self.budget = RUN_TOKEN_BUDGET if budget is None else budget
+        self.small = small or SMALL_MODEL
+        self.large = large or LARGE_MODEL
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def models_for(self, title):
+        return [self.small, self.large] if is_simple(title) else [self.large]
+
+    def complete(self, kind, prompt, title, temperature=0.2, validate=None):
+        """검증을 통과한 응답 텍스트 (큰 모델까지 실패하면 마지막 응답 그대로)"""
+        validate = validate or VALIDATORS.get(kind, lambda text: True)
+        models = self.models_for(title)
+        text = None
+        for attempt, model in enumerate(models):
+            text = self._call(kind, model, prompt, temperature, escalated=attempt > 0)
+            if validate(text):
+                return text
+            if attempt < len(models) - 1:
+                incr('llm_escalations', kind=kind)
+        return text
+
+    def _call(self, kind, model, prompt, temperature, escalated=False):
+        estimate = estimate_tokens(prompt)
+        with self.lock:
+            if self.used + estimate > self.budget:
+                incr('llm_budget_denied', kind=kind)
+                raise LLMBudgetExceeded(f"토큰 예산 {self.budget} 중 {self.used} 사용")
+            self.used += estimate
+        if not acquire('openai', tokens=estimate):
+            # 호출하지 않았으니 잡아 둔 예산을 돌려놓는다
+            with self.lock:
+                self.used -= estimate
+            raise LLMRateLimited(f"OpenAI 한도 대기 시간 초과 ({kind}, {model})")
+        start = time.perf_counter()
+        try:
+            with span('llm', kind=kind, model=model):
+                res = self._client_factory().chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                )
+        except Exception:
+            # 응답을 못 받았으면 잡아 둔 예산과 공용 토큰 한도를 돌려놓는다 (실패가 이어져도 새지 않도록)
+            with self.lock:
+                self.used -= estimate
+            consume('openai', -estimate)
+            raise
+        latency = time.perf_counter() - start
+        incr('api_calls', provider='openai')
+
+        usage = getattr(res, 'usage', None)
+        prompt_tokens = usage.prompt_tokens if usage else 0
+        completion_tokens = usage.completion_tokens if usage else 0
+        if usage:
+            incr('llm_tokens', prompt_tokens, kind='prompt', model=model)
+            incr('llm_tokens', completion_tokens, kind='completion', model=model)
+            # 예상치로 잡아 둔 예산/한도를 실제 사용량으로 맞춘다
+            with self.lock:
+                self.used += usage.total_tokens - estimate
+            consume('openai', usage.total_tokens - estimate)
+        current_run().extra.setdefault('llm_calls', []).append({
+            'kind': kind, 'model': model, 'escalated': escalated,
+            'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'latency': round(latency, 3),
+        })
+        current_run().extra['llm_budget'] = {'budget': self.budget, 'used': self.used}
+        return res.choices[0].message.content.strip()
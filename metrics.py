@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import threading
+import functools
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+# ──────────────────────────────
+# 실행 단위 계측 (단계별 시간 + 카운터)
+# ──────────────────────────────
+# with span('fetch'): ...            단계 시간 측정
+# @timed('llm', kind='artist')       함수 단위 측정
+# incr('api_calls', provider='openai')
+#
+# start_run(job) ~ finish_run() 사이의 기록은
+#   runs/{job}_{시각}.json                 실행 리포트
+#   $PROM_TEXTFILE_DIR/{job}.prom (기본 prom/)  Prometheus textfile collector
+# 로 저장된다. start_run 없이 호출되면 메모리에만 쌓이고 파일은 쓰지 않는다.
+
+RUNS_DIR = Path(os.getenv('RUN_REPORT_DIR', 'runs'))
+PROM_DIR = Path(os.getenv('PROM_TEXTFILE_DIR', 'prom'))
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Run:
+    """실행 1회의 단계 시간/카운터 저장소"""
+
+    def __init__(self, job):
+        self.job = job
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.extra = {}
+
+    def add_span(self, name, seconds, labels=None, error=None):
+        key = (name, _label_key(labels or {}))
+        with self.lock:
+            stat = self.stages.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0, 'errors': 0})
+            stat['count'] += 1
+            stat['total'] += seconds
+            stat['max'] = max(stat['max'], seconds)
+            if error:
+                stat['errors'] += 1
+
+    def incr(self, name, value=1, labels=None):
+        key = (name, _label_key(labels or {}))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def report(self):
+        with self.lock:
+            return {
+                'job': self.job,
+                'started_at': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+                'duration': round(time.time() - self.started, 4),
+                'stages': [{'stage': n, **dict(l), 'count': s['count'], 'total': round(s['total'], 4),
+                            'max': round(s['max'], 4), 'errors': s['errors']}
+                           for (n, l), s in self.stages.items()],
+                'counters': [{'name': n, **dict(l), 'value': v} for (n, l), v in self.counters.items()],
+                **self.extra,
+            }
+
+    def prometheus(self):
+        """textfile collector 형식 문자열"""
+        def fmt(labels):
+            labels = {'job': self.job, **labels}
+            return '{' + ','.join(f'{k}="{str(v).replace(chr(34), "")}"' for k, v in labels.items()) + '}'
+
+        lines = [
+            '# TYPE pipeline_run_timestamp_seconds gauge',
+            f'pipeline_run_timestamp_seconds{fmt({})} {self.started:.0f}',
+            '# TYPE pipeline_run_duration_seconds gauge',
+            f'pipeline_run_duration_seconds{fmt({})} {time.time() - self.started:.4f}',
+            '# TYPE pipeline_stage_seconds gauge',
+        ]
+        with self.lock:
+            for (name, labels), s in self.stages.items():
+                lines.append(f'pipeline_stage_seconds{fmt({"stage": name, **dict(labels)})} {s["total"]:.4f}')
+            lines.append('# TYPE pipeline_stage_calls gauge')
+            for (name, labels), s in self.stages.items():
+                lines.append(f'pipeline_stage_calls{fmt({"stage": name, **dict(labels)})} {s["count"]}')
+            lines.append('# TYPE pipeline_counter gauge')
+            for (name, labels), v in self.counters.items():
+                lines.append(f'pipeline_counter{fmt({"name": name, **dict(labels)})} {v}')
+        return '\n'.join(lines) + '\n'
+
+
+_run = Run('default')
+
+# 단계 진입 시 함께 열 컨텍스트 (profiling.enable 이 설정, 기본은 없음)
+_stage_hook = None
+
+
+def current_run():
+    return _run
+
+
+def start_run(job):
+    global _run
+    _run = Run(job)
+    return _run
+
+
+def finish_run(runs_dir=None, prom_dir=None):
+    """실행 리포트(JSON)와 Prometheus 파일 저장"""
+    run = _run
+    runs_dir, prom_dir = Path(runs_dir or RUNS_DIR), Path(prom_dir or PROM_DIR)
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    prom_dir.mkdir(parents=True, exist_ok=True)
+
+    stamp = datetime.fromtimestamp(run.started).strftime('%Y-%m-%d_%H-%M-%S')
+    report_path = runs_dir / f"{run.job}_{stamp}.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(run.report(), f, ensure_ascii=False, indent=2)
+
+    # collector 가 쓰다 만 파일을 읽지 않도록 임시 파일 → rename
+    prom_path = prom_dir / f"{run.job}.prom"
+    tmp = prom_path.with_suffix('.prom.tmp')
+    tmp.write_text(run.prometheus(), encoding='utf-8')
+    os.replace(tmp, prom_path)
+    print(f"📈 실행 리포트: {report_path}")
+    return report_path
+
+
+def set_stage_hook(hook):
+    global _stage_hook
+    _stage_hook = hook
+
+
+def profiling_active():
+    return _stage_hook is not None
+
+
+@contextmanager
+def span(name, **labels):
+    hook = _stage_hook(name) if _stage_hook is not None else None
+    if hook is not None:
+        hook.__enter__()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _run.add_span(name, time.perf_counter() - start, labels, error)
+        if hook is not None:
+            hook.__exit__(None, None, None)
+
+
+def timed(name, **labels):
+    """함수 실행 시간을 span 으로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def incr(name, value=1, **labels):
+    _run.incr(name, value, labels)
+
+
+def record_http(provider, response):
+    """HTTP 응답 1건의 호출 수/바이트 수 기록"""
+    incr('api_calls', provider=provider, status=getattr(response, 'status_code', ''))
+    incr('api_bytes', len(getattr(response, 'content', b'') or b''), provider=provider)
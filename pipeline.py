@@ -0,0 +1,257 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import metrics
+from metrics import span, incr, current_run
+
+# ──────────────────────────────
+# 선언형 단계 실행기 (단계별 결과 디스크 메모)
+# ──────────────────────────────
+# 단계마다 입력/출력 이름과 타입을 선언하면, 입력이 준비된 단계부터 실행하고
+# 서로 의존하지 않는 단계(예: 문구 렌더링 → 시트 동기화 vs 텔레그램 전송)는 병렬로 돌린다.
+#
+#   Pipeline('notice', [
+#       Stage('fetch', fetch, outputs={'notices': list}, ttl=600),
+#       Stage('filter', filter_hot, inputs={'notices': list}, outputs={'hot': pd.DataFrame},
+#             stop_if=lambda hot: hot.empty),
+#       ...
+#   ]).run()
+#
+# 각 단계 결과는 pipeline_cache/{파이프라인}/{단계}-{키}.pkl 에 저장된다.
+# 키 = 단계 이름 + version + params + 입력값 해시 이므로, 다시 실행하면 입력이 같은 단계는
+# 저장된 결과를 그대로 쓰고 처음으로 입력이 바뀌었거나 지난번에 실패한 단계부터 실제로 돈다.
+# 입력이 없는 단계(네트워크 수집)는 ttl 초가 지나면 다시 실행한다.
+
+CACHE_DIR = Path(os.getenv('PIPELINE_CACHE_DIR', 'pipeline_cache'))
+MAX_WORKERS = 4
+KEEP_PER_STAGE = 3       # 단계별로 보관할 최근 결과 수
+
+
+class PipelineError(Exception):
+    """실패한 단계가 있음 (다른 단계 결과는 results 에)"""
+
+    def __init__(self, failed, results):
+        super().__init__(', '.join(f"{name}: {e}" for name, e in failed.items()))
+        self.failed = failed
+        self.results = results
+
+
+class Degraded(Exception):
+    """단계가 결과는 냈지만 일부를 기본값으로 채움 → 'fallback' 으로 기록하고 메모하지 않음"""
+
+    def __init__(self, result, reason):
+        super().__init__(reason)
+        self.result = result
+
+
+class Stage:
+    def __init__(self, name, func, inputs=None, outputs=None, params=None, version=1,
+                 ttl=None, memo=True, fallback=None, stop_if=None, check=None):
+        """
+        inputs / outputs: {이름: 타입}, func(*inputs) (선언 순서대로 위치 인자) 는 출력이 1개면 값, 여러 개면 dict 반환
+        params: 결과에 영향을 주는 설정값 (메모 키에 포함)
+        fallback: 실패 시 func 대신 부를 함수 (결과는 메모하지 않음, 다음 실행에서 재시도)
+                  func 가 Degraded(결과, 이유) 를 던지면 그 결과를 같은 방식으로 쓴다
+        stop_if: 출력값을 받아 True 면 이후 단계 건너뜀 (빈 핫 리스트 등)
+        check: 메모된 출력값을 받아 False 면 메모를 버리고 다시 실행 (디스크에 남긴 파일이 지워진 경우 등)
+        """
+        self.name = name
+        self.func = func
+        self.inputs = dict(inputs or {})
+        self.outputs = dict(outputs or {})
+        self.params = params or {}
+        self.version = version
+        self.ttl = ttl
+        self.memo = memo
+        self.fallback = fallback
+        self.stop_if = stop_if
+        self.check = check
+
+    def __repr__(self):
+        return f"Stage({self.name}: {list(self.inputs)} → {list(self.outputs)})"
+
+
+def hash_value(value):
+    """단계 입력값 해시 (DataFrame 은 내용 + 컬럼 + dtype 기준)"""
+    h = hashlib.sha1()
+    if hasattr(value, 'columns') and hasattr(value, 'dtypes'):
+        import pandas as pd
+        h.update(json.dumps([list(map(str, value.columns)), list(map(str, value.dtypes))]).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(value.astype(str), index=True).to_numpy().tobytes())
+    else:
+        h.update(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _check_type(stage, name, value, expected):
+    if expected is not None and not isinstance(value, expected):
+        raise TypeError(f"{stage.name}.{name}: {getattr(expected, '__name__', expected)} 이어야 하는데 "
+                        f"{type(value).__name__}")
+
+
+class Pipeline:
+    def __init__(self, name, stages, cache_dir=None, max_workers=MAX_WORKERS):
+        self.name = name
+        self.stages = list(stages)
+        self.cache_dir = Path(cache_dir or CACHE_DIR) / name
+        self.max_workers = max_workers
+        self._validate()
+
+    def _validate(self):
+        """출력 이름 중복, 만들어지지 않는 입력, 타입 불일치를 실행 전에 확인"""
+        produced = {}
+        for stage in self.stages:
+            for out, kind in stage.outputs.items():
+                if out in produced:
+                    raise ValueError(f"출력 '{out}' 이 {produced[out].name} 과 {stage.name} 에서 중복")
+                produced[out] = stage
+        for stage in self.stages:
+            for name, kind in stage.inputs.items():
+                if name not in produced:
+                    raise ValueError(f"{stage.name} 의 입력 '{name}' 을 만드는 단계가 없음")
+                declared = produced[name].outputs[name]
+                if kind is not None and declared is not None and not issubclass(declared, kind):
+                    raise TypeError(f"{stage.name}.{name}: {declared.__name__} → {kind.__name__} 불일치")
+        self.producers = produced
+
+    def downstream(self, names):
+        """names 단계에 (간접적으로라도) 의존하는 단계 이름"""
+        blocked, changed = set(names), True
+        while changed:
+            changed = False
+            for stage in self.stages:
+                if stage.name not in blocked and any(self.producers[i].name in blocked for i in stage.inputs):
+                    blocked.add(stage.name)
+                    changed = True
+        return blocked - set(names)
+
+    # ── 메모 ──
+    def key(self, stage, values):
+        parts = [stage.name, stage.version, stage.params] + [hash_value(values[i]) for i in stage.inputs]
+        return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, stage, key):
+        return self.cache_dir / f"{stage.name}-{key}.pkl"
+
+    def load(self, stage, key):
+        path = self._path(stage, key)
+        if not stage.memo or not path.exists():
+            return None
+        if stage.ttl is not None and time.time() - path.stat().st_mtime > stage.ttl:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ 단계 결과 로드 실패, 다시 실행합니다: {stage.name} - {e}")
+            return None
+
+    def store(self, stage, key, outputs):
+        if not stage.memo:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage, key)
+        tmp = path.with_suffix('.pkl.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(outputs, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        old = sorted(self.cache_dir.glob(f"{stage.name}-*.pkl"), key=lambda p: p.stat().st_mtime)
+        for p in old[:-KEEP_PER_STAGE]:
+            p.unlink(missing_ok=True)
+
+    # ── 실행 ──
+    def _execute(self, stage, values, use_memo):
+        """단계 1개 → (출력 dict, 상태)"""
+        # DataFrame 은 복사본을 넘긴다 (병렬 단계끼리, 또는 메모된 값을 제자리에서 고치지 않도록)
+        args = [values[name].copy() if hasattr(values[name], 'columns') else values[name] for name in stage.inputs]
+        key = self.key(stage, values)
+        if use_memo:
+            cached = self.load(stage, key)
+            if cached is not None and (stage.check is None or stage.check(*cached.values())):
+                return cached, 'cached', key
+        try:
+            with span(stage.name):
+                result = stage.func(*args)
+            status = 'ran'
+        except Degraded as e:
+            print(f"⚠️ {stage.name} 일부 대체값: {e}")
+            result = e.result
+            status = 'fallback'
+        except Exception as e:
+            if stage.fallback is None:
+                raise
+            print(f"⚠️ {stage.name} 생략: {e}")
+            result = stage.fallback(*args)
+            status = 'fallback'
+        outputs = result if len(stage.outputs) != 1 else {next(iter(stage.outputs)): result}
+        for name, kind in stage.outputs.items():
+            if name not in outputs:
+                raise KeyError(f"{stage.name}: 출력 '{name}' 없음")
+            _check_type(stage, name, outputs[name], kind)
+        if status == 'ran' and use_memo:
+            self.store(stage, key, outputs)
+        return outputs, status, key
+
+    def run(self, use_memo=True):
+        """모든 단계 실행 → {출력 이름: 값} (실패 단계가 있으면 PipelineError)"""
+        values = {}
+        pending = list(self.stages)
+        status, failed, stopped = {}, {}, set()
+        # 프로파일 중에는 단계별 CPU 측정이 섞이지 않도록 순차 실행
+        workers = 1 if metrics.profiling_active() else self.max_workers
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while pending or running:
+                blocked = self.downstream(set(failed) | stopped)
+                for stage in [s for s in pending if s.name in blocked]:
+                    pending.remove(stage)
+                    status[stage.name] = {'status': 'skipped'}
+                ready = [s for s in pending if all(i in values for i in s.inputs)]
+                for stage in ready:
+                    pending.remove(stage)
+                    running[executor.submit(self._execute, stage, values, use_memo)] = (stage, time.perf_counter())
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, t0 = running.pop(future)
+                    elapsed = round(time.perf_counter() - t0, 3)
+                    try:
+                        outputs, state, key = future.result()
+                    except Exception as e:
+                        print(f"❌ 단계 실패: {stage.name} - {e}")
+                        failed[stage.name] = e
+                        status[stage.name] = {'status': 'failed', 'seconds': elapsed, 'error': str(e)}
+                        continue
+                    values.update(outputs)
+                    status[stage.name] = {'status': state, 'seconds': elapsed, 'key': key}
+                    if stage.stop_if is not None and stage.stop_if(*outputs.values()):
+                        stopped.add(stage.name)
+
+        for stage in self.stages:
+            incr('pipeline_stages', stage=stage.name, kind=status.get(stage.name, {}).get('status', 'skipped'))
+        self._report(status, time.perf_counter() - started)
+        if failed:
+            raise PipelineError(failed, values)
+        return values
+
+    def _report(self, status, seconds):
+        cached = [n for n, s in status.items() if s['status'] == 'cached']
+        ran = [n for n, s in status.items() if s['status'] in ('ran', 'fallback')]
+        failed = [n for n, s in status.items() if s['status'] == 'failed']
+        print(f"🧩 {self.name} 파이프라인 {seconds:.2f}s | 재사용 {', '.join(cached) or '-'} | "
+              f"실행 {', '.join(ran) or '-'}" + (f" | 실패 {', '.join(failed)}" if failed else ""))
+        current_run().extra.setdefault('pipeline', {})[self.name] = status
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / 'last_run.json').write_text(json.dumps({
+            'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'seconds': round(seconds, 3), 'stages': status,
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
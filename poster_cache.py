@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from metrics import span, incr, record_http
+
+# ──────────────────────────────
+# 포스터 이미지 캐시 (내용 해시 기준)
+# ──────────────────────────────
+# poster_cache/
+#   index.json          URL → {hash, ext, etag, last_modified, fetched_at}
+#   objects/{hash}.jpg  실제 파일 (같은 이미지는 URL 이 달라도 한 번만 저장)
+#   derived/            업로드용 변환본 (poster_normalize), phash.json 유사 이미지 목록 (poster_phash)
+#                       → 용량 정리 때 원본과 함께 지운다
+#
+# 핫 리스트가 정해지면 prefetch 로 포스터를 한꺼번에 받아 두고,
+# 시트/번장 게시 쪽은 get(url) 로 로컬 경로만 꺼내 쓴다.
+# 다시 받을 때는 ETag / Last-Modified 조건부 요청이라 바뀌지 않았으면 304 만 받는다.
+
+CACHE_DIR = Path(os.getenv('POSTER_CACHE_DIR', 'poster_cache'))
+MAX_BYTES = int(os.getenv('POSTER_CACHE_MAX_MB', '500')) * 1024 * 1024
+FRESH_SECONDS = 6 * 3600     # 이 시간 안에 확인한 URL 은 요청 없이 바로 사용
+MAX_WORKERS = 6
+TIMEOUT = 15
+HEADERS = {"user-agent": "Mozilla/5.0", "referer": "https://tickets.interpark.com/"}
+
+# 응답 Content-Type / 파일 시그니처 → 확장자
+CONTENT_TYPES = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif', 'image/webp': '.webp'}
+MAGIC = [(b'\xff\xd8\xff', '.jpg'), (b'\x89PNG', '.png'), (b'GIF8', '.gif'), (b'RIFF', '.webp')]
+
+
+def sniff_ext(content, content_type=''):
+    for magic, ext in MAGIC:
+        if content.startswith(magic):
+            return ext
+    return CONTENT_TYPES.get((content_type or '').split(';')[0].strip(), '.bin')
+
+
+class PosterCache:
+    def __init__(self, cache_dir=None, max_bytes=MAX_BYTES, max_workers=MAX_WORKERS):
+        self.dir = Path(cache_dir or CACHE_DIR)
+        self.objects = self.dir / 'objects'
+        self.index_path = self.dir / 'index.json'
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+        self.stats = {'downloaded': 0, 'not_modified': 0, 'fresh': 0, 'deduped': 0, 'failed': 0, 'bytes': 0}
+        self.new_hashes = []
+
+    def _load_index(self):
+        if self.index_path.exists():
+            try:
+                return json.loads(self.index_path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+        return {}
+
+    def _session(self):
+        # requests.Session 은 스레드마다 하나씩 (연결 재사용)
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            self.local.session.headers.update(HEADERS)
+        return self.local.session
+
+    def path_for(self, entry):
+        return self.objects / f"{entry['hash']}{entry['ext']}"
+
+    def get(self, url):
+        """캐시에 있으면 로컬 경로, 없으면 None (네트워크 사용 안 함)"""
+        entry = self.index.get(url)
+        if entry and self.path_for(entry).exists():
+            return self.path_for(entry)
+        return None
+
+    def fetch(self, url):
+        """URL 1개를 캐시에 반영하고 로컬 경로 반환 (실패 시 None)"""
+        if not url:
+            return None
+        entry = self.index.get(url)
+        path = self.path_for(entry) if entry else None
+        if path and path.exists() and time.time() - entry.get('fetched_at', 0) < FRESH_SECONDS:
+            self._count('fresh')
+            return path
+
+        headers = {}
+        if path and path.exists():
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            r = self._session().get(url, headers=headers, timeout=TIMEOUT)
+        except Exception as e:
+            print(f"❌ 포스터 다운로드 오류: {url} - {e}")
+            self._count('failed')
+            return path if path and path.exists() else None
+        record_http('poster', r)
+
+        if r.status_code == 304 and path:
+            with self.lock:
+                entry['fetched_at'] = time.time()
+            self._count('not_modified')
+            return path
+        if r.status_code != 200 or not r.content:
+            print(f"❌ 포스터 다운로드 실패: {url} (상태코드: {r.status_code})")
+            self._count('failed')
+            return path if path and path.exists() else None
+
+        digest = hashlib.sha256(r.content).hexdigest()
+        new = {
+            'hash': digest,
+            'ext': sniff_ext(r.content, r.headers.get('Content-Type')),
+            'etag': r.headers.get('ETag'),
+            'last_modified': r.headers.get('Last-Modified'),
+            'size': len(r.content),
+            'fetched_at': time.time(),
+        }
+        target = self.path_for(new)
+        if target.exists():
+            self._count('deduped')
+        else:
+            tmp = target.with_suffix(target.suffix + f'.{threading.get_ident()}.tmp')
+            tmp.write_bytes(r.content)
+            os.replace(tmp, target)
+            with self.lock:
+                self.new_hashes.append(digest)
+            self._count('downloaded')
+            self._count('bytes', len(r.content))
+        with self.lock:
+            self.index[url] = new
+        return target
+
+    def _count(self, key, value=1):
+        with self.lock:
+            self.stats[key] += value
+        incr('posters', value, kind=key)
+
+    def prefetch(self, urls):
+        """여러 URL 을 동시에 받아 두기 (동시 요청 수 제한) → {url: 경로}"""
+        urls = list(dict.fromkeys(u for u in urls if isinstance(u, str) and u))
+        if not urls:
+            return {}
+        with span('poster_prefetch'), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            paths = dict(zip(urls, executor.map(self.fetch, urls)))
+        if self.new_hashes:
+            try:
+                from poster_phash import PHashIndex
+                # 새로 받은 것 중 이미 가진 포스터와 거의 같은 이미지는 기존 파일로 합친다
+                phash = PHashIndex(self.dir)
+                phash.dedupe(self, self.new_hashes)
+                phash.save()
+                self.new_hashes = []
+                paths = {u: self.get(u) for u in urls}
+            except Exception as e:
+                print(f"⚠️ 유사 포스터 검사 생략: {e}")
+        self.evict()
+        self.save()
+        s = self.stats
+        print(f"🖼️ 포스터 {len(urls)}개: 신규 {s['downloaded']} / 변경없음 {s['not_modified']} / "
+              f"최근확인 {s['fresh']} / 중복 {s['deduped']} / 실패 {s['failed']} "
+              f"({s['bytes'] / 1024:.0f}KB 다운로드)")
+        return paths
+
+    def evict(self):
+        """원본 + 변환본(derived/) 전체 용량이 max_bytes 를 넘으면 오래 안 쓴 원본부터 변환본과 함께 삭제"""
+        files = [p for p in self.objects.iterdir() if p.is_file() and not p.name.endswith('.tmp')]
+        # 변환본은 derived/{원본해시}_{프로필}.{확장자} → 원본 해시별로 묶는다
+        derived = {}
+        derived_dir = self.dir / 'derived'
+        if derived_dir.exists():
+            for p in derived_dir.iterdir():
+                if p.is_file() and not p.name.endswith('.tmp'):
+                    derived.setdefault(p.name.split('_', 1)[0], []).append(p)
+        groups = {p.stem: [p] + derived.pop(p.stem, []) for p in files}
+        # 원본이 이미 없는 변환본도 정리 대상 (가장 먼저)
+        groups.update(derived)
+        sizes = {h: sum(p.stat().st_size for p in paths) for h, paths in groups.items()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return 0
+        # 가장 최근에 확인된 시각 기준 (같은 파일을 여러 URL 이 가리킬 수 있음)
+        last_used = {}
+        for entry in self.index.values():
+            last_used[entry['hash']] = max(last_used.get(entry['hash'], 0), entry.get('fetched_at', 0))
+        removed = []
+        for digest in sorted(groups, key=lambda h: last_used.get(h, 0)):
+            if total <= self.max_bytes:
+                break
+            total -= sizes[digest]
+            for p in groups[digest]:
+                p.unlink(missing_ok=True)
+            removed.append(digest)
+        with self.lock:
+            self.index = {u: e for u, e in self.index.items() if self.path_for(e).exists()}
+        self._forget_phash(removed)
+        print(f"🧹 포스터 캐시 정리: 원본 {len(removed)}개 (변환본 포함) 삭제")
+        return len(removed)
+
+    def _forget_phash(self, digests):
+        """삭제한 원본을 phash.json 의 대표/별칭에서 제거"""
+        if not digests or not (self.dir / 'phash.json').exists():
+            return
+        try:
+            from poster_phash import PHashIndex
+            phash = PHashIndex(self.dir)
+            gone = set(digests)
+            phash.posters = {h: v for h, v in phash.posters.items() if h not in gone}
+            phash.aliases = {h: c for h, c in phash.aliases.items() if h not in gone and c not in gone}
+            phash.save()
+        except Exception as e:
+            print(f"⚠️ 지각 해시 목록 정리 생략: {e}")
+
+    def save(self):
+        # 다른 프로세스가 그 사이 추가한 항목은 살리고 내 항목으로 갱신
+        with self.lock:
+            merged = {**self._load_index(), **self.index}
+            merged = {u: e for u, e in merged.items() if self.path_for(e).exists()}
+            tmp = self.index_path.with_suffix('.json.tmp')
+            tmp.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding='utf-8')
+            os.replace(tmp, self.index_path)
+            self.index = merged
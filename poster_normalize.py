@@ -0,0 +1,96 @@
+import os
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import span, incr
+
+# ──────────────────────────────
+# 포스터 변환 (업로드용 크기/형식으로 한 번만)
+# ──────────────────────────────
+# 원본 포스터는 750x1000 대 JPEG 이나 움직이는 GIF 라 그대로 올리면 크고 MIME 도 틀린다.
+# 프로필별로 첫 프레임 → RGB → 최대 변 길이 축소 → JPEG/WebP 재인코딩을 하고,
+# 결과는 poster_cache/derived/{원본해시}_{프로필}.{확장자} 로 남겨 다음 실행부터는 바로 쓴다.
+# 디코딩/인코딩은 CPU 작업이라 여러 장이면 프로세스 풀에서 돌린다.
+
+PROFILES = {
+    'bunjang': {'max_dim': 1000, 'format': 'JPEG', 'quality': 85},
+    'thumb': {'max_dim': 400, 'format': 'WEBP', 'quality': 75},
+}
+EXTENSIONS = {'JPEG': '.jpg', 'WEBP': '.webp', 'PNG': '.png'}
+MIME_TYPES = {'.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.webp': 'image/webp',
+              '.png': 'image/png', '.gif': 'image/gif'}
+DERIVED_DIR = Path(os.getenv('POSTER_CACHE_DIR', 'poster_cache')) / 'derived'
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def mime_type(path):
+    return MIME_TYPES.get(Path(path).suffix.lower(), 'application/octet-stream')
+
+
+def source_hash(path):
+    """원본 내용 해시 (poster_cache 객체 파일은 파일명이 곧 해시)"""
+    path = Path(path)
+    if path.parent.name == 'objects' and len(path.stem) == 64:
+        return path.stem
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def derived_path(digest, profile, out_dir=None):
+    return Path(out_dir or DERIVED_DIR) / f"{digest}_{profile}{EXTENSIONS[PROFILES[profile]['format']]}"
+
+
+def render(src, out, profile):
+    """원본 1장 → 프로필 형식 파일 (프로세스 풀 작업 단위)"""
+    from PIL import Image
+    spec = PROFILES[profile]
+    with Image.open(src) as im:
+        im.seek(0)  # 움직이는 GIF 는 첫 프레임만
+        im = im.convert('RGB')
+        im.thumbnail((spec['max_dim'], spec['max_dim']), Image.LANCZOS)
+        tmp = Path(out).with_suffix(f'.{os.getpid()}.tmp')
+        im.save(tmp, spec['format'], quality=spec['quality'], optimize=True)
+    os.replace(tmp, out)
+    return os.path.getsize(src), os.path.getsize(out)
+
+
+def normalize_posters(paths, profile='bunjang', out_dir=None, max_workers=MAX_WORKERS):
+    """원본 경로 목록 → {원본 경로: 변환 파일 경로} (이미 변환된 것은 건너뜀)"""
+    out_dir = Path(out_dir or DERIVED_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    targets = {}
+    for src in dict.fromkeys(str(p) for p in paths if p):
+        try:
+            targets[src] = derived_path(source_hash(src), profile, out_dir)
+        except OSError as e:
+            print(f"❌ 포스터 읽기 실패: {src} - {e}")
+
+    # 내용이 같은 원본은 한 번만 변환
+    pending = {}
+    for src, out in targets.items():
+        if not out.exists():
+            pending.setdefault(out, src)
+    incr('poster_variants', len(targets) - len(pending), kind='cached')
+
+    if pending:
+        jobs = [(src, str(out), profile) for out, src in pending.items()]
+        with span('poster_normalize', profile=profile):
+            if len(jobs) == 1 or max_workers <= 1:
+                outcomes = [_safe_render(*job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+                    outcomes = list(executor.map(_safe_render, *zip(*jobs)))
+        done = [sizes for sizes in outcomes if sizes]
+        incr('poster_variants', len(done), kind='converted')
+        print(f"🖼️ 포스터 변환({profile}) {len(done)}/{len(jobs)}개: "
+              f"{sum(b for b, _ in done) / 1024:.0f}KB → {sum(a for _, a in done) / 1024:.0f}KB")
+
+    return {src: out for src, out in targets.items() if out.exists()}
+
+
+def _safe_render(src, out, profile):
+    try:
+        return render(src, out, profile)
+    except Exception as e:
+        print(f"❌ 포스터 변환 실패: {src} - {e}")
+        return None
@@ -0,0 +1,175 @@
+import os
+import json
+from pathlib import Path
+
+import numpy as np
+
+from metrics import incr
+
+# ──────────────────────────────
+# 포스터 지각 해시 (aHash / dHash) + BK-tree 근접 검색
+# ──────────────────────────────
+# 같은 포스터가 지역 공연/재등록마다 다른 URL(다른 용량/재인코딩)로 올라온다.
+# 내용 해시(sha256)는 바이트가 조금만 달라도 다르므로, 8x8 밝기 기반 해시로
+# 거의 같은 이미지를 찾아 먼저 저장된 원본 하나로 합친다.
+# 합쳐진 URL 은 그 원본과 원본의 변환본(poster_cache/derived)을 그대로 쓴다.
+#
+# poster_cache/phash.json
+#   posters: {sha256: {ahash, dhash, size}}    대표 이미지
+#   aliases: {sha256: 대표 sha256}              합쳐진 이미지
+
+HASH_SIZE = 8
+DHASH_DISTANCE = 6     # 64비트 중 다른 비트 수 허용치
+AHASH_DISTANCE = 8
+
+
+def _gray(path, size):
+    from PIL import Image
+    with Image.open(path) as im:
+        im.seek(0)
+        return np.asarray(im.convert('L').resize(size, Image.BILINEAR), dtype=np.int16)
+
+
+def _to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def ahash(path):
+    g = _gray(path, (HASH_SIZE, HASH_SIZE))
+    return _to_int(g > g.mean())
+
+
+def dhash(path):
+    g = _gray(path, (HASH_SIZE + 1, HASH_SIZE))
+    return _to_int(g[:, 1:] > g[:, :-1])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """해밍 거리 BK-tree (노드: [값, 키, {거리: 자식}])"""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value, key):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, key, {}]
+            return
+        node = self.root
+        while True:
+            d = hamming(value, node[0])
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, key, {}]
+                return
+            node = child
+
+    def search(self, value, radius):
+        """radius 이내 (거리, 키) 목록, 가까운 순"""
+        found, stack = [], [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(value, node[0])
+            if d <= radius:
+                found.append((d, node[1]))
+            # 삼각 부등식: |d - r| ~ d + r 구간 자식만 보면 된다
+            for dist, child in node[2].items():
+                if d - radius <= dist <= d + radius:
+                    stack.append(child)
+        return sorted(found)
+
+
+class PHashIndex:
+    def __init__(self, cache_dir=None):
+        self.path = Path(cache_dir or os.getenv('POSTER_CACHE_DIR', 'poster_cache')) / 'phash.json'
+        data = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+        self.posters = data.get('posters', {})
+        self.aliases = data.get('aliases', {})
+        self.tree = BKTree()
+        for digest, h in self.posters.items():
+            self.tree.add(int(h['dhash'], 16), digest)
+
+    def match(self, path):
+        """(a, d) 해시와 가장 가까운 대표 sha256 (없으면 None)"""
+        a, d = ahash(path), dhash(path)
+        for _, digest in self.tree.search(d, DHASH_DISTANCE):
+            h = self.posters.get(digest)   # 대표에서 빠진 노드는 트리에만 남아 있다
+            if h and hamming(a, int(h['ahash'], 16)) <= AHASH_DISTANCE:
+                return digest, a, d
+        return None, a, d
+
+    def add(self, digest, a, d, size):
+        self.posters[digest] = {'ahash': f"{a:016x}", 'dhash': f"{d:016x}", 'size': size}
+        self.tree.add(d, digest)
+
+    def dedupe(self, cache, digests):
+        """새로 받은 이미지 중 기존 포스터와 거의 같은 것을 대표 이미지로 합치기
+
+        cache: PosterCache (index 의 URL 항목을 대표 이미지로 돌리고 중복 파일 삭제)
+        반환: {'merged': 합친 수, 'bytes': 아낀 저장 용량, 'variants': 재사용한 변환본 수}
+        """
+        saved = {'merged': 0, 'bytes': 0, 'variants': 0}
+        by_hash = {}
+        for url, entry in cache.index.items():
+            by_hash.setdefault(entry['hash'], []).append(url)
+
+        for digest in dict.fromkeys(digests):
+            urls = by_hash.get(digest)
+            if not urls:
+                continue
+            entry = cache.index[urls[0]]
+            path = cache.path_for(entry)
+            if not path.exists():
+                continue
+            canonical = self.aliases.get(digest)
+            if canonical is None and digest not in self.posters:
+                try:
+                    canonical, a, d = self.match(path)
+                except Exception as e:
+                    print(f"⚠️ 지각 해시 실패: {path.name} - {e}")
+                    continue
+                if canonical is None:
+                    self.add(digest, a, d, path.stat().st_size)
+                    continue
+            if canonical is None or canonical == digest:
+                continue
+            target = next((cache.index[u] for u in by_hash.get(canonical, [])), None)
+            if target is None or not cache.path_for(target).exists():
+                # 대표 파일이 정리(evict)됐으면 이 이미지를 새 대표로
+                self.aliases.pop(digest, None)
+                self.posters.pop(canonical, None)
+                a, d = ahash(path), dhash(path)
+                self.add(digest, a, d, path.stat().st_size)
+                continue
+
+            self.aliases[digest] = canonical
+            for url in urls:
+                cache.index[url] = {**cache.index[url], 'hash': target['hash'], 'ext': target['ext']}
+            saved['merged'] += 1
+            saved['bytes'] += path.stat().st_size
+            saved['variants'] += len(list(cache.dir.glob(f"derived/{canonical}_*")))
+            path.unlink()
+
+        incr('poster_dedup', saved['merged'], kind='merged')
+        incr('poster_dedup', saved['bytes'], kind='bytes_saved')
+        incr('poster_dedup', saved['variants'], kind='variants_reused')
+        if saved['merged']:
+            print(f"🪞 유사 포스터 {saved['merged']}개 합침: 저장 {saved['bytes'] / 1024:.0f}KB 절약, "
+                  f"변환본 {saved['variants']}개 재사용")
+        return saved
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps({'posters': self.posters, 'aliases': self.aliases}, indent=1), encoding='utf-8')
+        os.replace(tmp, self.path)
@@ -0,0 +1,246 @@
+import re
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+import pandas as pd
+
+# ──────────────────────────────
+# 티켓베이 감시 규칙 알림
+# ──────────────────────────────
+# watch_rules.json 예시
+# [
+#   {"id": "day6-seoul-vip", "event_id": 5871, "grade": "VIP", "max_price": 250000,
+#    "min_quantity": 2, "is_together": true},
+#   {"id": "kanye", "artist": "칸예 웨스트", "area": "W43", "max_price": 150000}
+# ]
+# - event_id: depth3_id (공연 회차), artist: depth2_name 또는 depth2_id
+# - grade / area / floor 는 부분 문자열 일치, max_price 는 1매 가격(price) 기준
+# - max_deviation: 적정가(fair_price.py) 대비 비율, -0.2 면 적정가보다 20% 이상 싼 매물만
+# - chat_id 를 생략하면 ADMIN_CHAT_ID 로 전송
+# - id 를 생략하면 규칙 내용의 해시로 정해지므로, 규칙을 고치면 새 규칙으로 취급된다
+
+RULES_PATH = Path('watch_rules.json')
+STATE_PATH = Path('ticketbay_alert_state.json')
+
+# 이 컬럼 값이 바뀌면 "변경된 매물"로 간주
+FINGERPRINT_COLUMNS = ['price', 'sale_quantity', 'grade', 'area', 'floor', 'seat_number', 'is_together', 'product_status']
+
+
+def normalize_name(name):
+    """아티스트명 비교용 정규화 (공백/대소문자 무시)"""
+    return ''.join(str(name).split()).lower()
+
+
+def load_json(path, default):
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            pass
+    return default
+
+
+def save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def rule_digest(rule):
+    """id 를 제외한 규칙 내용의 해시 (규칙 수정 감지용)"""
+    body = {k: v for k, v in rule.items() if k != 'id'}
+    return hashlib.sha1(json.dumps(body, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()[:8]
+
+
+def rule_signature(rule):
+    return f"{rule['id']}@{rule_digest(rule)}"
+
+
+class RuleIndex:
+    """감시 규칙을 공연 ID / 아티스트 기준으로 색인"""
+
+    def __init__(self, rules):
+        self.by_event = {}
+        self.by_artist = {}
+        for rule in rules:
+            rule.setdefault('id', f"rule-{rule_digest(rule)}")
+            if rule.get('event_id') is not None:
+                self.by_event.setdefault(str(rule['event_id']), []).append(rule)
+            elif rule.get('artist') is not None:
+                self.by_artist.setdefault(normalize_name(rule['artist']), []).append(rule)
+            else:
+                print(f"⚠️ 공연/아티스트가 없는 규칙은 무시됩니다: {rule['id']}")
+
+    def event_ids(self):
+        return set(self.by_event)
+
+    def artist_keys(self):
+        return set(self.by_artist)
+
+    def candidates(self, row):
+        rules = list(self.by_event.get(str(row.get('depth3_id')), []))
+        rules += self.by_artist.get(str(row.get('depth2_id')), [])
+        rules += self.by_artist.get(normalize_name(row.get('depth2_name', '')), [])
+        return rules
+
+
+def rule_matches(rule, row):
+    price = row.get('price')
+    if pd.isna(price):
+        return False
+    if rule.get('max_price') is not None and price > rule['max_price']:
+        return False
+    if rule.get('max_deviation') is not None:
+        deviation = row.get('price_deviation')
+        if deviation is None or pd.isna(deviation) or deviation > rule['max_deviation']:
+            return False
+    if rule.get('min_quantity') is not None and (row.get('sale_quantity') or 0) < rule['min_quantity']:
+        return False
+    if rule.get('is_together') is not None and (row.get('is_together') == 'YES') != bool(rule['is_together']):
+        return False
+    for key in ('grade', 'area', 'floor'):
+        if rule.get(key) and str(rule[key]) not in str(row.get(key, '')):
+            return False
+    return True
+
+
+def fingerprint(df):
+    """매물별 상태 해시 (행 단위 파이썬 루프 없이 계산)"""
+    cols = [c for c in FINGERPRINT_COLUMNS if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[cols].astype(str), index=False)
+    return hashed.astype(str)
+
+
+def changed_rows(df, state):
+    """지난 실행 이후 새로 등록되었거나 내용이 바뀐 매물만 반환"""
+    seen = state.get('fingerprints', {})
+    ids = df['id'].astype(str)
+    prints = fingerprint(df)
+    previous = ids.map(seen)
+    mask = previous.isna() | (previous != prints.values)
+    state['fingerprints'] = dict(zip(ids, prints))
+    return df[mask.values]
+
+
+def format_alert(rule, row):
+    total = row.get('total_price')
+    total_str = f" (총 {int(total):,}원)" if pd.notna(total) else ""
+    together = "연석" if row.get('is_together') == 'YES' else "비연석"
+    criteria = [f"≤ {int(rule['max_price']):,}원"] if rule.get('max_price') is not None else []
+    if rule.get('max_deviation') is not None:
+        criteria.append(f"적정가 {rule['max_deviation']:+.0%} 이하")
+    criteria = f" ({', '.join(criteria)})" if criteria else ""
+    fair = row.get('fair_price')
+    fair_str = f" | 적정가 {int(fair):,}원 ({row['price_deviation']:+.0%})" if fair is not None and pd.notna(fair) else ""
+    return (
+        f"<b>🔔 {row.get('depth3_name', '')}</b>\n"
+        f"{row.get('grade', '')} | {row.get('floor', '')} | {row.get('name', '')}\n"
+        f"💰 {int(row['price']):,}원 x {row.get('sale_quantity', '')}매{total_str} | {together}{fair_str}\n"
+        f"🎯 규칙: {rule['id']}{criteria}\n"
+        f"🔗 https://www.ticketbay.co.kr/product/{row.get('id')}"
+    )
+
+
+def evaluate_snapshot(df, rules, state):
+    """변경된 매물을 규칙에 대조하여 (규칙, 매물) 매칭 목록 반환
+
+    처음 보거나 내용이 바뀐 규칙이 있으면 변경 여부와 관계없이 스냅샷 전체에 대조한다.
+    전송 기록(sent)은 여기서 남기지 않고, 전송에 성공한 뒤 mark_sent 로 남긴다.
+    """
+    index = RuleIndex(rules)
+    if df.empty or not (index.by_event or index.by_artist):
+        return []
+
+    # id 가 같아도 내용이 바뀌면 새 규칙으로 본다
+    signatures = {rule_signature(rule) for rule in rules}
+    new_rules = signatures - set(state.get('rules', []))
+    state['rules'] = sorted(signatures)
+    delta = changed_rows(df, state)
+    if new_rules:
+        delta = df
+
+    # 규칙이 걸린 공연/아티스트 매물만 남김
+    event_mask = delta['depth3_id'].astype(str).isin(index.event_ids())
+    artist_keys = index.artist_keys()
+    artist_mask = (delta['depth2_id'].astype(str).isin(artist_keys)
+                   | delta['depth2_name'].map(normalize_name).isin(artist_keys))
+    delta = delta[event_mask | artist_mask]
+
+    # 판매 종료된 매물의 전송 기록은 정리
+    live_ids = set(df['id'].astype(str))
+    sent = {k for k in state.get('sent', []) if parse_alert_key(k)[1] in live_ids}
+    state['sent'] = sorted(sent)
+    matches = []
+    for row in delta.to_dict('records'):
+        for rule in index.candidates(row):
+            if not rule_matches(rule, row):
+                continue
+            if alert_key(rule, row) in sent:
+                continue
+            matches.append((rule, row))
+    print(f"🔎 매물 {len(delta)}건 검사 (새 규칙 {len(new_rules)}개) → 알림 {len(matches)}건")
+    return matches
+
+
+def alert_key(rule, row):
+    return f"{rule['id']}:{row['id']}:{row['price']}"
+
+
+def parse_alert_key(key):
+    """alert_key 역변환 → (규칙 ID, 매물 ID, 가격). 규칙 ID 에는 ':' 가 들어갈 수 있다."""
+    rule_id, listing_id, price = key.rsplit(':', 2)
+    return rule_id, listing_id, price
+
+
+def mark_sent(state, rule, row):
+    state['sent'] = sorted(set(state.get('sent', [])) | {alert_key(rule, row)})
+
+
+def run_alerts(df, rules_path=RULES_PATH, state_path=STATE_PATH, send=True, save=True):
+    """티켓베이 스냅샷 1개를 감시 규칙에 대조하고 텔레그램 알림 전송
+
+    send=False 면 매칭만 하고, save=False 면 상태 파일을 쓰지 않는다 (dry-run 재생).
+    """
+    rules = load_json(Path(rules_path), [])
+    if not rules:
+        print("📭 감시 규칙 없음")
+        return []
+
+    state = load_json(Path(state_path), {})
+    matches = evaluate_snapshot(df, rules, state)
+
+    if send and matches:
+        from telegram import send_message, ADMIN_CHAT_ID
+        for rule, row in matches:
+            result = send_message(rule.get('chat_id') or ADMIN_CHAT_ID, format_alert(rule, row))
+            if result.get('ok'):
+                mark_sent(state, rule, row)
+            else:
+                print(f"❌ 알림 전송 실패: {rule['id']} / {row['id']}")
+                # 다음 실행에서 "변경된 매물"로 다시 검사되도록 지문을 지운다
+                state.get('fingerprints', {}).pop(str(row['id']), None)
+
+    if not save:
+        return matches
+    state['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    save_json(Path(state_path), state)
+    return matches
+
+
+def latest_snapshot(log_dir='ticketbay_log'):
+    # _dups.csv / _fair.csv 같은 파생 파일 제외
+    files = sorted((p for p in Path(log_dir).glob('*.csv') if re.search(r'\d{2}-\d{2}-\d{2}\.csv$', p.name)),
+                   key=lambda p: p.stat().st_mtime)
+    return files[-1] if files else None
+
+
+if __name__ == "__main__":
+    import sys
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else latest_snapshot()
+    if path is None:
+        print("❌ 티켓베이 스냅샷이 없습니다.")
+    else:
+        print(f"📂 스냅샷: {path}")
+        run_alerts(pd.read_csv(path))
@@ -0,0 +1,153 @@
+import os
+import sys
+import atexit
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+import metrics
+
+# ──────────────────────────────
+# 단계별 CPU / 메모리 프로파일 (옵션)
+# ──────────────────────────────
+# python bunjang.py --now --profile  또는  PIPELINE_PROFILE=1
+# 켜면 metrics.span 으로 감싼 최상위 단계마다 cProfile + tracemalloc 을 걸고,
+# 종료 시 profiles/{job}_{시각}/ 에
+#   {stage}.prof       pstats 원본 (snakeviz 등)
+#   {stage}.collapsed  flamegraph.pl / speedscope 용 collapsed stack (단위: µs)
+#   {stage}.alloc.txt  단계 동안 늘어난 메모리 상위 위치
+# 를 남긴다. 꺼져 있으면 span 에 훅이 걸리지 않으므로 추가 비용이 없다.
+
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR', 'profiles'))
+TOP_ALLOCATIONS = 25
+MAX_DEPTH = 64
+
+
+class StageProfiler:
+    """단계 이름별로 cProfile 결과와 메모리 증가량을 누적"""
+
+    def __init__(self, job, out_dir=None):
+        stamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        self.out_dir = Path(out_dir or PROFILE_DIR) / f"{job}_{stamp}"
+        self.profiles = {}
+        self.allocations = {}
+        self.calls = {}
+        self.active = False
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        # cProfile 은 동시에 하나만 켤 수 있으므로 중첩/병렬 단계는 바깥 단계에 포함
+        with self.lock:
+            if self.active:
+                nested = True
+            else:
+                nested, self.active = False, True
+        if nested:
+            yield
+            return
+
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        before = tracemalloc.take_snapshot()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot()
+            merged = self.allocations.setdefault(name, {})
+            for stat in after.compare_to(before, 'lineno'):
+                key = str(stat.traceback)
+                merged[key] = merged.get(key, 0) + stat.size_diff
+            self.calls[name] = self.calls.get(name, 0) + 1
+            with self.lock:
+                self.active = False
+
+    def dump(self):
+        if not self.profiles:
+            return None
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        summary = []
+        for name, profile in self.profiles.items():
+            safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+            stats = pstats.Stats(profile)
+            stats.dump_stats(self.out_dir / f"{safe}.prof")
+            (self.out_dir / f"{safe}.collapsed").write_text(collapsed_stacks(stats), encoding='utf-8')
+
+            top = sorted(self.allocations.get(name, {}).items(), key=lambda kv: -kv[1])[:TOP_ALLOCATIONS]
+            lines = [f"{size / 1024:10.1f} KiB  {where}" for where, size in top]
+            (self.out_dir / f"{safe}.alloc.txt").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+            total_alloc = sum(size for _, size in top if size > 0)
+            summary.append(f"{name:<20} {self.calls[name]:>4}회  CPU {stats.total_tt:8.3f}s  "
+                           f"메모리 +{total_alloc / 1024 / 1024:.1f}MiB (상위 {len(top)}개 위치)")
+        (self.out_dir / 'summary.txt').write_text('\n'.join(summary) + '\n', encoding='utf-8')
+        print(f"🔬 프로파일 저장: {self.out_dir}")
+        for line in summary:
+            print(f"   {line}")
+        return self.out_dir
+
+
+def _label(func):
+    filename, line, name = func
+    return f"{Path(filename).name}:{line}:{name}" if line else name
+
+
+def collapsed_stacks(stats, min_time=1e-6):
+    """pstats 호출 그래프 → collapsed stack 문자열
+
+    cProfile 은 호출 간선(caller → callee)만 기록하므로, 간선별 누적 시간 비율로
+    자식의 자체 시간을 경로에 나눠 주는 근사치다.
+    경로 수는 호출 그래프 크기에 대해 지수적으로 늘 수 있으므로, 경로에 배분된
+    누적 시간이 min_time(출력 단위 1µs) 미만인 가지는 내려가지 않는다
+    (그 아래 줄은 어차피 출력에서 빠지므로 결과는 같다).
+    """
+    callees = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    labels = {func: _label(func) for func in stats.stats}
+    roots = [f for f, v in stats.stats.items() if not v[4]]
+    totals = {}
+
+    def walk(func, path, on_path, scale):
+        tt = stats.stats[func][2]
+        key = f"{path};{labels[func]}" if path else labels[func]
+        totals[key] = totals.get(key, 0) + tt * scale
+        if len(on_path) + 1 >= MAX_DEPTH:
+            return
+        on_path.add(func)
+        for child, edge_ct in callees.get(func, []):
+            child_ct = stats.stats[child][3]
+            # 재귀(순환)는 건너뛰고, 배분될 시간이 출력 단위보다 작은 가지는 자른다
+            if child_ct <= 0 or child in on_path or edge_ct * scale < min_time:
+                continue
+            walk(child, key, on_path, scale * edge_ct / child_ct)
+        on_path.discard(func)
+
+    for root in roots:
+        walk(root, '', set(), 1.0)
+    return ''.join(f"{k} {int(v * 1e6)}\n" for k, v in totals.items() if v >= min_time)
+
+
+def enable(job, out_dir=None):
+    """프로파일 켜기 (metrics.span 에 훅 등록, 종료 시 덤프)"""
+    profiler = StageProfiler(job, out_dir)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    metrics.set_stage_hook(profiler.stage)
+    atexit.register(profiler.dump)
+    print(f"🔬 프로파일 모드: {profiler.out_dir}")
+    return profiler
+
+
+def enable_from_argv(job, argv=None):
+    """--profile 인자 또는 PIPELINE_PROFILE=1 이면 프로파일 켜기"""
+    argv = sys.argv if argv is None else argv
+    if '--profile' in argv or os.getenv('PIPELINE_PROFILE') == '1':
+        return enable(job)
+    return None
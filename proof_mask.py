@@ -0,0 +1,317 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# ──────────────────────────────
+# 예매 인증 캡처 일괄 마스킹 (ocr.ipynb 정리본)
+# ──────────────────────────────
+# python proof_mask.py proof --out proof/masked
+# python proof_mask.py proof --backend stub --mode mosaic --intensity 15
+#
+# 1) 디렉터리의 이미지를 OCR 백엔드에 묶어서 보내 단어 + 좌표를 받고
+# 2) 규칙으로 가릴 박스를 고른 뒤
+# 3) 이미지마다 모든 박스를 한 번의 NumPy 연산으로 회색/모자이크 처리 (프로세스 풀)
+#
+# OCR 결과는 {'text': 단어, 'poly': [[x, y], ...]} 목록으로 통일한다.
+# OCR 결과는 ocr_cache.json 에 이미지 해시 + 언어 힌트 기준으로 남아 재실행 시 다시 요청하지 않는다.
+
+IMAGE_EXTS = {'.png', '.jpg', '.jpeg'}
+OUTPUT_SUFFIX = '_masked'
+
+# 노트북에서 쓰던 규칙
+#   row:   같은 줄 전체 (예약/좌석 '번호' 줄)
+#   right: 같은 줄에서 오른쪽 단어 전체 ('2025년' 뒤 날짜/시간)
+#   left:  같은 줄 바로 왼쪽 단어 하나 ('좌석' 앞 좌석 번호)
+DEFAULT_RULES = {'row': ['번호'], 'right': ['2025년'], 'left': ['좌석']}
+ROW_TOLERANCE = {'row': 10, 'right': 20, 'left': 20}
+GRAY = (128, 128, 128)
+OCR_CACHE_PATH = Path(os.getenv('OCR_CACHE_PATH', 'ocr_cache.json'))
+
+
+# ──────────────────────────────
+# OCR 백엔드
+# ──────────────────────────────
+class VisionBackend:
+    """Google Cloud Vision text_detection (요청 1번에 여러 장)"""
+
+    BATCH_SIZE = 16  # batch_annotate_images 한 번에 보낼 수 있는 최대 장수
+
+    def __init__(self, language_hints=('ko',), credentials='google.json'):
+        self.credentials = credentials
+        self.language_hints = list(language_hints)
+        self._client = None
+
+    @property
+    def client(self):
+        # 캐시로 전부 해결되면 인증/클라이언트 생성 자체를 하지 않는다
+        if self._client is None:
+            from google.cloud import vision
+            if self.credentials and os.path.exists(self.credentials):
+                os.environ.setdefault('GOOGLE_APPLICATION_CREDENTIALS', self.credentials)
+            self._client = vision.ImageAnnotatorClient()
+        return self._client
+
+    def detect(self, paths):
+        from google.cloud import vision as v
+        results = []
+        for i in range(0, len(paths), self.BATCH_SIZE):
+            batch = paths[i:i + self.BATCH_SIZE]
+            requests = [v.AnnotateImageRequest(
+                image=v.Image(content=Path(p).read_bytes()),
+                features=[v.Feature(type_=v.Feature.Type.TEXT_DETECTION)],
+                image_context=v.ImageContext(language_hints=self.language_hints),
+            ) for p in batch]
+            response = self.client.batch_annotate_images(requests=requests)
+            for path, res in zip(batch, response.responses):
+                if res.error.message:
+                    print(f"❌ OCR 오류: {path} - {res.error.message}")
+                    results.append(None)
+                    continue
+                # 첫 항목은 전체 텍스트, 나머지가 단어
+                results.append([{'text': a.description,
+                                 'poly': [[vertex.x, vertex.y] for vertex in a.bounding_poly.vertices]}
+                                for a in res.text_annotations[1:]])
+        return results
+
+
+class StubBackend:
+    """로컬 대역: 이미지 옆 {이름}.ocr.json 을 OCR 결과로 사용 (없으면 None = 인식 실패)"""
+
+    def __init__(self, language_hints=('ko',), fixtures=None):
+        self.language_hints = list(language_hints)
+        self.fixtures = fixtures or {}
+
+    def detect(self, paths):
+        results = []
+        for p in paths:
+            p = Path(p)
+            if p.name in self.fixtures:
+                results.append(self.fixtures[p.name])
+                continue
+            sidecar = p.with_suffix('.ocr.json')
+            results.append(json.loads(sidecar.read_text(encoding='utf-8')) if sidecar.exists() else None)
+        return results
+
+
+BACKENDS = {'vision': VisionBackend, 'stub': StubBackend}
+
+
+class CachedBackend:
+    """OCR 결과 캐시 (이미지 내용 해시 + 백엔드 + 언어 힌트 기준)
+
+    마스킹 규칙/강도/여백만 바꿔 다시 돌릴 때는 OCR 요청 없이 로컬에서 끝난다.
+    실패(None)나 빈 결과는 저장하지 않는다 — 일시 오류가 캐시에 남으면 같은 캡처가
+    다음 실행에서도 가려지지 않은 채 나가기 때문에, 단어가 잡힌 결과만 재사용한다.
+    """
+
+    def __init__(self, backend, path=None):
+        self.backend = backend
+        self.path = Path(path or OCR_CACHE_PATH)
+        self.cache = {}
+        if self.path.exists():
+            try:
+                self.cache = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def key(self, path):
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        hints = ','.join(getattr(self.backend, 'language_hints', []))
+        return f"{digest}:{type(self.backend).__name__}:{hints}"
+
+    def detect(self, paths):
+        keys = [self.key(p) for p in paths]
+        missing = [(p, k) for p, k in zip(paths, keys) if k not in self.cache]
+        self.stats['hits'] += len(paths) - len(missing)
+        self.stats['misses'] += len(missing)
+        fresh = {}
+        if missing:
+            for (_, k), words in zip(missing, self.backend.detect([p for p, _ in missing])):
+                fresh[k] = words
+                if words:
+                    self.cache[k] = words
+            if any(fresh.values()):
+                self.save()
+        return [self.cache[k] if k in self.cache else fresh.get(k) for k in keys]
+
+    def save(self):
+        tmp = self.path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(self.cache, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+    def hit_rate(self):
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+
+# ──────────────────────────────
+# 가릴 영역 계산
+# ──────────────────────────────
+def select_boxes(words, rules=None, pad=1):
+    """OCR 단어 목록 → 가릴 박스 (N, 4) 배열 [x1, y1, x2, y2]"""
+    rules = DEFAULT_RULES if rules is None else rules
+    words = [w for w in words if len(w.get('poly') or []) >= 3]
+    if not words:
+        return np.zeros((0, 4), dtype=np.int64)
+
+    texts = [w['text'] for w in words]
+    polys = [np.asarray(w['poly'], dtype=np.float64) for w in words]
+    lo = np.array([p.min(axis=0) for p in polys])
+    hi = np.array([p.max(axis=0) for p in polys])
+    cx, cy = np.array([p.mean(axis=0) for p in polys]).T
+    order = np.arange(len(words))
+
+    boxes = []
+    for kind, targets in rules.items():
+        tol = ROW_TOLERANCE[kind]
+        for target in targets:
+            hits = np.array([target in t for t in texts])
+            for i in np.flatnonzero(hits):
+                same_row = np.abs(cy - cy[i]) < tol
+                if kind == 'row':
+                    sel = same_row & ~hits
+                elif kind == 'right':
+                    sel = same_row & (cx > cx[i])
+                else:
+                    # 읽는 순서상 앞에 있는 같은 줄 왼쪽 단어 중 가장 가까운 것 하나
+                    left = np.flatnonzero(same_row & (cx < cx[i]) & (order < i))
+                    sel = np.zeros(len(words), dtype=bool)
+                    if len(left):
+                        sel[left[-1]] = True
+                if sel.any():
+                    boxes.append([*(lo[sel].min(axis=0) - pad), *(hi[sel].max(axis=0) + pad)])
+    if not boxes:
+        return np.zeros((0, 4), dtype=np.int64)
+    return np.rint(np.array(boxes)).astype(np.int64)
+
+
+# ──────────────────────────────
+# 마스킹
+# ──────────────────────────────
+def box_mask(boxes, height, width):
+    """박스 목록 → (H, W) bool 마스크 (행/열 지시 행렬의 곱 한 번)"""
+    if len(boxes) == 0:
+        return np.zeros((height, width), dtype=bool)
+    x1, y1, x2, y2 = (np.clip(boxes[:, k], 0, lim) for k, lim in zip(range(4), (width, height, width, height)))
+    rows = (np.arange(height)[None, :] >= y1[:, None]) & (np.arange(height)[None, :] < y2[:, None])
+    cols = (np.arange(width)[None, :] >= x1[:, None]) & (np.arange(width)[None, :] < x2[:, None])
+    return (rows.T.astype(np.float32) @ cols.astype(np.float32)) > 0
+
+
+def pixelate(pixels, block):
+    """이미지 전체를 block x block 평균으로 픽셀화"""
+    h, w, c = pixels.shape
+    ph, pw = -h % block, -w % block
+    padded = np.pad(pixels, ((0, ph), (0, pw), (0, 0)), mode='edge').astype(np.float32)
+    H, W = padded.shape[0] // block, padded.shape[1] // block
+    means = padded.reshape(H, block, W, block, c).mean(axis=(1, 3))
+    return np.repeat(np.repeat(means, block, axis=0), block, axis=1)[:h, :w].astype(pixels.dtype)
+
+
+def apply_mask(pixels, boxes, mode='fill', intensity=15):
+    """모든 박스를 한 번에 가리기 (mode: 'fill' 회색 / 'mosaic' 픽셀화)"""
+    mask = box_mask(boxes, *pixels.shape[:2])
+    if not mask.any():
+        return pixels
+    cover = pixelate(pixels, max(2, intensity)) if mode == 'mosaic' else np.array(GRAY, dtype=pixels.dtype)
+    return np.where(mask[..., None], cover, pixels)
+
+
+def mask_image(src, words, out, rules=None, mode='fill', intensity=15, margin=1):
+    """이미지 1장 처리 (프로세스 풀 작업 단위) → 가린 박스 수"""
+    from PIL import Image
+    with Image.open(src) as im:
+        pixels = np.asarray(im.convert('RGB'))
+    boxes = select_boxes(words, rules, margin)
+    Image.fromarray(apply_mask(pixels, boxes, mode, intensity)).save(out)
+    return len(boxes)
+
+
+def list_images(directory):
+    return sorted(p for p in Path(directory).iterdir()
+                  if p.suffix.lower() in IMAGE_EXTS and not p.stem.endswith(OUTPUT_SUFFIX)
+                  and not p.stem.endswith('_mosaic'))
+
+
+def process_directory(directory, out_dir=None, backend=None, rules=None, mode='fill',
+                      intensity=15, margin=1, workers=None):
+    """디렉터리 전체 마스킹 → 통계 dict"""
+    paths = list_images(directory)
+    out_dir = Path(out_dir or Path(directory) / 'masked')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    backend = backend or StubBackend()
+    if not paths:
+        print(f"📭 이미지 없음: {directory}")
+        return {'images': 0}
+
+    start = time.perf_counter()
+    annotations = backend.detect([str(p) for p in paths])
+    ocr_seconds = time.perf_counter() - start
+
+    # OCR 이 실패한 이미지는 가릴 위치를 모르므로 결과 파일을 만들지 않는다 (원본 그대로 나가지 않도록)
+    failed = [p for p, words in zip(paths, annotations) if words is None]
+    for p in failed:
+        print(f"⚠️ OCR 실패로 마스킹 생략 (출력 없음): {p.name}")
+    done = [(p, words) for p, words in zip(paths, annotations) if words is not None]
+    outs = [str(out_dir / f"{p.stem}{OUTPUT_SUFFIX}.png") for p, _ in done]
+    n = len(done)
+    args = ([str(p) for p, _ in done], [words for _, words in done], outs,
+            [rules] * n, [mode] * n, [intensity] * n, [margin] * n)
+    mask_start = time.perf_counter()
+    if n <= 1 or workers == 1:
+        counts = list(map(mask_image, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(mask_image, *args))
+    mask_seconds = time.perf_counter() - mask_start
+    total = time.perf_counter() - start
+
+    for (p, _), out, c in zip(done, outs, counts):
+        print(f"🖍️ {p.name}: 박스 {c}개 → {out}")
+    n = len(paths)
+    stats = {'images': n, 'masked': len(done), 'ocr_failed': len(failed), 'boxes': sum(counts),
+             'ocr_seconds': round(ocr_seconds, 3),
+             'mask_seconds': round(mask_seconds, 3), 'images_per_sec': round(n / total, 2) if total else None}
+    print(f"⚡ {n}장 {total:.2f}s ({stats['images_per_sec']}장/초) | OCR {ocr_seconds:.2f}s, 마스킹 {mask_seconds:.2f}s")
+    if isinstance(backend, CachedBackend):
+        stats['ocr_cache'] = dict(backend.stats, hit_rate=round(backend.hit_rate(), 3))
+        print(f"🗂️ OCR 캐시: 적중 {backend.stats['hits']} / 요청 {backend.stats['misses']} "
+              f"(적중률 {backend.hit_rate():.0%})")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='예매 인증 캡처 일괄 마스킹')
+    parser.add_argument('directory', nargs='?', default='proof')
+    parser.add_argument('--out', type=Path)
+    parser.add_argument('--backend', choices=list(BACKENDS), default='vision')
+    parser.add_argument('--lang', nargs='+', default=['ko'], help='OCR 언어 힌트')
+    parser.add_argument('--mode', choices=['fill', 'mosaic'], default='fill')
+    parser.add_argument('--intensity', type=int, default=15, help='모자이크 블록 크기(px)')
+    parser.add_argument('--margin', type=int, default=1, help='박스 여백(px)')
+    parser.add_argument('--row', nargs='*', default=DEFAULT_RULES['row'], help='줄 전체를 가릴 기준 단어')
+    parser.add_argument('--right', nargs='*', default=DEFAULT_RULES['right'], help='오른쪽을 가릴 기준 단어')
+    parser.add_argument('--left', nargs='*', default=DEFAULT_RULES['left'], help='왼쪽 한 단어를 가릴 기준 단어')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--no-cache', action='store_true', help='OCR 결과 캐시 사용 안 함')
+    args = parser.parse_args(argv)
+
+    backend = BACKENDS[args.backend](language_hints=args.lang)
+    if not args.no_cache:
+        backend = CachedBackend(backend)
+    rules = {'row': args.row, 'right': args.right, 'left': args.left}
+    stats = process_directory(args.directory, args.out, backend, rules, args.mode, args.intensity, args.margin,
+                              args.workers)
+    return 1 if stats.get('ocr_failed') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
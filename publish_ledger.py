@@ -0,0 +1,89 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+# ──────────────────────────────
+# 게시 장부 (공지 × 채널)
+# ──────────────────────────────
+# 하루 네 번 도는 스케줄 실행이 같은 공지를 다시 올리지 않도록
+# (채널, 공지) 마다 상태 / 원격 ID / 게시 내용 해시를 남긴다.
+# 새 공지이거나, 이전 게시가 실패했거나, 게시 내용이 바뀐 경우에만 다시 처리한다.
+# 내용이 바뀐 공지는 remote_id 의 기존 상품을 수정하고 (중복 상품을 새로 올리지 않음),
+# 같은 내용으로 MAX_ATTEMPTS 번 연속 실패하면 내용이 바뀔 때까지 더 시도하지 않는다.
+# attempts 는 현재 content_hash 기준 시도 횟수, 원격 ID 가 바뀌면 이전 값은 previous_ids 에 남는다.
+#
+# publish_ledger.json
+#   {"bunjang:25008903": {"status": "posted", "remote_id": "3301...", "content_hash": "...",
+#                         "attempts": 1, "updated_at": "2025-07-26 09:16:02"}}
+
+LEDGER_PATH = Path(os.getenv('PUBLISH_LEDGER_PATH', 'publish_ledger.json'))
+MAX_ATTEMPTS = 3
+
+
+def content_hash(*parts):
+    """게시 내용(제목/본문/태그/이미지/가격 등) 해시"""
+    raw = json.dumps([str(p) for p in parts], ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def notice_id(row):
+    """공지 식별자: 예매코드, 없으면 제목"""
+    return str(row.get('예매코드') or row.get('제목') or '')
+
+
+class PublishLedger:
+    MAX_ATTEMPTS = MAX_ATTEMPTS
+
+    def __init__(self, path=None):
+        self.path = Path(path or LEDGER_PATH)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+
+    @staticmethod
+    def key(notice, channel):
+        return f"{channel}:{notice}"
+
+    def get(self, notice, channel):
+        return self.entries.get(self.key(notice, channel))
+
+    def remote_id(self, notice, channel):
+        """이미 올라간 원격 상품 ID (없으면 None)"""
+        return (self.get(notice, channel) or {}).get('remote_id')
+
+    def gave_up(self, notice, channel, digest):
+        """같은 내용으로 MAX_ATTEMPTS 번 연속 실패했는지"""
+        entry = self.get(notice, channel)
+        return (entry is not None and entry.get('status') != 'posted' and entry.get('content_hash') == digest
+                and entry.get('attempts', 0) >= self.MAX_ATTEMPTS)
+
+    def needs_publish(self, notice, channel, digest):
+        entry = self.get(notice, channel)
+        if entry is None or entry.get('content_hash') != digest:
+            return True
+        return entry.get('status') != 'posted' and not self.gave_up(notice, channel, digest)
+
+    def record(self, notice, channel, digest, status, remote_id=None):
+        entry = self.entries.setdefault(self.key(notice, channel), {'attempts': 0})
+        attempts = entry.get('attempts', 0) if entry.get('content_hash') == digest else 0
+        previous = entry.get('remote_id')
+        if remote_id is not None and previous is not None and str(remote_id) != str(previous):
+            entry.setdefault('previous_ids', []).append(previous)
+        entry.update({
+            'status': status,
+            'remote_id': remote_id if remote_id is not None else previous,
+            'content_hash': digest,
+            'attempts': attempts + 1,
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        })
+        return entry
+
+    def save(self):
+        tmp = self.path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(self.entries, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp, self.path)
@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+import sqlite3
+from pathlib import Path
+
+from metrics import incr, current_run
+from cassette import is_replaying
+
+# ──────────────────────────────
+# 프로세스 공용 API 한도 관리 (SQLite 토큰 버킷)
+# ──────────────────────────────
+# bunjang.py 스케줄러, telegram.py cron, 노트북이 같은 OpenAI / 구글시트 / 텔레그램
+# 한도를 나눠 쓴다. 호출 전에 acquire() 로 버킷에서 차감하고, 모자라면 찰 때까지
+# 기다리거나(block) 바로 False 를 돌려준다(try_acquire).
+# 버킷 상태는 quota.db 한 파일에 있고 BEGIN IMMEDIATE 로 잠그므로 여러 프로세스가 함께 써도 된다.
+#
+# python quota.py    제공자별 최근 1시간 사용률
+
+DB_PATH = Path(os.getenv('QUOTA_DB', 'quota.db'))
+
+# 제공자 → 종류 → (분당 보충량, 최대 적립량)
+LIMITS = {
+    'openai': {'requests': (500, 500), 'tokens': (30000, 30000)},
+    'sheets': {'requests': (60, 60)},
+    'telegram': {'requests': (20, 20)},   # 같은 그룹 채팅 기준
+}
+MAX_WAIT = 120           # block 모드 최대 대기(초)
+USAGE_RETENTION = 86400  # 사용 기록 보관 기간(초)
+REPORT_WINDOW = 3600
+
+
+def _connect(path=None):
+    conn = sqlite3.connect(str(path or DB_PATH), timeout=30, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS buckets (provider TEXT, kind TEXT, level REAL, updated REAL,"
+                 " PRIMARY KEY (provider, kind))")
+    conn.execute("CREATE TABLE IF NOT EXISTS usage (ts REAL, provider TEXT, kind TEXT, amount REAL, waited REAL, pid INTEGER)")
+    return conn
+
+
+def _refill(conn, provider, kind, now):
+    rate, burst = LIMITS[provider][kind]
+    row = conn.execute("SELECT level, updated FROM buckets WHERE provider=? AND kind=?", (provider, kind)).fetchone()
+    level = burst if row is None else min(burst, row[0] + (now - row[1]) * rate / 60)
+    return level, rate
+
+
+def _take(conn, provider, amounts, now, waited, force=False):
+    """한 트랜잭션 안에서 모든 종류를 확인하고 차감 → 부족하면 (False, 기다릴 초)"""
+    levels, wait = {}, 0.0
+    for kind, amount in amounts.items():
+        level, rate = _refill(conn, provider, kind, now)
+        levels[kind] = level
+        if level < amount and not force:
+            wait = max(wait, (amount - level) * 60 / rate)
+    if wait > 0:
+        return False, wait
+    for i, (kind, amount) in enumerate(amounts.items()):
+        conn.execute("INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", (provider, kind, levels[kind] - amount, now))
+        # 대기 시간은 호출 1번에 한 번만 기록
+        conn.execute("INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?)",
+                     (now, provider, kind, amount, waited if i == 0 else 0.0, os.getpid()))
+    return True, 0.0
+
+
+def acquire(provider, requests=1, tokens=0, block=True, max_wait=MAX_WAIT, path=None):
+    """provider 한도에서 요청 수/토큰 차감 (block=False 면 모자랄 때 바로 False)"""
+    if provider not in LIMITS or is_replaying():
+        return True
+    amounts = {k: v for k, v in (('requests', requests), ('tokens', tokens)) if v and k in LIMITS[provider]}
+    # 한 번에 최대 적립량보다 많이 요구하면 영원히 못 채우므로 최대치로 자른다
+    amounts = {k: min(v, LIMITS[provider][k][1]) for k, v in amounts.items()}
+    start = time.monotonic()
+    conn = _connect(path)
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                waited = time.monotonic() - start
+                ok, wait = _take(conn, provider, amounts, time.time(), waited)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if ok:
+                if waited:
+                    incr('quota_wait_seconds', round(waited, 3), provider=provider)
+                return True
+            if not block or waited + wait > max_wait:
+                incr('quota_denied', provider=provider)
+                return False
+            time.sleep(min(wait, 5))
+    finally:
+        conn.close()
+
+
+def try_acquire(provider, requests=1, tokens=0, path=None):
+    return acquire(provider, requests, tokens, block=False, path=path)
+
+
+def consume(provider, tokens, path=None):
+    """호출 후 실제 토큰 수와 예상치의 차이 반영 (기다리지 않음, 음수면 돌려받음)"""
+    if provider not in LIMITS or 'tokens' not in LIMITS[provider] or not tokens or is_replaying():
+        return
+    conn = _connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _take(conn, provider, {'tokens': tokens}, time.time(), 0.0, force=True)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+def estimate_tokens(prompt, completion=64):
+    """호출 전 토큰 예상치 (한글은 대략 글자당 1토큰, 응답 몫 포함)"""
+    return len(prompt) + completion
+
+
+def utilization(window=REPORT_WINDOW, path=None):
+    """최근 window 초 동안 제공자/종류별 사용량과 한도 대비 비율"""
+    conn = _connect(path)
+    try:
+        now = time.time()
+        conn.execute("DELETE FROM usage WHERE ts < ?", (now - USAGE_RETENTION,))
+        rows = conn.execute("SELECT provider, kind, SUM(amount), SUM(waited), COUNT(DISTINCT pid) FROM usage"
+                            " WHERE ts >= ? GROUP BY provider, kind", (now - window,)).fetchall()
+    finally:
+        conn.close()
+    report = {}
+    for provider, kind, used, waited, procs in rows:
+        if provider not in LIMITS or kind not in LIMITS[provider]:
+            continue
+        capacity = LIMITS[provider][kind][0] * window / 60
+        report.setdefault(provider, {})[kind] = {
+            'used': round(used, 1), 'capacity': capacity, 'utilization': round(used / capacity, 4),
+            'waited_seconds': round(waited or 0, 2), 'processes': procs,
+        }
+    return report
+
+
+def attach_report(window=REPORT_WINDOW):
+    """현재 실행 리포트(runs/*.json)에 사용률 추가"""
+    try:
+        current_run().extra['quota'] = utilization(window)
+    except sqlite3.Error as e:
+        print(f"⚠️ 한도 사용률 조회 실패: {e}")
+
+
+def print_report(report):
+    if not report:
+        print("📭 최근 사용 기록 없음")
+    for provider, kinds in report.items():
+        for kind, r in kinds.items():
+            print(f"🚦 {provider:<9} {kind:<8} {r['used']:>9.0f} / {r['capacity']:>9.0f} "
+                  f"({r['utilization']:.1%}, 대기 {r['waited_seconds']}s, 프로세스 {r['processes']}개)")
+
+
+if __name__ == "__main__":
+    window = int(sys.argv[1]) if len(sys.argv) > 1 else REPORT_WINDOW
+    print_report(utilization(window))
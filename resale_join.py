@@ -0,0 +1,122 @@
+import re
+import json
+from pathlib import Path
+
+import pandas as pd
+
+# ──────────────────────────────
+# 인터파크 오픈공지 ↔ 티켓베이 리셀 공연 매칭
+# ──────────────────────────────
+# 1) 티켓베이 스냅샷을 공연(depth3_id) 단위로 집계
+# 2) 아티스트/공연명 토큰 → 공연 ID 역색인 (blocking)
+# 3) 공지 제목 + artist_cache.json 의 아티스트명 토큰으로 후보 공연만 조회
+# 4) 토큰 유사도 + 공연일 근접도로 점수를 매겨 최고점 공연을 연결
+
+ARTIST_CACHE_PATH = Path('artist_cache.json')
+
+STOPWORDS = {
+    '콘서트', '내한공연', '내한', '공연', '뮤지컬', '연극', '투어', '단독', '팬미팅', '앵콜', '서울', '부산', '대구',
+    '광주', '대전', '인천', '수원', 'concert', 'tour', 'live', 'in', 'the', 'world', 'asia', 'fan', 'meeting',
+}
+
+MIN_SCORE = 0.3
+# 오픈일 기준 공연일 허용 범위 (일)
+DATE_WINDOW = (-30, 240)
+
+
+def tokenize(text):
+    """한글/영문/숫자 토큰 추출 (연도, 불용어 제외)"""
+    if not isinstance(text, str):
+        return set()
+    tokens = re.findall(r'[0-9a-z]+|[가-힣]+', text.lower())
+    return {t for t in tokens if t not in STOPWORDS and not t.isdigit() and len(t) > 1}
+
+
+def load_artist_cache(path=ARTIST_CACHE_PATH):
+    if Path(path).exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            pass
+    return {}
+
+
+def summarize_events(ticketbay_df):
+    """티켓베이 매물 → 공연 단위 집계 (매물 수, 가격, 정가 대비 프리미엄)"""
+    df = ticketbay_df.copy()
+    df['perform_dt'] = pd.to_datetime(df['start_perform_date'], errors='coerce')
+    face = df['list_price'].where(df['list_price'] > 0)
+    df['premium'] = df['price'] / face - 1
+    events = df.groupby('depth3_id').agg(
+        artist=('depth2_name', 'first'),
+        event=('depth3_name', 'first'),
+        perform_dt=('perform_dt', 'min'),
+        listings=('id', 'size'),
+        tickets=('sale_quantity', 'sum'),
+        median_price=('price', 'median'),
+        premium=('premium', 'median'),
+    ).reset_index()
+    return events
+
+
+class ResaleIndex:
+    """토큰 역색인 기반 공지 ↔ 리셀 공연 매칭기"""
+
+    def __init__(self, ticketbay_df):
+        self.events = summarize_events(ticketbay_df)
+        self.tokens = [tokenize(a) | tokenize(e) for a, e in zip(self.events['artist'], self.events['event'])]
+        self.inverted = {}
+        for i, tokens in enumerate(self.tokens):
+            for t in tokens:
+                self.inverted.setdefault(t, []).append(i)
+
+    def candidates(self, tokens):
+        found = set()
+        for t in tokens:
+            found.update(self.inverted.get(t, []))
+        return found
+
+    def match(self, title, artist, open_dt):
+        """공지 1건에 대응하는 공연 행 번호와 점수 반환 (없으면 None)"""
+        tokens = tokenize(title) | tokenize(artist)
+        best, best_score = None, MIN_SCORE
+        for i in self.candidates(tokens):
+            overlap = len(tokens & self.tokens[i]) / len(tokens | self.tokens[i])
+            perform_dt = self.events.at[i, 'perform_dt']
+            if pd.notna(open_dt) and pd.notna(perform_dt):
+                days = (perform_dt - open_dt).days
+                if not DATE_WINDOW[0] <= days <= DATE_WINDOW[1]:
+                    continue
+                # 오픈일과 가까운 공연일수록 가산점
+                overlap += 0.2 * (1 - min(abs(days), DATE_WINDOW[1]) / DATE_WINDOW[1])
+            if overlap > best_score:
+                best, best_score = i, overlap
+        return best, best_score
+
+    def join(self, df, title_col='제목', artist_col='가수명', time_col='오픈시간'):
+        """핫 공지 DataFrame 에 리셀 컬럼 추가"""
+        artist_cache = load_artist_cache() if artist_col not in df.columns else {}
+        artists = df[artist_col] if artist_col in df.columns else df[title_col].map(lambda t: artist_cache.get(t, ''))
+        open_times = pd.to_datetime(df[time_col], errors='coerce')
+
+        matched = [self.match(t, a, o) for t, a, o in zip(df[title_col], artists, open_times)]
+        rows = [i for i, _ in matched]
+        linked = self.events.reindex([-1 if i is None else i for i in rows]).reset_index(drop=True)
+
+        df = df.copy()
+        df['리셀공연'] = linked['event'].fillna('').values
+        df['리셀매물수'] = linked['listings'].fillna(0).astype(int).values
+        df['리셀중앙가'] = linked['median_price'].fillna(0).astype(int).values
+        df['리셀프리미엄'] = linked['premium'].map(lambda p: f"{p:+.0%}" if pd.notna(p) else '').values
+        print(f"🔗 리셀 매칭: {sum(i is not None for i in rows)}/{len(df)}건")
+        return df
+
+
+def add_resale_columns(df, snapshot_path=None):
+    """최신 티켓베이 스냅샷으로 핫 공지에 리셀 컬럼 추가"""
+    from price_alert import latest_snapshot
+    path = snapshot_path or latest_snapshot()
+    if path is None or df.empty:
+        return df
+    return ResaleIndex(pd.read_csv(path)).join(df)
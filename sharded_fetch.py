@@ -0,0 +1,164 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from metrics import record_http
+from cassette import is_replaying
+
+# ──────────────────────────────
+# 인터파크 오픈공지 페이지 순회 수집 (offset 병렬 + 선택적 장르 × 지역 샤드)
+# ──────────────────────────────
+# ALL/ALL 로 한 번만 요청하면 OPEN_ASC 기준 앞쪽 pageSize 건만 보인다.
+# 기본은 ALL/ALL 하나를 offset 을 늘려가며 마지막(짧은) 페이지까지 읽는다. 장르/지역 코드를
+# 추측할 필요가 없고, 페이지는 MAX_WORKERS 개씩 묶어 병렬로 요청한다.
+# 실서버에서 확인한 장르/지역 코드가 있으면 genres / regions 로 넘겨 샤드로 나눌 수 있다
+# (틀린 코드는 오류 없이 빈 목록이라, 그때는 ALL/ALL 첫 페이지와 대조하고 빈 샤드를 알린다).
+# 결과는 goodsCode(없으면 제목) 기준으로 합친다.
+#
+# python sharded_fetch.py [장르 ...]    샤드별 건수 / 빈 샤드 출력 (코드 점검용, 인자 없으면 ALL)
+
+NOTICE_URL = "https://tickets.interpark.com/contents/api/open-notice/notice-list"
+HEADERS = {"user-agent": "Mozilla/5.0", "referer": "https://tickets.interpark.com/contents/notice"}
+
+# 공개 문서가 없는 비공식 API 라 검증된 장르/지역 코드가 없다 → 기본은 전체(ALL) 하나
+GENRES = ['ALL']
+REGIONS = ['ALL']
+
+PAGE_SIZE = 400
+MAX_PAGES = 20
+MAX_WORKERS = 4
+MIN_INTERVAL = 0.2       # 요청 간 최소 간격(초), 모든 스레드 공통
+
+
+class Throttle:
+    """스레드 공용 요청 간격 제한"""
+
+    def __init__(self, min_interval=None):
+        self.min_interval = MIN_INTERVAL if min_interval is None else min_interval
+        if is_replaying():
+            # 녹화본 재생 중에는 서버 부담이 없으므로 간격을 두지 않는다
+            self.min_interval = 0
+        self.lock = threading.Lock()
+        self.last = 0.0
+
+    def wait(self):
+        with self.lock:
+            delay = self.last + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.last = time.monotonic()
+
+
+def notice_key(d):
+    return d.get('goodsCode') or d.get('title', '')
+
+
+def fetch_page(genre, region, offset, page_size=PAGE_SIZE, url=NOTICE_URL, session=requests):
+    params = {"goodsGenre": genre, "goodsRegion": region, "offset": offset, "pageSize": page_size, "sorting": "OPEN_ASC"}
+    r = session.get(url, params=params, headers=HEADERS, timeout=10)
+    record_http('interpark', r)
+    r.raise_for_status()
+    return r.json()
+
+
+def fetch_shard(genre, region, throttle, page_size=PAGE_SIZE, url=NOTICE_URL, workers=1):
+    """샤드 1개를 마지막 페이지까지 순회 (workers 개 페이지씩 병렬)"""
+    def load(offset):
+        throttle.wait()
+        return fetch_page(genre, region, offset, page_size, url)
+
+    rows, pages = [], 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pages < MAX_PAGES:
+            batch = range(pages, min(pages + workers, MAX_PAGES))
+            for page in executor.map(load, [i * page_size for i in batch]):
+                rows.extend(page)
+                pages += 1
+                if len(page) < page_size:
+                    return rows, pages, True
+    # MAX_PAGES 까지 읽었는데도 꽉 찬 페이지면 누락 가능성 있음
+    return rows, pages, False
+
+
+def fetch_all_notices(genres=GENRES, regions=REGIONS, page_size=PAGE_SIZE, max_workers=MAX_WORKERS, url=NOTICE_URL):
+    """모든 샤드 수집 → (중복 제거된 공지 목록, 커버리지 통계)"""
+    throttle = Throttle()
+    shards = [(g, r) for g in genres for r in regions]
+    # 샤드가 하나(ALL/ALL)면 페이지를 병렬로, 여럿이면 샤드를 병렬로
+    page_workers = max_workers if len(shards) == 1 else 1
+    merged, stats = {}, {'shards': len(shards), 'complete': 0, 'truncated': [], 'failed': [], 'empty': [],
+                         'counts': {}, 'pages': 0, 'raw': 0}
+
+    with ThreadPoolExecutor(max_workers=max_workers if len(shards) > 1 else 1) as executor:
+        futures = {executor.submit(fetch_shard, g, r, throttle, page_size, url, page_workers): (g, r)
+                   for g, r in shards}
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                rows, pages, complete = future.result()
+            except Exception as e:
+                print(f"❌ 샤드 {shard[0]}/{shard[1]} 오류: {e}")
+                stats['failed'].append(shard)
+                continue
+            stats['pages'] += pages
+            stats['raw'] += len(rows)
+            stats['counts'][f"{shard[0]}/{shard[1]}"] = len(rows)
+            if not rows:
+                stats['empty'].append(shard)
+            if complete:
+                stats['complete'] += 1
+            else:
+                stats['truncated'].append(shard)
+            for d in rows:
+                merged.setdefault(notice_key(d), d)
+
+    # 코드로 나눈 경우에만: 샤드 분할이 빠뜨린 공지가 없는지 ALL/ALL 첫 페이지와 대조
+    if shards != [('ALL', 'ALL')]:
+        try:
+            throttle.wait()
+            baseline = fetch_page('ALL', 'ALL', 0, page_size, url)
+            missing = [d for d in baseline if notice_key(d) not in merged]
+            for d in missing:
+                merged[notice_key(d)] = d
+            stats['baseline'] = len(baseline)
+            stats['baseline_missing'] = len(missing)
+            stats['missing_genres'] = sorted({d.get('goodsGenreStr', '') for d in missing})
+        except Exception as e:
+            print(f"⚠️ 기준 페이지 조회 실패: {e}")
+
+    # 지역 전부가 빈 장르는 코드가 틀렸을 가능성이 크다
+    failed, empty = set(stats['failed']), set(stats['empty'])
+    stats['empty_genres'] = [g for g in genres if g != 'ALL'
+                             and all((g, r) in empty | failed for r in regions)
+                             and not all((g, r) in failed for r in regions)]
+    notices = sorted(merged.values(), key=lambda d: d.get('openDateStr') or '9999')
+    stats['unique'] = len(notices)
+    stats['duplicates'] = stats['raw'] - len(notices) + stats.get('baseline_missing', 0)
+    print_coverage(stats)
+    return notices, stats
+
+
+def print_coverage(stats):
+    print(f"📊 샤드 {stats['complete']}/{stats['shards']} 완료 | 페이지 {stats['pages']} | "
+          f"원본 {stats['raw']}건 → 고유 {stats['unique']}건 (중복 {stats['duplicates']}건)")
+    if 'baseline' in stats:
+        print(f"📊 ALL 기준 페이지 {stats['baseline']}건 중 샤드 누락 {stats['baseline_missing']}건")
+        if stats['baseline_missing']:
+            print(f"⚠️ 샤드에서 빠진 공지의 장르: {stats['missing_genres']} → 장르/지역 코드 확인 필요")
+    if stats['empty']:
+        print(f"ℹ️ 빈 샤드 {len(stats['empty'])}/{stats['shards']}개")
+    if stats.get('empty_genres'):
+        print(f"⚠️ 모든 지역이 빈 장르: {stats['empty_genres']} → 코드가 틀렸을 수 있음")
+    if stats['truncated']:
+        print(f"⚠️ 페이지 한도 도달 샤드: {stats['truncated']}")
+    if stats['failed']:
+        print(f"⚠️ 실패 샤드: {stats['failed']} → 목록이 불완전할 수 있음")
+
+
+if __name__ == "__main__":
+    import sys
+    _, stats = fetch_all_notices(genres=sys.argv[1:] or GENRES)
+    for shard, count in sorted(stats['counts'].items(), key=lambda kv: -kv[1]):
+        print(f"   {shard:<24} {count:>5}건")
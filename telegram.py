@@ -1,10 +1,14 @@
 import os
+import html
 import requests
 import json
 import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import pytz
+from sharded_fetch import fetch_all_notices
+from metrics import span, record_http, start_run, finish_run
+from quota import acquire, attach_report
 
 
 # .env 파일 로드
@@ -14,48 +18,48 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 ADMIN_CHAT_ID = os.getenv('ADMIN_CHAT_ID')
 
+# 텔레그램 메시지 길이 제한 (4096자)
+MAX_MESSAGE_LENGTH = 4000
+
+def split_message(text, limit=MAX_MESSAGE_LENGTH):
+    """긴 메시지를 줄 단위로 나누기"""
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        if current and len(current) + len(line) + 1 > limit:
+            chunks.append(current)
+            current = ""
+        current += line + "\n"
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
 def send_message(chat_id, text):
-    """텔레그램 메시지 전송 함수"""
+    """텔레그램 메시지 전송 함수 (길면 나눠서 전송)"""
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {
-        "chat_id": chat_id,
-        "text": text,
-        "parse_mode": "HTML"
-    }
-    response = requests.post(url, data=data)
-    return response.json()
+    result = {}
+    for chunk in split_message(text):
+        data = {
+            "chat_id": chat_id,
+            "text": chunk,
+            "parse_mode": "HTML"
+        }
+        # 다른 작업과 같은 봇 한도를 나눠 쓴다 (못 받으면 전송 실패로 돌려준다)
+        if not acquire('telegram'):
+            return {'ok': False, 'description': '텔레그램 한도 대기 시간 초과'}
+        with span('telegram_send'):
+            response = requests.post(url, data=data)
+        record_http('telegram', response)
+        result = response.json()
+        if not result.get('ok'):
+            break
+    return result
 
 def create_ticket_message():
     """티켓 정보를 메시지로 변환"""
     
-    url = "https://tickets.interpark.com/contents/api/open-notice/notice-list"
-
-    params = {
-        "goodsGenre": "ALL",
-        "goodsRegion": "ALL",
-        "offset": 0,
-        "pageSize": 50,
-        "sorting": "OPEN_ASC"
-    }
-
-    headers = {
-        "host": "tickets.interpark.com",
-        "sec-ch-ua-platform": "Windows",
-        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
-        "accept": "application/json, text/plain, */*",
-        "sec-ch-ua": "\"Chromium\";v=\"134\", \"Not:A-Brand\";v=\"24\", \"Google Chrome\";v=\"134\"",
-        "sec-ch-ua-mobile": "?0",
-        "sec-fetch-site": "same-origin",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-dest": "empty",
-        "referer": "https://tickets.interpark.com/contents/notice",
-        "accept-encoding": "gzip, deflate, br, zstd",
-        "accept-language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
-    }
-
     try:
-        response = requests.get(url, params=params, headers=headers)
-        data = response.json()
+        # 전체 공지를 페이지 끝까지 수집 (오픈시간 순 정렬됨)
+        data, coverage = fetch_all_notices()
         
         today_date = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y년 %m월 %d일')
         tomorrow = (datetime.now(pytz.timezone('Asia/Seoul')) + timedelta(days=1)).date()
@@ -64,6 +68,8 @@ def create_ticket_message():
         message = f"<b>🎫 {today_date} 티켓 오픈 정보 🎫</b>\n\n"
         
         for ticket in data:
+            if not ticket.get('openDateStr'):
+                continue
             open_time = ticket['openDateStr'][11:16]
             title = ticket['title']
             if len(title) > 40:
@@ -103,23 +109,51 @@ def create_ticket_message():
     
     return message
 
+def format_hot_message(df, limit=30):
+    """핫 공지 DataFrame → 텔레그램 메시지 (오픈시간 / 제목 / 조회수 / 예매코드)"""
+    today_date = datetime.now(pytz.timezone('Asia/Seoul')).strftime('%Y년 %m월 %d일')
+    message = f"<b>🔥 {today_date} HOT 티켓 ({len(df)}개) 🔥</b>\n\n"
+    for row in df.head(limit).to_dict('records'):
+        title = str(row.get('제목', ''))
+        if len(title) > 40:
+            title = title[:40] + "..."
+        # parse_mode=HTML 이라 제목의 <, >, & 는 이스케이프 (자른 뒤에 해야 엔티티가 잘리지 않음)
+        title, code, kind = (html.escape(str(v)) for v in (title, row.get('예매코드', ''), row.get('예매타입', '')))
+        message += f"<b>[{str(row.get('오픈시간', ''))[5:16]}] {title}</b>\n"
+        message += f"👁 조회수: {row.get('조회수', 0)}  |  🎟 예매코드: <code>{code}</code>  |  📌{kind}\n"
+        message += "───────────────────\n"
+    if len(df) > limit:
+        message += f"외 {len(df) - limit}개\n"
+    return message
+
 # 테스트 및 실행
 if __name__ == "__main__":
+    from profiling import enable_from_argv
+    import cassette
+    enable_from_argv('telegram')
+    # --record / --dry-run: HTTP 녹화 / 재생
+    if cassette.enable_from_argv('telegram') and cassette.is_replaying():
+        TELEGRAM_BOT_TOKEN = TELEGRAM_BOT_TOKEN or 'dry-run'
+        ADMIN_CHAT_ID = ADMIN_CHAT_ID or 'dry-run'
     if not TELEGRAM_BOT_TOKEN:
         print("오류: 텔레그램 봇 토큰이 설정되지 않았습니다.")
     elif not ADMIN_CHAT_ID:
         print("오류: 관리자 채팅 ID가 설정되지 않았습니다.")
     else:
         print("인터파크에서 티켓 정보를 가져오는 중...")
-        
-        
-        # 티켓 정보로 메시지 생성
-        message = create_ticket_message()
-        
-        print("텔레그램으로 메시지 전송 중...")
-        result = send_message('-4798861513', message)
-        
-        if result.get('ok'):
-            print("메시지 전송 성공!")
-        else:
-            print(f"메시지 전송 실패: {json.dumps(result, indent=2, ensure_ascii=False)}")
\ No newline at end of file
+        start_run('telegram')
+        try:
+            # 티켓 정보로 메시지 생성
+            with span('fetch'):
+                message = create_ticket_message()
+
+            print("텔레그램으로 메시지 전송 중...")
+            result = send_message('-4798861513', message)
+
+            if result.get('ok'):
+                print("메시지 전송 성공!")
+            else:
+                print(f"메시지 전송 실패: {json.dumps(result, indent=2, ensure_ascii=False)}")
+        finally:
+            attach_report()
+            finish_run()
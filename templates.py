@@ -0,0 +1,123 @@
+import json
+import string
+from pathlib import Path
+
+import pandas as pd
+
+# ──────────────────────────────
+# 홍보 문구 템플릿 엔진
+# ──────────────────────────────
+# tweet_templates.json 의 템플릿을 한 번만 읽어서 (리터럴, 필드) 조각으로 컴파일해 두고,
+# DataFrame 컬럼 단위 문자열 결합으로 전체 행을 한 번에 렌더링한다.
+
+TEMPLATES_PATH = Path('tweet_templates.json')
+
+PLACEHOLDERS = ('title', 'singer', 'open_time', 'hash_tag')
+
+# 템플릿 필드 ← DataFrame 컬럼
+DEFAULT_COLUMNS = {'title': '제목', 'singer': '가수명', 'open_time': '오픈시간표시', 'hash_tag': '해시태그'}
+
+# 코드에 박혀 있던 기본 문구 (트위터 / 번장)
+BUILTIN_TEMPLATES = [
+    {
+        "id": "twitter_default",
+        "category": "twitter",
+        "title": "기본 트위터 문구",
+        "content": "{title}\n\n🚨 {singer} 대리티켓팅(댈티)\n\n수고비 제일 저렴\n경력 매우 많음\n\n상담 링크: https://open.kakao.com/o/sAJ8m2Ah\n\n{hash_tag}"
+    },
+    {
+        "id": "bunjang_default",
+        "category": "bunjang",
+        "title": "기본 번장 문구",
+        "content": "{title}\n\n🚨 {singer} 대리티켓팅(댈티)\n\n수고비 제일 저렴\n경력 매우 많음\n\n가격: 번개톡 상담\n\n{hash_tag}"
+    },
+]
+
+
+class CompiledTemplate:
+    """(리터럴, 필드명) 조각 목록으로 컴파일된 템플릿"""
+
+    def __init__(self, spec):
+        self.id = spec['id']
+        self.category = spec.get('category', '')
+        self.title = spec.get('title', '')
+        self.parts = []
+        try:
+            parsed = list(string.Formatter().parse(spec['content']))
+        except ValueError as e:
+            raise ValueError(f"템플릿 '{self.id}' 형식 오류: {e}")
+        for literal, field, format_spec, conversion in parsed:
+            if field is not None and field not in PLACEHOLDERS:
+                raise ValueError(f"템플릿 '{self.id}' 에 알 수 없는 필드가 있습니다: {{{field}}}")
+            if format_spec or conversion:
+                raise ValueError(f"템플릿 '{self.id}' 은 서식 지정자를 지원하지 않습니다: {{{field}}}")
+            self.parts.append((literal, field))
+        self.fields = {f for _, f in self.parts if f is not None}
+
+    def render(self, values):
+        """values: 필드명 → 문자열 Series, 결과도 Series"""
+        index = next(iter(values.values())).index if values else None
+        result = pd.Series('', index=index, dtype=object)
+        for literal, field in self.parts:
+            if literal:
+                result = result + literal
+            if field is not None:
+                result = result + values[field]
+        return result
+
+
+class TemplateEngine:
+    """템플릿 로딩/검증/렌더링 (경로별로 한 번만 로딩)"""
+
+    _loaded = {}
+
+    def __init__(self, specs):
+        self.templates = {}
+        for spec in specs:
+            template = CompiledTemplate(spec)
+            self.templates[template.id] = template
+
+    @classmethod
+    def load(cls, path=TEMPLATES_PATH):
+        path = Path(path)
+        mtime = path.stat().st_mtime if path.exists() else None
+        cached = cls._loaded.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        specs = list(BUILTIN_TEMPLATES)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                specs += json.load(f)
+        engine = cls(specs)
+        cls._loaded[path] = (mtime, engine)
+        return engine
+
+    def get(self, key):
+        """템플릿 id 또는 카테고리(첫 번째 템플릿)로 조회"""
+        if key in self.templates:
+            return self.templates[key]
+        for template in self.templates.values():
+            if template.category == key:
+                return template
+        raise KeyError(f"템플릿을 찾을 수 없습니다: {key}")
+
+    def _values(self, df, columns):
+        columns = {**DEFAULT_COLUMNS, **(columns or {})}
+        return {f: df[c].fillna('').astype(str) for f, c in columns.items() if c in df.columns}
+
+    def render(self, df, key, columns=None):
+        """모든 행을 같은 템플릿으로 렌더링"""
+        template = self.get(key)
+        values = self._values(df, columns)
+        missing = template.fields - set(values)
+        if missing:
+            raise KeyError(f"템플릿 '{template.id}' 에 필요한 컬럼이 없습니다: {sorted(missing)}")
+        return template.render(values)
+
+    def render_by(self, df, selector, default, columns=None):
+        """행마다 selector(템플릿 id/카테고리) 로 템플릿 선택, 템플릿별로 한 번씩만 렌더링"""
+        keys = pd.Series(selector, index=df.index).fillna(default).replace('', default)
+        result = pd.Series('', index=df.index, dtype=object)
+        for key, rows in keys.groupby(keys).groups.items():
+            result.loc[rows] = self.render(df.loc[rows], key, columns)
+        return result
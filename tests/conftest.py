@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈들이 저장소 최상위에 있으므로 pytest 를 어디서 실행해도 import 되도록
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
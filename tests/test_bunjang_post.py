@@ -0,0 +1,51 @@
+import requests
+from PIL import Image
+
+from bunjang import PostBunjang
+
+
+class Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.text = str(self.payload)
+        self.content = self.text.encode()
+
+    def json(self):
+        return self.payload
+
+
+def fake_http(monkeypatch, put_status):
+    calls = []
+
+    def post(url, **kwargs):
+        calls.append(('POST', url))
+        if 'media-center' in url:
+            return Response(200, {'image_id': 'img1'})
+        return Response(200, {'data': {'pid': 'NEW'}})
+
+    def put(url, **kwargs):
+        calls.append(('PUT', url))
+        return Response(put_status)
+
+    monkeypatch.setattr(requests, 'post', post)
+    monkeypatch.setattr(requests, 'put', put)
+    return calls
+
+
+def register(tmp_path, pid):
+    image = tmp_path / 'poster.jpg'
+    Image.new('RGB', (8, 8)).save(image)
+    return PostBunjang().register_bunjang_product(str(image), '제목', '본문', '#a #b', 9999, pid)
+
+
+def test_existing_product_is_updated(tmp_path, monkeypatch):
+    calls = fake_http(monkeypatch, 200)
+    assert register(tmp_path, 'OLD') == 'OLD'
+    assert [m for m, _ in calls] == ['POST', 'PUT']
+
+
+def test_deleted_product_is_posted_again(tmp_path, monkeypatch):
+    calls = fake_http(monkeypatch, 404)
+    assert register(tmp_path, 'OLD') == 'NEW'
+    assert [m for m, _ in calls] == ['POST', 'PUT', 'POST']
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+import cassette
+import telegram
+import ticketbay
+from bench.standins import StandInServer, StandInState, ticketbay_listings
+
+
+@pytest.fixture
+def listings():
+    df = ticketbay_listings(1)
+    return df[df['category_id'].isin(df['category_id'].unique()[:2])]
+
+
+def test_dry_run_sends_no_alerts_and_saves_no_state(listings, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'ticketbay_log').mkdir()
+    monkeypatch.setattr(ticketbay, 'get_supabase', lambda: (_ for _ in ()).throw(RuntimeError('offline')))
+    sent = []
+    monkeypatch.setattr(telegram, 'send_message', lambda chat_id, text: sent.append(text) or {'ok': True})
+
+    with StandInServer(StandInState([], listings)) as server:
+        # 녹화: 스탠드인 서버 응답을 카세트에 담는다
+        recorder = cassette.enable('ticketbay', 'record', tmp_path / 'cassettes')
+        try:
+            ticketbay.main()
+        finally:
+            recorder.disable()
+        snapshots = list((tmp_path / 'ticketbay_log').glob('*.csv'))
+        recorded_calls, _ = server.state.snapshot()
+
+        # 녹화된 공연 매물에 걸리는 규칙
+        event_id = int(listings['depth3_id'].iloc[0])
+        (tmp_path / 'watch_rules.json').write_text(json.dumps([{'event_id': event_id}]), encoding='utf-8')
+
+        player = cassette.enable('ticketbay', 'replay', tmp_path / 'cassettes')
+        try:
+            df = ticketbay.main()
+        finally:
+            player.disable()
+        replay_calls, _ = server.state.snapshot()
+
+    assert len(df) == len(listings)
+    assert replay_calls == recorded_calls
+    assert sent == []
+    assert not (tmp_path / 'ticketbay_alert_state.json').exists()
+    assert list((tmp_path / 'ticketbay_log').glob('*.csv')) == snapshots
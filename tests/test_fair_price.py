@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from fair_price import FairPriceModel, Z_THRESHOLD
+
+T0 = pd.Timestamp('2025-07-25 20:00:00')
+
+
+def snapshot(n=60, seed=0):
+    """공연 1개, 공연까지 10~40일 남은 매물 (가까울수록 비쌈)"""
+    rng = np.random.default_rng(seed)
+    days = rng.uniform(10, 40, n)
+    grade = rng.choice(['R석', 'S석'], n)
+    log_price = 12 - 0.02 * days - 0.3 * (grade == 'S석') + rng.normal(0, 0.1, n)
+    return pd.DataFrame({
+        'id': np.arange(n), 'depth3_id': 7001, 'grade': grade, 'floor': '1층', 'area': 'A',
+        'seat_number': [f"{r}열" for r in rng.integers(1, 30, n)], 'sale_quantity': rng.integers(1, 4, n),
+        'is_together': 'YES', 'price': np.round(np.exp(log_price), -2),
+        'perform_date': [(T0 + pd.Timedelta(days=d)).strftime('%Y-%m-%d %H:%M:%S') for d in days],
+    })
+
+
+def test_rescoring_unchanged_snapshot_later_is_stable(tmp_path):
+    model = FairPriceModel(tmp_path / 'models.json', tmp_path / 'history.csv.gz')
+    model.ingest(snapshot(), T0)
+    assert model.refit() == 1
+    first = model.score(snapshot(), T0)['price_z']
+
+    refits, later = [], []
+    for offset in (1, 30, 60, 120):
+        observed = T0 + pd.Timedelta(days=offset)
+        model.ingest(snapshot(), observed)
+        refits.append(model.refit())
+        later.append(model.score(snapshot(), observed)['price_z'])
+
+    # 매물·가격이 같아도 남은 일수 범위가 학습 범위와 어긋나면 다시 학습하고, 더 어긋날 게 없으면 그대로
+    assert refits == [0, 1, 1, 0]
+    assert later[2].equals(later[3])
+    for z in later:
+        assert (z.abs() >= Z_THRESHOLD).sum() <= (first.abs() >= Z_THRESHOLD).sum() + 2
+        assert z.abs().max() < 2 * Z_THRESHOLD
+
+
+def test_identical_runs_do_not_refit(tmp_path):
+    small = snapshot(n=10, seed=1).assign(id=lambda d: d['id'] + 1000, depth3_id=7002)
+    no_dates = snapshot(n=40, seed=2).assign(id=lambda d: d['id'] + 2000, depth3_id=7003, perform_date=None)
+    df = pd.concat([snapshot(), small, no_dates], ignore_index=True)
+
+    model = FairPriceModel(tmp_path / 'models.json', tmp_path / 'history.csv.gz')
+    model.ingest(df, T0)
+    assert model.refit() == 3
+    assert {m['kind'] for m in model.models.values()} == {'lstsq', 'bins'}
+    model.save()
+
+    again = FairPriceModel(tmp_path / 'models.json', tmp_path / 'history.csv.gz')
+    again.ingest(df, T0)
+    assert again.refit() == 0
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+import goods_detail
+from bench.standins import StandInServer, StandInState
+from goods_detail import DetailCache, add_detail_columns
+from pipeline import Degraded
+
+
+@pytest.fixture
+def server():
+    state = StandInState([], pd.DataFrame({'category_id': [], 'depth2_name': []}))
+    with StandInServer(state) as server:
+        yield server
+
+
+def hot(codes):
+    return pd.DataFrame({'제목': [f"공연 {c}" for c in codes], '예매코드': codes})
+
+
+def goods_calls(server):
+    calls, _ = server.state.snapshot()
+    return {k: v for k, v in calls.items() if k.startswith('interpark.goods')}
+
+
+def test_fetch_then_cache_hit(server, tmp_path):
+    df = add_detail_columns(hot(['25000001', '25000002']), DetailCache(tmp_path / 'detail.json'), min_interval=0)
+
+    assert list(df.columns[-3:]) == ['공연장', '공연기간', '가격']
+    assert df['공연장'].str.startswith('벤치 공연장').all()
+    assert df['공연기간'].str.match(r'\d{4}\.\d{2}\.\d{2}').all()
+    assert df['가격'].str.startswith('VIP석').all()
+    assert goods_calls(server) == {'interpark.goods_summary': 2, 'interpark.goods_prices': 2}
+
+    again = add_detail_columns(hot(['25000001', '25000002']), DetailCache(tmp_path / 'detail.json'), min_interval=0)
+    assert goods_calls(server) == {'interpark.goods_summary': 2, 'interpark.goods_prices': 2}
+    assert again['가격'].tolist() == df['가격'].tolist()
+
+
+def test_failures_are_not_cached(server, tmp_path):
+    server.state.failing_goods.add('25000002')
+    with pytest.raises(Degraded) as degraded:
+        add_detail_columns(hot(['25000001', '25000002']), DetailCache(tmp_path / 'detail.json'), min_interval=0)
+
+    df = degraded.value.result
+    assert df['공연장'].tolist()[1] == '' and df['가격'].tolist()[1] == ''
+    assert list(DetailCache(tmp_path / 'detail.json').entries) == ['25000001']
+
+    server.state.failing_goods.clear()
+    df = add_detail_columns(hot(['25000001', '25000002']), DetailCache(tmp_path / 'detail.json'), min_interval=0)
+    assert df['공연장'].str.startswith('벤치 공연장').all()
+    assert goods_calls(server) == {'interpark.goods_summary': 2, 'interpark.goods_prices': 2,
+                                   'interpark.goods_error': 1}
+
+
+def test_dry_run_does_not_write_cache(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(goods_detail, 'is_replaying', lambda: True)
+    df = add_detail_columns(hot(['25000001']), DetailCache(tmp_path / 'detail.json'), min_interval=0)
+
+    assert df['공연장'].iat[0].startswith('벤치 공연장')
+    assert not (tmp_path / 'detail.json').exists()
+
+
+def test_missing_codes_are_not_requested(server, tmp_path):
+    df = pd.DataFrame({'제목': ['a', 'b', 'c', 'd'], '예매코드': ['25000001', None, float('nan'), '']})
+    df = add_detail_columns(df, DetailCache(tmp_path / 'detail.json'), min_interval=0)
+
+    assert goods_calls(server) == {'interpark.goods_summary': 1, 'interpark.goods_prices': 1}
+    assert df['공연장'].tolist()[1:] == ['', '', '']
@@ -0,0 +1,56 @@
+import numpy as np
+
+from hotness import MAX_HOT, MAX_HOT_PER_GENRE, ViewHistory, hot_mask_by_score, score_notices
+
+
+def notices(views):
+    return [{'goodsCode': f"G{i}", 'title': f"공연 {i}", 'goodsGenreStr': '콘서트', 'viewCount': v}
+            for i, v in enumerate(views)]
+
+
+def test_fast_riser_with_low_total_views_is_hot(tmp_path):
+    history = ViewHistory(tmp_path / 'views.npz')
+    now = 1_750_000_000
+    # 누적 조회수는 높지만 천천히 오르는 공지 19개 + 한 시간 만에 50 → 3000 인 공지 1개
+    before = [20000 + i * 1000 for i in range(19)] + [50]
+    after = [v + 100 for v in before[:19]] + [3000]
+    score_notices(notices(before), history, now - 3600)
+
+    mask, scores = hot_mask_by_score(notices(after), history, now)
+
+    assert mask[-1]
+    assert scores[-1] < 0.85   # 가중합 점수만으로는 컷을 넘지 못하는 경우
+
+
+def test_first_sighting_uses_view_level_only(tmp_path):
+    history = ViewHistory(tmp_path / 'views.npz')
+    mask, _ = hot_mask_by_score(notices([10, 200, 400, 700, 1000, 2000, 3000, 5000, 20000, 90000]),
+                                history, 1_750_000_000)
+    assert mask.tolist() == [False] * 8 + [True, True]
+    assert np.isnan(score_notices(notices([1]), ViewHistory(tmp_path / 'x.npz'))['rate'].iloc[0])
+
+
+def test_single_notice_genre_uses_fixed_threshold(tmp_path):
+    history = ViewHistory(tmp_path / 'views.npz')
+    lone = [{'goodsCode': 'L1', 'title': '전시', 'goodsGenreStr': '전시/행사', 'viewCount': 5000}]
+    mask, _ = hot_mask_by_score(notices([100] * 10) + lone, history, 1_750_000_000)
+    assert not mask[-1]   # 장르 안 100% 지만 기존 기본 임계값(10000) 미만
+
+    lone[0]['viewCount'] = 15000
+    mask, _ = hot_mask_by_score(notices([100] * 10) + lone, ViewHistory(tmp_path / 'x.npz'), 1_750_000_000)
+    assert mask[-1]
+
+
+def test_hot_list_is_capped(tmp_path):
+    history = ViewHistory(tmp_path / 'views.npz')
+    now = 1_750_000_000
+    data = [{'goodsCode': f"{g}{i}", 'title': f"{g} {i}", 'goodsGenreStr': g, 'viewCount': 1000 + i}
+            for g in ('콘서트', '뮤지컬', '연극', '클래식/오페라', '기타', '전시') for i in range(200)]
+    score_notices(data, history, now - 3600)
+    for i, d in enumerate(data):
+        d['viewCount'] += 500 + i * 7 % 500
+
+    mask, scores = hot_mask_by_score(data, history, now)
+    genres = np.array([d['goodsGenreStr'] for d in data])
+    assert mask.sum() == MAX_HOT
+    assert max((genres[mask] == g).sum() for g in set(genres)) <= MAX_HOT_PER_GENRE
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from listing_dedup import MinHashIndex, find_duplicates
+
+
+def listings(ids, names):
+    return pd.DataFrame({
+        'id': ids,
+        'name': names,
+        'description': '',
+        'price': 150000,
+        'sale_quantity': 2,
+        'grade': 'VIP',
+        'floor': '1층',
+        'area': 'A1',
+        'seat_number': '3열',
+        'depth3_id': 5871,
+    })
+
+
+def test_duplicate_ids_are_indexed_once(tmp_path):
+    # 같은 매물이 두 카테고리에서 수집된 스냅샷
+    df = listings([1, 2, 2, 3], ['VIP 1열 양도', 'VIP 3열 연석 양도', 'VIP 3열 연석 양도', 'VIP 3열 연석 양도합니다'])
+    index = MinHashIndex(tmp_path / 'minhash.npz')
+
+    assert index.update(df) == 3
+    assert index.ids.tolist() == [1, 2, 3]
+    index.save()
+
+    again = MinHashIndex(tmp_path / 'minhash.npz')
+    assert again.update(df) == 0
+
+    result = find_duplicates(df, index_path=tmp_path / 'minhash.npz')
+    assert len(result) == len(df)
+    assert result['dup_cluster'].notna().all()
+
+
+def test_index_saved_with_duplicate_ids_still_loads(tmp_path):
+    path = tmp_path / 'minhash.npz'
+    df = listings([1, 2], ['VIP 1열 양도', 'VIP 3열 연석 양도'])
+    index = MinHashIndex(path)
+    index.update(df)
+    # 이전 버전이 남긴, ID 가 중복된 인덱스
+    index.ids = np.concatenate([index.ids, index.ids[-1:]])
+    index.blocks = np.concatenate([index.blocks, index.blocks[-1:]])
+    index.prices = np.concatenate([index.prices, index.prices[-1:]])
+    index.hashes = np.concatenate([index.hashes, index.hashes[-1:]])
+    index.signatures = np.concatenate([index.signatures, index.signatures[-1:]])
+    index.save()
+
+    assert MinHashIndex(path).update(df) == 0
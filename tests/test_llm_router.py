@@ -0,0 +1,31 @@
+import pytest
+
+import quota
+from llm_router import LLMRouter, is_simple
+
+
+class FailingClient:
+    def __init__(self):
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        raise ConnectionError('timeout')
+
+
+def test_failed_call_refunds_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota, 'DB_PATH', tmp_path / 'quota.db')
+    router = LLMRouter(FailingClient, budget=1000)
+
+    for _ in range(5):
+        with pytest.raises(ConnectionError):
+            router.complete('artist', '가수명만 답해줘', '뮤지컬 〈쉐도우〉')
+    assert router.used == 0
+    # 공용 한도(quota.db)의 토큰도 돌려받는다
+    assert quota.utilization()['openai']['tokens']['used'] == 0
+
+
+def test_square_bracket_label_is_not_a_work_name():
+    assert is_simple('뮤지컬 〈쉐도우〉')
+    assert not is_simple('[단독] 2025 아이유 HEREH WORLD TOUR CONCERT IN SEOUL')
+    assert is_simple('[단독] 아이유 콘서트')
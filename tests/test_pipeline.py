@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import metrics
+from pipeline import Degraded, Pipeline, Stage
+
+
+@pytest.fixture(autouse=True)
+def fresh_run():
+    metrics.start_run('test')
+
+
+def test_degraded_stage_is_used_but_not_memoized(tmp_path):
+    calls = []
+
+    def enrich(items):
+        calls.append(items)
+        result = [f"{item}!" for item in items]
+        if len(calls) == 1:
+            raise Degraded(result, '기본값 1행')
+        return result
+
+    def build():
+        return Pipeline('test', [
+            Stage('source', lambda: ['a', 'b'], outputs={'items': list}),
+            Stage('enrich', enrich, inputs={'items': list}, outputs={'enriched': list}),
+        ], cache_dir=tmp_path)
+
+    assert build().run()['enriched'] == ['a!', 'b!']
+    assert metrics.current_run().extra['pipeline']['test']['enrich']['status'] == 'fallback'
+
+    build().run()
+    assert metrics.current_run().extra['pipeline']['test']['enrich']['status'] == 'ran'
+    build().run()
+    assert metrics.current_run().extra['pipeline']['test']['enrich']['status'] == 'cached'
+    assert len(calls) == 2
+
+
+def test_memo_hit_is_rerun_when_check_fails(tmp_path):
+    out = tmp_path / 'derived.txt'
+    calls = []
+
+    def render():
+        calls.append(1)
+        out.write_text('x')
+        return [str(out)]
+
+    def build():
+        return Pipeline('files', [
+            Stage('render', render, outputs={'files': list}, check=lambda files: all(map(os.path.exists, files))),
+        ], cache_dir=tmp_path)
+
+    build().run()
+    build().run()
+    assert len(calls) == 1
+    out.unlink()
+    build().run()
+    assert len(calls) == 2 and out.exists()
@@ -0,0 +1,41 @@
+import json
+
+from poster_cache import PosterCache
+
+
+def add_poster(cache, url, digest, fetched_at, size=1000):
+    (cache.objects / f"{digest}.jpg").write_bytes(b'\xff\xd8\xff' + b'0' * size)
+    derived = cache.dir / 'derived'
+    derived.mkdir(exist_ok=True)
+    (derived / f"{digest}_bunjang.jpg").write_bytes(b'0' * size)
+    cache.index[url] = {'hash': digest, 'ext': '.jpg', 'fetched_at': fetched_at, 'size': size}
+
+
+def test_evict_removes_derived_variants_and_phash_entries(tmp_path):
+    cache = PosterCache(tmp_path, max_bytes=3000)
+    old, new = 'a' * 64, 'b' * 64
+    add_poster(cache, 'http://x/old.jpg', old, fetched_at=1)
+    add_poster(cache, 'http://x/new.jpg', new, fetched_at=2)
+    (tmp_path / 'derived' / f"{'c' * 64}_thumb.webp").write_bytes(b'0' * 3000)   # 원본이 없는 변환본
+    (tmp_path / 'phash.json').write_text(json.dumps({
+        'posters': {old: {'ahash': '0', 'dhash': '0', 'size': 1}, new: {'ahash': '1', 'dhash': '1', 'size': 1}},
+        'aliases': {'d' * 64: old},
+    }), encoding='utf-8')
+
+    assert cache.evict() == 2
+
+    names = sorted(p.name for p in tmp_path.rglob('*.*') if p.parent.name in ('objects', 'derived'))
+    assert names == [f"{new}.jpg", f"{new}_bunjang.jpg"]
+    assert list(cache.index) == ['http://x/new.jpg']
+    phash = json.loads((tmp_path / 'phash.json').read_text(encoding='utf-8'))
+    assert list(phash['posters']) == [new] and phash['aliases'] == {}
+
+
+def test_evict_counts_derived_size(tmp_path):
+    cache = PosterCache(tmp_path, max_bytes=2500)
+    add_poster(cache, 'http://x/a.jpg', 'a' * 64, fetched_at=1)
+    add_poster(cache, 'http://x/b.jpg', 'b' * 64, fetched_at=2)
+
+    # 원본만 보면 2006B 로 한도 안이지만 변환본까지 4006B
+    assert cache.evict() == 1
+    assert list(cache.index) == ['http://x/b.jpg']
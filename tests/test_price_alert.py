@@ -0,0 +1,82 @@
+import json
+
+import pandas as pd
+import pytest
+
+import telegram
+from price_alert import alert_key, parse_alert_key, run_alerts
+
+
+def snapshot(prices):
+    return pd.DataFrame({
+        'id': list(range(1, len(prices) + 1)),
+        'price': prices,
+        'sale_quantity': 2,
+        'grade': 'VIP',
+        'area': 'A1',
+        'floor': '1층',
+        'seat_number': '',
+        'is_together': 'YES',
+        'product_status': 'ON',
+        'depth2_id': 10,
+        'depth2_name': '데이식스',
+        'depth3_id': 5871,
+        'depth3_name': '데이식스 서울',
+    })
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    sent = []
+    results = []
+
+    def fake_send(chat_id, text):
+        sent.append(text)
+        return {'ok': results.pop(0) if results else True}
+
+    monkeypatch.setattr(telegram, 'send_message', fake_send)
+    monkeypatch.setattr(telegram, 'ADMIN_CHAT_ID', 'admin')
+    return sent, results
+
+
+def write_rules(path, rules):
+    path.write_text(json.dumps(rules, ensure_ascii=False), encoding='utf-8')
+
+
+def test_failed_alert_is_retried_next_run(outbox, tmp_path):
+    sent, results = outbox
+    rules, state = tmp_path / 'rules.json', tmp_path / 'state.json'
+    write_rules(rules, [{'event_id': 5871, 'max_price': 200000}])
+    df = snapshot([150000, 300000])
+
+    results.append(False)
+    assert len(run_alerts(df, rules, state)) == 1
+    assert len(run_alerts(df, rules, state)) == 1
+    assert len(sent) == 2
+    # 전송 성공 후에는 같은 스냅샷으로 다시 알리지 않는다
+    assert run_alerts(df, rules, state) == []
+
+
+def test_new_and_edited_rules_see_full_snapshot(outbox, tmp_path):
+    sent, _ = outbox
+    rules, state = tmp_path / 'rules.json', tmp_path / 'state.json'
+    df = snapshot([150000, 300000])
+    write_rules(rules, [{'event_id': 5871, 'max_price': 100000}])
+    assert run_alerts(df, rules, state) == []
+
+    # 매물은 그대로지만 새 규칙은 스냅샷 전체에 대조된다
+    write_rules(rules, [{'event_id': 5871, 'max_price': 100000}, {'artist': '데이 식스', 'max_price': 200000}])
+    assert [row['id'] for _, row in run_alerts(df, rules, state)] == [1]
+
+    # id 없는 규칙을 고치면 새 id 를 받아 다시 전체 대조된다
+    write_rules(rules, [{'event_id': 5871, 'max_price': 400000}, {'artist': '데이 식스', 'max_price': 200000}])
+    matches = run_alerts(df, rules, state)
+    assert sorted(row['id'] for _, row in matches) == [1, 2]
+    assert len({rule['id'] for rule, _ in matches}) == 1
+    assert matches[0][0]['id'].startswith('rule-')
+
+
+def test_alert_key_allows_colons_in_rule_id():
+    key = alert_key({'id': 'day6:seoul:vip'}, {'id': 42, 'price': 150000})
+
+    assert parse_alert_key(key) == ('day6:seoul:vip', '42', '150000')
@@ -0,0 +1,40 @@
+import time
+
+from profiling import collapsed_stacks
+
+LAYERS = 40
+SELF_TIME = 0.01
+
+
+class FakeStats:
+    """층마다 함수 2개가 윗층 함수 2개 모두에게 불리는 호출 그래프 (경로 2^LAYERS 개)"""
+
+    def __init__(self):
+        def func(name):
+            return ('app.py', 1, name)
+
+        cum = {LAYERS + 1: 0.0}
+        for k in range(LAYERS, 0, -1):
+            cum[k] = SELF_TIME + cum[k + 1]
+        root = func('main')
+        self.stats = {root: (1, 1, 0.0, 2 * cum[1], {})}
+        for k in range(1, LAYERS + 1):
+            parents = [root] if k == 1 else [func(f'a{k - 1}'), func(f'b{k - 1}')]
+            for name in (f'a{k}', f'b{k}'):
+                edge = cum[k] / len(parents)
+                callers = {p: (1, 1, 0.0, edge) for p in parents}
+                self.stats[func(name)] = (1, 1, SELF_TIME, cum[k], callers)
+        # 재귀 호출
+        a1 = self.stats[func('a1')]
+        a1[4][func('a1')] = (1, 1, 0.0, SELF_TIME)
+
+
+def test_diamond_call_graph_is_pruned():
+    start = time.perf_counter()
+    lines = dict(line.rsplit(' ', 1) for line in collapsed_stacks(FakeStats()).splitlines())
+    assert time.perf_counter() - start < 5
+
+    assert lines['app.py:1:main;app.py:1:a1'] == '10000'
+    assert lines['app.py:1:main;app.py:1:a1;app.py:1:b2'] == '5000'
+    assert not any('a1;app.py:1:a1' in key for key in lines)
+    assert all(int(v) >= 1 for v in lines.values())
@@ -0,0 +1,50 @@
+import json
+
+from PIL import Image
+
+from proof_mask import CachedBackend, StubBackend, process_directory
+
+WORDS = [{'text': '예매번호', 'poly': [[2, 2], [20, 2], [20, 8], [2, 8]]},
+         {'text': 'T1234', 'poly': [[24, 2], [40, 2], [40, 8], [24, 8]]}]
+
+
+def make_image(path):
+    Image.new('RGB', (48, 16), 'white').save(path)
+    return str(path)
+
+
+def test_miss_is_not_cached_and_detected_again(tmp_path):
+    image = make_image(tmp_path / 'proof.png')
+    stub = StubBackend()
+    backend = CachedBackend(stub, tmp_path / 'ocr_cache.json')
+
+    assert backend.detect([image]) == [None]
+    assert not (tmp_path / 'ocr_cache.json').exists()
+
+    stub.fixtures['proof.png'] = WORDS
+    assert backend.detect([image]) == [WORDS]
+    assert backend.stats == {'hits': 0, 'misses': 2}
+    saved = json.loads((tmp_path / 'ocr_cache.json').read_text(encoding='utf-8'))
+    assert list(saved.values()) == [WORDS]
+
+    assert CachedBackend(stub, tmp_path / 'ocr_cache.json').detect([image]) == [WORDS]
+
+
+def test_empty_result_is_not_persisted(tmp_path):
+    image = make_image(tmp_path / 'proof.png')
+    backend = CachedBackend(StubBackend(fixtures={'proof.png': []}), tmp_path / 'ocr_cache.json')
+
+    assert backend.detect([image]) == [[]]
+    assert backend.cache == {}
+    assert not (tmp_path / 'ocr_cache.json').exists()
+
+
+def test_failed_ocr_writes_no_output(tmp_path):
+    make_image(tmp_path / 'ok.png')
+    make_image(tmp_path / 'failed.png')
+    backend = StubBackend(fixtures={'ok.png': WORDS})
+
+    stats = process_directory(tmp_path, backend=backend, workers=1)
+
+    assert stats['ocr_failed'] == 1 and stats['masked'] == 1
+    assert sorted(p.name for p in (tmp_path / 'masked').iterdir()) == ['ok_masked.png']
@@ -0,0 +1,27 @@
+from publish_ledger import PublishLedger
+
+
+def test_failed_publish_is_capped_until_content_changes(tmp_path):
+    ledger = PublishLedger(tmp_path / 'ledger.json')
+    for _ in range(ledger.MAX_ATTEMPTS):
+        assert ledger.needs_publish('G1', 'bunjang', 'v1')
+        ledger.record('G1', 'bunjang', 'v1', 'failed')
+
+    assert not ledger.needs_publish('G1', 'bunjang', 'v1')
+    assert ledger.gave_up('G1', 'bunjang', 'v1')
+    assert ledger.needs_publish('G1', 'bunjang', 'v2')
+    assert ledger.record('G1', 'bunjang', 'v2', 'posted', 'P1')['attempts'] == 1
+
+
+def test_changed_content_keeps_remote_id(tmp_path):
+    ledger = PublishLedger(tmp_path / 'ledger.json')
+    ledger.record('G1', 'bunjang', 'v1', 'posted', 'P1')
+    ledger.save()
+
+    ledger = PublishLedger(tmp_path / 'ledger.json')
+    assert ledger.needs_publish('G1', 'bunjang', 'v2')
+    assert ledger.remote_id('G1', 'bunjang') == 'P1'
+    # 수정 실패해도 기존 상품 ID 는 남는다
+    assert ledger.record('G1', 'bunjang', 'v2', 'failed')['remote_id'] == 'P1'
+    entry = ledger.record('G1', 'bunjang', 'v2', 'posted', 'P2')
+    assert entry['remote_id'] == 'P2' and entry['previous_ids'] == ['P1']
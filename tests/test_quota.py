@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import bunjang
+import quota
+import telegram
+from llm_router import LLMRateLimited, LLMRouter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 보충이 거의 없는 한도 (기다려도 MAX_WAIT 안에 못 채움)
+SLOW_LIMITS = {
+    'openai': {'requests': (0.01, 500), 'tokens': (0.01, 30000)},
+    'sheets': {'requests': (0.01, 60)},
+    'telegram': {'requests': (0.01, 20)},
+}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / 'quota.db'
+    monkeypatch.setattr(quota, 'DB_PATH', path)
+    monkeypatch.setattr(quota, 'LIMITS', SLOW_LIMITS)
+    return path
+
+
+def exhaust_elsewhere(path, provider):
+    """다른 프로세스에서 provider 한도를 전부 써 버린다"""
+    script = (
+        "import quota\n"
+        f"quota.LIMITS = {SLOW_LIMITS!r}\n"
+        f"while quota.try_acquire({provider!r}):\n"
+        "    pass\n"
+        f"quota.consume({provider!r}, 30000)\n"
+    )
+    env = dict(os.environ, QUOTA_DB=str(path))
+    subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, check=True)
+
+
+def test_other_process_usage_is_shared(db):
+    assert quota.try_acquire('telegram')
+    exhaust_elsewhere(db, 'telegram')
+
+    assert not quota.try_acquire('telegram')
+    assert quota.utilization()['telegram']['requests']['processes'] == 2
+
+
+def test_send_message_reports_denial(db, monkeypatch):
+    exhaust_elsewhere(db, 'telegram')
+    posts = []
+    monkeypatch.setattr(telegram.requests, 'post', lambda *a, **k: posts.append(a))
+
+    result = telegram.send_message('-1', '알림')
+    assert result['ok'] is False
+    assert posts == []
+
+
+def test_update_sheet_fails_without_touching_sheet(db):
+    exhaust_elsewhere(db, 'sheets')
+
+    class Sheet:
+        cleared = False
+
+        def clear(self):
+            self.cleared = True
+
+    crawler = bunjang.InterparkTicketCrawler()
+    crawler._sheet = Sheet()
+    with pytest.raises(RuntimeError):
+        crawler.update_sheet(pd.DataFrame({'제목': ['공연']}))
+    assert not crawler._sheet.cleared
+
+
+def test_llm_router_refunds_budget_when_rate_limited(db):
+    exhaust_elsewhere(db, 'openai')
+    router = LLMRouter(lambda: pytest.fail('한도 없이 호출됨'), budget=1000)
+
+    with pytest.raises(LLMRateLimited):
+        router.complete('artist', '가수명만 답해줘', '뮤지컬 〈쉐도우〉')
+    assert router.used == 0
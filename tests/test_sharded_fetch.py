@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+from bench.standins import StandInServer, StandInState
+from sharded_fetch import fetch_all_notices
+
+
+def notices(n):
+    return [{'openDateStr': f"2025-08-01 {i // 60 % 24:02d}:{i % 60:02d}:00", 'viewCount': i, 'title': f"공연 {i}",
+             'goodsCode': f"G{i:05d}", 'goodsGenreStr': '콘서트'} for i in range(n)]
+
+
+@pytest.fixture
+def server():
+    state = StandInState(notices(950), pd.DataFrame({'category_id': [], 'depth2_name': []}))
+    with StandInServer(state) as server:
+        yield server
+
+
+def test_pages_all_past_first_page(server):
+    rows, stats = fetch_all_notices(page_size=400, max_workers=2)
+
+    assert len(rows) == 950 and stats['unique'] == 950
+    assert stats['complete'] == 1 and stats['pages'] == 3
+    assert not stats['empty'] and not stats['truncated'] and 'baseline' not in stats
+
+
+def test_unknown_codes_are_reported_as_empty_shards(server, capsys):
+    rows, stats = fetch_all_notices(genres=['ALL', 'NOPE'], regions=['ALL'], page_size=400)
+
+    assert len(rows) == 950
+    assert stats['empty'] == [('NOPE', 'ALL')] and stats['empty_genres'] == ['NOPE']
+    assert stats['baseline_missing'] == 0
+    assert "모든 지역이 빈 장르: ['NOPE']" in capsys.readouterr().out
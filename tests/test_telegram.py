@@ -0,0 +1,12 @@
+import pandas as pd
+
+from telegram import format_hot_message
+
+
+def test_hot_message_escapes_titles():
+    df = pd.DataFrame([{'제목': '<뮤지컬> 렌트 & 헤드윅', '오픈시간': '2025-08-01 20:00:00', '조회수': 12000,
+                        '예매코드': '25008903', '예매타입': '일반예매'}])
+    message = format_hot_message(df)
+
+    assert '&lt;뮤지컬&gt; 렌트 &amp; 헤드윅' in message
+    assert '<뮤지컬>' not in message
@@ -0,0 +1,26 @@
+import bunjang
+import telegram_fixed
+
+
+def notice(genre, views, open_time='2025-08-01 20:00:00'):
+    return {'goodsGenreStr': genre, 'viewCount': views, 'openDateStr': open_time, 'title': f"{genre} {views}",
+            'goodsCode': f"{genre}{views}", 'openTypeStr': '일반예매', 'posterImageUrl': ''}
+
+
+NOTICES = [notice('콘서트', 601), notice('콘서트', 600), notice('전시/행사', 50), notice('뮤지컬', 900, '')]
+
+
+def test_keeps_baseline_filter():
+    hot = telegram_fixed.InterparkTicketCrawler().hot_frame(NOTICES)
+    assert sorted(hot['제목']) == ['뮤지컬 900', '전시/행사 50', '콘서트 601']
+
+
+def test_bunjang_threshold_mode_is_unchanged():
+    hot = bunjang.InterparkTicketCrawler(hot_mode='threshold').hot_frame(NOTICES)
+    assert hot['제목'].tolist() == ['콘서트 601']
+
+
+def test_telegram_is_opt_in():
+    stages = [s.name for s in telegram_fixed.InterparkTicketCrawler().stages()]
+    assert 'telegram' not in stages
+    assert 'telegram' in [s.name for s in telegram_fixed.InterparkTicketCrawler(chat_id='1').stages()]